@@ -0,0 +1,303 @@
+# File: batch_generator.py
+#
+# Vectorized versions of the text-only generators in problem_generator.py.
+# Every parameter for n problems is drawn at once as a NumPy array, the answers
+# are computed with array arithmetic, and the strings are built at the very end
+# by the same _format_* helpers the scalar generators use, so the output is
+# always in exactly the same format. The expressions those helpers are given
+# written (ax + b, ax² + bx + c, ...) are written a column at a time with the
+# same Terms formatters' rows(), each distinct expression once.
+
+import numpy as np
+
+import parameter_tables
+import problem_generator as pg
+from rational import reduce_array as _reduce
+
+INEQUALITY_SYMBOLS = ['<', '>', '≤', '≥']
+FLIPPED_SYMBOL = np.array([1, 0, 3, 2]) # Index of the flipped symbol above
+
+def _randint(rng, low, high, n):
+    """Draws n integers in [low, high], inclusive like random.randint."""
+    return rng.integers(low, high + 1, size=n)
+
+def _names(names, index):
+    """Turns an array of indices into a list of names."""
+    return list(map(names.__getitem__, index.tolist()))
+
+def _table_columns(rng, table, n):
+    """Draws n rows uniformly from a ParameterTable and returns them as int64 columns."""
+    rows = np.frombuffer(table.values, dtype=np.int8).reshape(table.size, table.width)
+    return rows[rng.integers(0, table.size, size=n)].astype(np.int64).T
+
+def _written_where(mask, terms, columns, other_terms, other_columns):
+    """Writes each row with terms where mask is set and with other_terms elsewhere, as an object array."""
+    text = np.empty(len(mask), dtype=object)
+    text[mask] = terms.rows(*(column[mask] for column in columns))
+    text[~mask] = other_terms.rows(*(column[~mask] for column in other_columns))
+    return text
+
+def _format(formatter, *columns):
+    """Formats every row at the end; NumPy columns are converted to Python ints first."""
+    columns = [c.tolist() if isinstance(c, np.ndarray) else c for c in columns]
+    return list(map(formatter, *columns))
+
+# --- Vectorized topics ---
+
+def _batch_linear_equation(rng, n):
+    a = _randint(rng, 2, 9, n)
+    b = _randint(rng, 1, 10, n)
+    x = _randint(rng, -5, 5, n)
+    c = a * x + b
+    return _format(pg._format_linear_equation, a, b, c, x)
+
+def _batch_simplify_expression(rng, n):
+    a = _randint(rng, 2, 5, n)
+    b = _randint(rng, 2, 6, n)
+    c = _randint(rng, 1, 5, n)
+    d = _randint(rng, 1, 9, n)
+    return _format(pg._format_simplify_expression, a, pg._LINEAR.rows(b, d), pg._LINEAR.rows(c, np.zeros_like(c)),
+                   pg._LINEAR.rows(a * b - c, a * d))
+
+def _batch_factoring_quadratic(rng, n):
+    r1 = _randint(rng, -9, 9, n)
+    r2 = _randint(rng, -9, 9, n)
+    r1[r1 == 0] = 10
+    r2[r2 == 0] = -10
+    return _format(pg._format_factoring_quadratic, r1, r2,
+                   pg._QUADRATIC.rows(np.ones_like(r1), -(r1 + r2), r1 * r2))
+
+def _batch_slope_from_points(rng, n):
+    x1, y1, x2, y2 = _table_columns(rng, parameter_tables.distinct_points(), n)
+    dx = x2 - x1
+    vertical = dx == 0
+    num, den = _reduce(y2 - y1, np.where(vertical, 1, dx))
+    # A zero denominator tells the formatter the slope is undefined
+    num[vertical] = 0
+    den[vertical] = 0
+    return _format(pg._format_slope_from_points, x1, y1, x2, y2, num, den)
+
+def _batch_evaluate_function(rng, n):
+    m = _randint(rng, -5, 5, n)
+    b = _randint(rng, -10, 10, n)
+    x_val = _randint(rng, -5, 5, n)
+    m[m == 0] = 1
+    return _format(pg._format_evaluate_function, pg._LINEAR.rows(m, b), x_val, m * x_val + b)
+
+def _batch_multistep_equation_fractions(rng, n):
+    x = _randint(rng, -6, 6, n)
+    a_num = _randint(rng, 1, 5, n)
+    a_den = _randint(rng, 1, 5, n)
+    b = _randint(rng, 2, 5, n)
+    c = _randint(rng, -10, 10, n)
+    d_num, d_den = _reduce(a_num * (b * x + c), a_den)
+    return _format(pg._format_multistep_equation_fractions, x, a_num, a_den, pg._LINEAR.rows(b, c), d_num, d_den)
+
+def _batch_multistep_inequality(rng, n):
+    a = _randint(rng, -7, 7, n)
+    x = _randint(rng, -5, 5, n)
+    b = _randint(rng, -10, 10, n)
+    a[a == 0] = -1
+    symbol = rng.integers(0, 4, size=n)
+    c = a * x + b - _randint(rng, 1, 5, n)
+    final_symbol = np.where(a < 0, FLIPPED_SYMBOL[symbol], symbol)
+    boundary = _format(pg._format_fraction, *_reduce(c - b, a)) # (c - b) / a
+    return _format(pg._format_multistep_inequality, pg._LINEAR.rows(a, b), c, boundary,
+                   _names(INEQUALITY_SYMBOLS, symbol), _names(INEQUALITY_SYMBOLS, final_symbol))
+
+def _batch_compound_inequality(rng, n):
+    task = rng.integers(0, 2, size=n) # 0 = conjunction, 1 = disjunction
+    conj = task == 0
+    x_lower = np.where(conj, _randint(rng, -5, 5, n), _randint(rng, -5, 0, n))
+    x_upper = np.where(conj, x_lower + _randint(rng, 3, 8, n), _randint(rng, 1, 6, n))
+    m = _randint(rng, 2, 5, n)
+    c = _randint(rng, -7, 7, n)
+    s1 = rng.integers(0, 2, size=n) * 2 # '<' or '≤'
+    s2 = rng.integers(0, 2, size=n) * 2 + np.where(conj, 0, 1) # '<'/'≤' or '>'/'≥'
+    return _format(pg._format_compound_inequality,
+                   _names(["conjunction", "disjunction"], task), x_lower, x_upper, pg._LINEAR.rows(m, c),
+                   _names(INEQUALITY_SYMBOLS, s1), _names(INEQUALITY_SYMBOLS, s2),
+                   m * x_lower + c, m * x_upper + c)
+
+def _batch_system_of_equations(rng, n):
+    x = _randint(rng, -5, 5, n)
+    y = _randint(rng, -5, 5, n)
+    a, b, c, d = _table_columns(rng, parameter_tables.system_coefficients(), n)
+    return _format(pg._format_system_of_equations, pg._LINEAR_XY.rows(a, b), pg._LINEAR_XY.rows(c, d),
+                   a * x + b * y, c * x + d * y, x, y)
+
+def _batch_write_equation_from_points(rng, n):
+    x1, y1, x2, y2 = _table_columns(rng, parameter_tables.non_vertical_points(), n)
+    dx = x2 - x1
+    dy = y2 - y1
+    m_num, m_den = _reduce(dy, dx)
+    # b = y1 - m * x1 = (y1 * dx - dy * x1) / dx
+    b_num, b_den = _reduce(y1 * dx - dy * x1, dx)
+    return _format(pg._format_write_equation_from_points, x1, y1, x2, y2,
+                   pg._LINE_FRACTIONS.rows(m_num, m_den, b_num, b_den))
+
+def _batch_parallel_perpendicular_line(rng, n):
+    m_num, m_den = _reduce(_randint(rng, -5, 5, n), _randint(rng, 1, 5, n))
+    b = _randint(rng, -10, 10, n)
+    px = _randint(rng, -6, 6, n)
+    py = _randint(rng, -6, 6, n)
+    task = rng.integers(0, 2, size=n) # 0 = parallel, 1 = perpendicular
+
+    # Perpendicular slope is -1/m; horizontal lines are special-cased by the formatter
+    perpendicular = task == 1
+    horizontal = m_num == 0
+    new_m_num, new_m_den = _reduce(np.where(perpendicular, -m_den, m_num),
+                                   np.where(perpendicular, np.where(horizontal, 1, m_num), m_den))
+    # new_b = py - new_m * px
+    new_b_num, new_b_den = _reduce(py * new_m_den - new_m_num * px, new_m_den)
+    return _format(pg._format_parallel_perpendicular_line,
+                   _names(["parallel", "perpendicular"], task), m_num, b, px, py,
+                   pg._LINE_FRACTIONS.rows(m_num, m_den, b, np.ones_like(b)),
+                   pg._LINE_FRACTIONS.rows(new_m_num, new_m_den, new_b_num, new_b_den))
+
+def _batch_factoring_binomials(rng, n):
+    task = rng.integers(0, 2, size=n) # 0 = gcf, 1 = diff_squares
+    gcf = task == 0
+    g = np.where(gcf, _randint(rng, 2, 10, n), 1)
+    coprime_a, coprime_b = _table_columns(rng, parameter_tables.coprime_pairs(), n)
+    a = np.where(gcf, coprime_a, _randint(rng, 2, 7, n))
+    b = np.where(gcf, coprime_b, _randint(rng, 2, 7, n))
+    return _format(pg._format_factoring_binomials, _names(["gcf", "diff_squares"], task), g, a, b)
+
+def _batch_polynomial_operations(rng, n):
+    task = rng.integers(0, 3, size=n) # 0 = add, 1 = subtract, 2 = multiply
+    add, sub, mul = task == 0, task == 1, task == 2
+    a, b, c = _randint(rng, 1, 5, n), _randint(rng, -7, 7, n), _randint(rng, -7, 7, n)
+    d, e, f = _randint(rng, 1, 5, n), _randint(rng, -7, 7, n), _randint(rng, -7, 7, n)
+    # Binomials (ma x + mb)(mc x + md) for the multiply rows
+    ma, mb = _randint(rng, 1, 6, n), _randint(rng, -7, 7, n)
+    mc, md = _randint(rng, 1, 6, n), _randint(rng, -7, 7, n)
+
+    p1 = _written_where(mul, pg._LINEAR, (ma, mb), pg._QUADRATIC, (a, b, c))
+    p2 = _written_where(mul, pg._LINEAR, (mc, md), pg._QUADRATIC, (d, e, f))
+    ans = pg._QUADRATIC.rows(np.select([add, sub], [a + d, a - d], ma * mc),
+                             np.select([add, sub], [b + e, b - e], ma * md + mb * mc),
+                             np.select([add, sub], [c + f, c - f], mb * md))
+    return _format(pg._format_polynomial_operations,
+                   _names(["add", "subtract", "multiply"], task), p1, p2, ans)
+
+def _batch_exponent_rules(rng, n):
+    task = rng.integers(0, 4, size=n) # product, power, negative, quotient
+    base = _randint(rng, 2, 6, n)
+    a = np.choose(task, [_randint(rng, 2, 5, n), _randint(rng, 2, 4, n),
+                         _randint(rng, 2, 5, n), _randint(rng, 5, 9, n)])
+    b = np.choose(task, [_randint(rng, 2, 5, n), _randint(rng, 2, 4, n),
+                         np.zeros(n, dtype=np.int64), _randint(rng, 2, 4, n)])
+    return _format(pg._format_exponent_rules,
+                   _names(["product", "power", "negative", "quotient"], task), base, a, b)
+
+def _batch_radical_operations(rng, n):
+    task = rng.integers(0, 2, size=n) # 0 = simplify, 1 = multiply
+    simplify = task == 0
+    outside = _randint(rng, 2, 5, n)
+    inside = np.array([2, 3, 5, 6, 7])[rng.integers(0, 5, size=n)]
+    a = _randint(rng, 2, 5, n)
+    b = _randint(rng, 2, 3, n)
+    c = _randint(rng, 2, 5, n)
+    d = np.array([2, 3, 5])[rng.integers(0, 3, size=n)]
+
+    # Pull the largest perfect square (16, 9, 4) out of b * d
+    coeff = a * c
+    radicand = b * d
+    done = np.zeros(n, dtype=bool)
+    for i in (4, 3, 2):
+        hit = ~done & (radicand % (i * i) == 0)
+        coeff = np.where(hit, coeff * i, coeff)
+        radicand = np.where(hit, radicand // (i * i), radicand)
+        done |= hit
+
+    return _format(pg._format_radical_operations, _names(["simplify", "multiply"], task),
+                   np.where(simplify, outside, a), np.where(simplify, inside, b),
+                   np.where(simplify, 0, c), np.where(simplify, 0, d),
+                   np.where(simplify, outside, coeff), np.where(simplify, inside, radicand))
+
+def _batch_factoring_harder_quadratic(rng, n):
+    a = _randint(rng, 2, 4, n)
+    b = _randint(rng, -5, 5, n)
+    c = _randint(rng, 2, 4, n)
+    d = _randint(rng, -5, 5, n)
+    simple = (b == 0) | (d == 0) # Avoid simple GCF problems
+    b[simple] = 1
+    d[simple] = -2
+    return _format(pg._format_factoring_harder_quadratic, pg._QUADRATIC.rows(a * c, a * d + b * c, b * d),
+                   pg._LINEAR.rows(a, b), pg._LINEAR.rows(c, d))
+
+def _batch_order_of_operations(rng, n):
+    template = _randint(rng, 1, 3, n)
+    t = template - 1
+    zeros = np.zeros(n, dtype=np.int64)
+
+    # Template 1: a - b · c² + d ÷ e
+    a1, b1, c1 = _randint(rng, 10, 20, n), _randint(rng, 2, 4, n), _randint(rng, 2, 3, n)
+    res1, e1 = _randint(rng, 2, 5, n), _randint(rng, 2, 4, n)
+    # Template 2: a - b² · (c ÷ d) - e³ + f
+    a2, b2 = _randint(rng, 15, 30, n), _randint(rng, 2, 4, n)
+    res2, d2 = _randint(rng, 2, 4, n), _randint(rng, 2, 3, n)
+    e2, f2 = _randint(rng, 2, 3, n), _randint(rng, 1, 10, n)
+    # Template 3: a ÷ (b³ - c) · d - e · f - g² + h
+    c3, d3, res3, b3 = _randint(rng, 2, 4, n), _randint(rng, 2, 5, n), _randint(rng, 2, 4, n), _randint(rng, 2, 3, n)
+    e3, f3, g3, h3 = _randint(rng, 3, 6, n), _randint(rng, 2, 4, n), _randint(rng, 2, 4, n), _randint(rng, 1, 15, n)
+
+    answer = np.choose(t, [a1 - b1 * c1 ** 2 + res1,
+                           a2 - b2 ** 2 * res2 - e2 ** 3 + f2,
+                           res3 * d3 - e3 * f3 - g3 ** 2 + h3])
+    return _format(pg._format_order_of_operations, template,
+                   np.choose(t, [a1, a2, res3 * (b3 ** 3 - c3)]),
+                   np.choose(t, [b1, b2, b3]),
+                   np.choose(t, [c1, res2 * d2, c3]),
+                   np.choose(t, [res1 * e1, d2, d3]),
+                   np.choose(t, [e1, e2, e3]),
+                   np.choose(t, [zeros, f2, f3]),
+                   np.choose(t, [zeros, zeros, g3]),
+                   np.choose(t, [zeros, zeros, h3]),
+                   answer)
+
+def _batch_literal_equation(rng, n):
+    return _format(pg._format_literal_equation, rng.integers(0, len(pg.LITERAL_FORMULAS), size=n))
+
+def _batch_word_problem(rng, n):
+    task = rng.integers(0, 2, size=n) # 0 = equation, 1 = inequality
+    start_int = _randint(rng, 5, 50, n)
+    budget = _randint(rng, 80, 200, n)
+    item_cost = _randint(rng, 5, 15, n)
+    flat_fee = _randint(rng, 10, 25, n)
+    return _format(pg._format_word_problem, _names(["equation", "inequality"], task),
+                   start_int, 3 * start_int + 3, budget, flat_fee, item_cost,
+                   (budget - flat_fee) // item_cost)
+
+# Vectorized generators, keyed like TOPICS
+BATCH_GENERATORS = {
+    "Order of Operations": _batch_order_of_operations,
+    "Two-Step Linear Equations": _batch_linear_equation,
+    "Multi-Step Equations (Fractions)": _batch_multistep_equation_fractions,
+    "Literal Equations": _batch_literal_equation,
+    "One-Variable Word Problems": _batch_word_problem,
+    "Simplify Expressions": _batch_simplify_expression,
+    "Polynomial Operations": _batch_polynomial_operations,
+    "Factor Simple Quadratics": _batch_factoring_quadratic,
+    "Factoring Binomials": _batch_factoring_binomials,
+    "Factoring Quadratics (A>1)": _batch_factoring_harder_quadratic,
+    "Slope Between Two Points": _batch_slope_from_points,
+    "Evaluating Functions": _batch_evaluate_function,
+    "Multi-Step Inequalities": _batch_multistep_inequality,
+    "Compound Inequalities": _batch_compound_inequality,
+    "Systems of Equations": _batch_system_of_equations,
+    "Equation from Two Points": _batch_write_equation_from_points,
+    "Parallel & Perpendicular Lines": _batch_parallel_perpendicular_line,
+    "Exponent Rules": _batch_exponent_rules,
+    "Radical Operations": _batch_radical_operations,
+}
+
+def generate_batch(topic, n, seed=None):
+    """Generates n (problem, answer) pairs for a text topic in one vectorized pass."""
+    if topic not in BATCH_GENERATORS:
+        if topic in pg.TOPICS:
+            raise ValueError(f"Batch generation is only available for text topics, not {topic!r}")
+        raise KeyError(topic)
+    rng = np.random.default_rng(seed)
+    return BATCH_GENERATORS[topic](rng, n)
@@ -0,0 +1 @@
+# File: benchmarks/__init__.py
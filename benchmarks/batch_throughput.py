@@ -0,0 +1,30 @@
+# File: benchmarks/batch_throughput.py
+#
+# Compares the scalar TOPICS generators with batch_generator.generate_batch.
+# Run from the repository root:  python -m benchmarks.batch_throughput [n]
+
+import sys
+import time
+
+from problem_generator import TOPICS
+from batch_generator import BATCH_GENERATORS, generate_batch
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+
+    print(f"{'Topic':35s} {'scalar/s':>12s} {'batch/s':>12s} {'speedup':>8s}")
+    for topic in BATCH_GENERATORS:
+        generator_func = TOPICS[topic]
+        start = time.perf_counter()
+        for _ in range(n):
+            generator_func()
+        scalar_rate = n / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        generate_batch(topic, n, seed=0)
+        batch_rate = n / (time.perf_counter() - start)
+
+        print(f"{topic:35s} {scalar_rate:12,.0f} {batch_rate:12,.0f} {batch_rate / scalar_rate:7.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+# File: benchmarks/concurrent_render.py
+#
+# Concurrency check for graph rendering, the way Streamlit renders: every
+# session's script runs on its own thread. n graph problems are rendered one
+# after another to get reference bytes, then again from a pool of each
+# thread count, starting with empty background caches so the threads also
+# race to draw the coordinate planes. Every render must be byte-identical to
+# its serial reference. Reports graphs per second and the scaling against
+# the serial run; exits non-zero on any mismatch or error.
+# Run from the repository root:
+#   python -m benchmarks.concurrent_render [n] [backend] [thread counts, e.g. 4,16]
+
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import coordinate_plane
+import figure_manager
+from plot_spec import render
+from problem_generator import GRAPH_TOPICS
+from problems import Problem
+from seeding import make_rng
+
+THREAD_COUNTS = (4, 16)
+
+def rendered(specs, backend, threads):
+    """Renders every spec from a pool of threads (or serially for None); returns (outputs, seconds)."""
+    coordinate_plane._BACKGROUNDS.clear() # Cold, so the first renders race for the planes
+    start = time.perf_counter()
+    if threads is None:
+        outputs = [render(spec, backend) for spec in specs]
+    else:
+        with ThreadPoolExecutor(threads) as pool:
+            outputs = list(pool.map(render, specs, [backend] * len(specs)))
+    return outputs, time.perf_counter() - start
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    backend = sys.argv[2] if len(sys.argv) > 2 else "png"
+    counts = [int(count) for count in sys.argv[3].split(",")] if len(sys.argv) > 3 else THREAD_COUNTS
+    rng = make_rng(0, "concurrent render")
+    specs = []
+    for i in range(n):
+        record = Problem.generate(GRAPH_TOPICS[i % len(GRAPH_TOPICS)], rng)
+        specs.append(record.build()[0 if record.problem_is_graph else 1])
+
+    rendered(specs[:len(GRAPH_TOPICS)], backend, None) # Warm up imports and fonts
+    reference, serial = rendered(specs, backend, None)
+    print(f"{n} graphs, {backend}")
+    print(f"{'serial':>10s} {n / serial:9,.1f} graphs/s")
+
+    failed = False
+    for threads in counts:
+        outputs, seconds = rendered(specs, backend, threads)
+        mismatches = sum(got != expected for got, expected in zip(outputs, reference))
+        failed = failed or mismatches > 0
+        print(f"{threads:3d} threads {n / seconds:9,.1f} graphs/s  {serial / seconds:5.2f}x serial  "
+              f"{mismatches} of {n} differ")
+    print(f"Live figures afterwards: {figure_manager.live_count()}")
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+# File: benchmarks/deferred_graphs.py
+#
+# Latency of one "Generate Problem" click on each graphing topic, with every
+# graph rendered up front (what webapp.py did while generators returned
+# figures) and with deferred rendering (only the problem is rendered; an
+# answer graph waits for "Show Answer"). Also shows how long a graph takes
+# to generate as a plot spec compared with building its matplotlib figure.
+# Run from the repository root:  python -m benchmarks.deferred_graphs [n]
+
+import sys
+import time
+
+import figure_manager
+import plot_spec
+from problem_generator import GRAPH_TOPICS, TOPICS
+from seeding import make_rng
+
+def per_call_ms(func, n):
+    start = time.perf_counter()
+    for _ in range(n):
+        func()
+    return (time.perf_counter() - start) / n * 1000
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 30
+
+    print(f"{'Topic':35s} {'spec us':>8s} {'figure ms':>9s} {'eager ms':>9s} {'deferred ms':>11s} {'saved ms':>9s}")
+    for topic in GRAPH_TOPICS:
+        generator_func = TOPICS[topic]
+        rng = make_rng(0, topic)
+        figure_manager.render_result(generator_func(rng)) # Warm the coordinate-plane cache and fonts
+
+        def figure():
+            for part in generator_func(rng):
+                if not isinstance(part, str):
+                    figure_manager.release(part.to_figure())
+
+        def eager():
+            figure_manager.render_result(generator_func(rng))
+
+        def deferred():
+            problem, answer = generator_func(rng)
+            if not isinstance(problem, str):
+                plot_spec.render(problem)
+
+        spec_us = per_call_ms(lambda: generator_func(rng), n * 100) * 1000
+        figure_ms = per_call_ms(figure, n)
+        eager_ms = per_call_ms(eager, n)
+        deferred_ms = per_call_ms(deferred, n)
+        print(f"{topic:35s} {spec_us:8.1f} {figure_ms:9.1f} {eager_ms:9.1f} {deferred_ms:11.1f} "
+              f"{eager_ms - deferred_ms:9.1f}")
+
+if __name__ == "__main__":
+    main()
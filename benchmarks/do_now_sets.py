@@ -0,0 +1,71 @@
+# File: benchmarks/do_now_sets.py
+#
+# Time until a 10-problem Do Now set is ready (every graph rendered as PNG),
+# composed by do_now.Composer with its worker pool, against making the same
+# problems one after another, and against rendering a single graph. The goal
+# is a set in about the time of one graph, which takes at least a worker per
+# graph and as many free cores. Also compares drawing topics from the alias
+# tables with random.choices.
+# Run from the repository root:  python -m benchmarks.do_now_sets [sets] [workers]
+
+import random
+import statistics
+import sys
+import time
+
+import do_now
+import plot_spec
+from seeding import make_rng
+
+MIX = [("Equations", 3), ("Factoring", 2), ("Expressions", 2), ("Graphs", 3)]
+
+def made_here(record):
+    """Builds a problem and renders its graphs, bypassing the render cache."""
+    return [part if isinstance(part, str) else plot_spec.render(part, "png") for part in record.build()]
+
+def main():
+    sets = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    composer = do_now.Composer("png", workers)
+    composer.measure(samples=2)
+    time.sleep(5) # Let the workers start and draw their planes
+
+    rng = make_rng(0, "do now benchmark")
+    composed, serial, one_graph = [], [], []
+    for _ in range(sets):
+        do_now_set = composer.compose(MIX, rng)
+        composed.append(do_now_set.seconds)
+
+        start = time.perf_counter()
+        for record in do_now_set.records:
+            made_here(record)
+        serial.append(time.perf_counter() - start)
+
+        graph = next(record for record in do_now_set.records if record.answer_is_graph or record.problem_is_graph)
+        start = time.perf_counter()
+        made_here(graph)
+        one_graph.append(time.perf_counter() - start)
+    composer.close()
+
+    print(f"{sets} sets of {sum(count for choices, count in MIX)} problems ({len(MIX)} categories, "
+          f"{dict(MIX)['Graphs']} graphs), PNG, {composer.workers} workers")
+    for label, times in (("Composed (pool)", composed), ("One after another", serial), ("One graph", one_graph)):
+        print(f"{label:20s} median {statistics.median(times) * 1000:7.1f} ms   max {max(times) * 1000:7.1f} ms")
+    print(f"Set / one graph: {statistics.median(composed) / statistics.median(one_graph):.1f}x")
+
+    n = 1_000_000
+    table = do_now._table("Graphs")
+    weights = {topic: 1 for topic in table.items}
+    rng = random.Random(0)
+    start = time.perf_counter()
+    for _ in range(n):
+        table.sample(rng)
+    alias = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(n):
+        rng.choices(list(weights), list(weights.values()))
+    choices = time.perf_counter() - start
+    print(f"Topic draws: alias table {n / alias:,.0f}/s, random.choices {n / choices:,.0f}/s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+# File: benchmarks/figure_soak.py
+#
+# Soak test for figure lifecycle: generates many graphs the way webapp.py does
+# (generate, render to PNG, keep only the bytes) and samples the process RSS.
+# Exits non-zero if memory keeps growing after the warm-up.
+# Run from the repository root:  python -m benchmarks.figure_soak [n]
+
+import random
+import sys
+
+import figure_manager
+from problem_generator import GRAPH_TOPICS, TOPICS
+
+MAX_GROWTH_MB = 20
+
+def rss_mb():
+    """Returns the current resident set size in MB (Linux)."""
+    with open("/proc/self/statm") as f:
+        resident_pages = int(f.read().split()[1])
+    return resident_pages * 4096 / 2**20
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    sample_every = max(n // 20, 1)
+    samples = []
+
+    for i in range(1, n + 1):
+        topic = random.choice(GRAPH_TOPICS)
+        figure_manager.render_result(TOPICS[topic]())
+        if i % sample_every == 0:
+            samples.append(rss_mb())
+            print(f"{i:7d} graphs  rss={samples[-1]:7.1f} MB  live figures={figure_manager.live_count()}")
+
+    # Compare against the first sample after warm-up (caches, font loading)
+    baseline = samples[min(2, len(samples) - 1)]
+    growth = max(samples) - baseline
+    print(f"Growth after warm-up: {growth:.1f} MB (limit {MAX_GROWTH_MB} MB)")
+    sys.exit(1 if growth > MAX_GROWTH_MB else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+# File: benchmarks/grading_throughput.py
+#
+# Grading throughput of grading.py on simulated Do Now responses. For every
+# text topic a day's worksheet of PROBLEMS problems is answered by students,
+# in writing styles that vary (spacing, ASCII symbols, one notation or both)
+# and with typical mistakes (a flipped sign, an off-by-one, a blank). The
+# batch is written to CSV and JSONL in memory and graded from there, so
+# parsing the file is included. "cold" grades each distinct response once
+# on empty caches: the cost when nothing repeats.
+# Run from the repository root:  python -m benchmarks.grading_throughput [responses per topic]
+
+import csv
+import io
+import json
+import random
+import sys
+import time
+
+import grading
+from problems import TOPIC_NAMES, Problem
+from seeding import make_rng
+
+PROBLEMS = 20 # Problems on a worksheet
+TARGET = 100_000 # Responses per second
+
+ASCII = (("≥", ">="), ("≤", "<="), ("∞", "inf"), ("√", "sqrt"), ("²", "^2"), (" U ", " u "))
+
+def styles(answer):
+    """Correct ways of typing an answer."""
+    variants = [answer, answer.replace(" ", "")]
+    ascii_answer = answer
+    for symbol, spelling in ASCII:
+        ascii_answer = ascii_answer.replace(symbol, spelling)
+    variants.append(ascii_answer)
+    if " | " in answer: # Inequalities: just one of the notations
+        variants.extend(part.split(": ", 1)[1] for part in answer.split(" | "))
+    elif " = " in answer and "\n" not in answer:
+        variants.append(answer.split(" = ", 1)[1])
+    return variants
+
+def mistakes(answer, rng):
+    """Wrong ways of typing it."""
+    flipped = answer.replace("+", "\0").replace(" - ", " + ").replace("\0", "-") if "+" in answer else "-" + answer
+    digits = [i for i, c in enumerate(answer) if c in "0123456789"]
+    off = answer
+    if digits:
+        i = rng.choice(digits)
+        off = answer[:i] + str((int(answer[i]) + 1) % 10) + answer[i + 1:]
+    return [flipped, off, "", "idk"]
+
+def responses(topic, n, rng):
+    """n (problem id, response) rows for one topic's worksheet: about 70% right."""
+    records = [Problem.generate(topic, rng) for _ in range(PROBLEMS)]
+    choices = []
+    for record in records:
+        answer = record.text()[1]
+        problem_id = f"{record.topic_id}-{record.index}"
+        choices.append((problem_id, styles(answer), mistakes(answer, rng)))
+    rows = []
+    for student in range(n):
+        problem_id, right, wrong = rng.choice(choices)
+        response = rng.choice(right) if rng.random() < 0.7 else rng.choice(wrong)
+        rows.append({"student": f"s{student % 900}", "problem": problem_id, "response": response})
+    return rows
+
+def as_csv(rows):
+    out = io.StringIO(newline="")
+    writer = csv.DictWriter(out, fieldnames=list(rows[0]))
+    writer.writeheader()
+    writer.writerows(rows)
+    return out.getvalue()
+
+def as_jsonl(rows):
+    return "".join(json.dumps(row, ensure_ascii=False) + "\n" for row in rows)
+
+def clear_caches():
+    for cached in (grading.normalize, grading.error_pattern, grading.expected_answer, grading._expected_value):
+        cached.cache_clear()
+
+def rate(text, fmt, n):
+    start = time.perf_counter()
+    report = grading.grade_stream(io.StringIO(text, newline=""), fmt)
+    return n / (time.perf_counter() - start), report
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    rng = make_rng(0, "grading benchmark")
+    topics = [topic for topic in TOPIC_NAMES if topic in grading.ANSWER_KINDS]
+
+    print(f"{'Topic':35s} {'CSV/s':>9s} {'JSONL/s':>9s} {'cold/s':>8s} {'distinct':>8s}")
+    everything = []
+    for topic in topics:
+        rows = responses(topic, n, rng)
+        everything.extend(rows)
+        csv_text, jsonl_text = as_csv(rows), as_jsonl(rows)
+
+        distinct = as_csv(list({(row["problem"], row["response"]): row for row in rows}.values()))
+        clear_caches()
+        cold, _ = rate(distinct, "csv", distinct.count("\n") - 1)
+        rate(csv_text, "csv", n) # Warm the caches, as a day's earlier batches would
+        csv_rate, _ = rate(csv_text, "csv", n)
+        jsonl_rate, _ = rate(jsonl_text, "jsonl", n)
+        print(f"{topic:35s} {csv_rate:9,.0f} {jsonl_rate:9,.0f} {cold:8,.0f} {distinct.count(chr(10)) - 1:8,d}")
+
+    random.Random(0).shuffle(everything)
+    csv_rate, report = rate(as_csv(everything), "csv", len(everything))
+    jsonl_rate, _ = rate(as_jsonl(everything), "jsonl", len(everything))
+    print(f"{'All topics, shuffled':35s} {csv_rate:9,.0f} {jsonl_rate:9,.0f}")
+    print(f"Target {TARGET:,}/s per core: {'met' if min(csv_rate, jsonl_rate) >= TARGET else 'NOT met'}")
+    print()
+    print(report.text())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+# File: benchmarks/graph_render.py
+#
+# Times graph generation + PNG rendering (plot spec, figure, PNG) for every graphing topic.
+# Run from the repository root:  python -m benchmarks.graph_render [n]
+
+import sys
+import time
+
+import plot_spec
+from problem_generator import GRAPH_TOPICS, TOPICS
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+
+    print(f"{'Topic':35s} {'ms/graph':>9s} {'KB/graph':>9s}")
+    for topic in GRAPH_TOPICS:
+        TOPICS[topic]() # Warm the coordinate-plane cache
+        total_bytes = 0
+        start = time.perf_counter()
+        for _ in range(n):
+            problem, answer = TOPICS[topic]()
+            graph = problem if not isinstance(problem, str) else answer
+            total_bytes += len(plot_spec.render(graph))
+        elapsed = time.perf_counter() - start
+        print(f"{topic:35s} {elapsed / n * 1000:9.1f} {total_bytes / n / 1024:9.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+# File: benchmarks/import_time.py
+#
+# Measures cold-start import cost with `python -X importtime` for the paths
+# main.py and scripts take, plus the first graph (which loads the plotting
+# stack lazily) and the old eager import of NumPy + matplotlib for comparison.
+# Run from the repository root:  python -m benchmarks.import_time [repeats]
+
+import subprocess
+import sys
+
+SCENARIOS = {
+    "Text topic only":
+        "import problem_generator; problem_generator.generate_linear_equation()",
+    "Tk/CLI cold path (text topic)":
+        "import tkinter, problem_generator; problem_generator.generate_linear_equation()",
+    "First graph topic (lazy plotting)":
+        "import problem_generator; problem_generator.generate_graphing_linear_equation()",
+    "Eager NumPy + pyplot (previous import)":
+        "import numpy, matplotlib.pyplot, problem_generator",
+}
+
+# Imported by the interpreter itself before any of our code runs
+STARTUP_MODULES = {"site", "encodings", "_io", "marshal", "posix", "_frozen_importlib_external",
+                   "time", "zipimport", "_codecs", "codecs", "encodings.aliases", "encodings.utf_8",
+                   "_signal", "_abc", "abc", "io", "__main__"}
+
+def import_time_us(code):
+    """Runs code in a fresh interpreter and sums the top-level import times in microseconds."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                            capture_output=True, text=True, check=True)
+    total = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        # Only top-level imports (nested ones are already included), minus interpreter startup
+        if not name[1:].startswith(" ") and name.strip() not in STARTUP_MODULES:
+            total += int(cumulative)
+    return total
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    for label, code in SCENARIOS.items():
+        best = min(import_time_us(code) for _ in range(repeats))
+        print(f"{label:40s} {best / 1000:8.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+# File: benchmarks/load_client.py
+#
+# Load generator for server.py. Opens --concurrency keep-alive connections
+# and sends a mix of requests for --duration seconds, like a class of
+# tablets would: topic lists, seeded worksheets (from a limited pool of
+# seeds, so some repeat), and the graphs those worksheets link to. Like a
+# browser it remembers ETags and sends If-None-Match, so repeats come back
+# as 304s. Reports requests/second and p50/p95/p99 latency per kind.
+#
+# Starts its own server on a free port unless --url is given.
+# Run from the repository root:
+#   python -m benchmarks.load_client --concurrency 32 --duration 10
+#   python -m benchmarks.load_client --url http://127.0.0.1:8000
+
+import argparse
+import asyncio
+import json
+import random
+import socket
+import subprocess
+import sys
+import time
+from urllib.parse import quote, urlsplit
+
+SEED_POOL = 200 # Different worksheets the simulated clients ask for
+
+def percentiles(samples):
+    """Returns p50/p95/p99 of second samples in milliseconds (nearest rank)."""
+    ordered = sorted(samples)
+    last = len(ordered) - 1
+    return [ordered[round(last * p / 100)] * 1000 for p in (50, 95, 99)]
+
+class Connection:
+    """One keep-alive HTTP/1.1 connection."""
+
+    def __init__(self, host, port):
+        self.host, self.port = host, port
+        self.reader = self.writer = None
+
+    async def get(self, path, headers=()):
+        """Returns (status, headers, body) for GET path."""
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        lines = [f"GET {path} HTTP/1.1", f"Host: {self.host}"] + [f"{name}: {value}" for name, value in headers]
+        self.writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+        await self.writer.drain()
+
+        status = int((await self.reader.readline()).split()[1])
+        response_headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            response_headers[name.strip().lower()] = value.strip()
+        body = await self.reader.readexactly(int(response_headers.get("content-length", 0)))
+        if response_headers.get("connection") == "close":
+            self.writer.close()
+            self.writer = None
+        return status, response_headers, body
+
+async def client(host, port, deadline, topics, graph_images, stats, rng, image_format):
+    """Sends requests until the deadline, recording (kind, seconds, status) in stats."""
+    connection = Connection(host, port)
+    etags = {} # path -> ETag, like a browser cache
+    while time.perf_counter() < deadline:
+        roll = rng.random()
+        if roll < 0.05:
+            kind, path = "topics", "/topics"
+        elif roll < 0.55 or not graph_images:
+            topic = rng.choice(topics)
+            kind, path = "problem", f"/problem?topic={quote(topic)}&seed={rng.randrange(SEED_POOL)}&n=5"
+        else:
+            kind, path = f"image.{image_format}", rng.choice(graph_images)
+        headers = [("If-None-Match", etags[path])] if path in etags else []
+
+        start = time.perf_counter()
+        status, response_headers, body = await connection.get(path, headers)
+        stats.append((kind, time.perf_counter() - start, status))
+
+        if "etag" in response_headers:
+            etags[path] = response_headers["etag"]
+        if kind == "problem" and status == 200:
+            for item in json.loads(body): # Later requests fetch the graphs this worksheet links to
+                for part in ("problem_image", "answer_image"):
+                    if part in item and len(graph_images) < 5000:
+                        graph_images.append(item[part][image_format])
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def wait_for(host, port, timeout=60):
+    """Waits until something accepts connections on (host, port)."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection((host, port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"Server on {host}:{port} did not come up")
+
+async def run(host, port, concurrency, duration, image_format):
+    _, _, body = await Connection(host, port).get("/topics")
+    topics = [topic["name"] for topic in json.loads(body)]
+    graph_images, stats = [], []
+    deadline = time.perf_counter() + duration
+    start = time.perf_counter()
+    await asyncio.gather(*(client(host, port, deadline, topics, graph_images, stats, random.Random(i), image_format)
+                           for i in range(concurrency)))
+    return stats, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test server.py.")
+    parser.add_argument("--url", help="server to test (default: start one on a free port)")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds")
+    parser.add_argument("--format", choices=("svg", "png"), default="svg", help="graph format to request")
+    parser.add_argument("--workers", type=int, help="PNG render processes of the started server")
+    args = parser.parse_args()
+
+    server = None
+    if args.url:
+        url = urlsplit(args.url)
+        host, port = url.hostname, url.port or 80
+    else:
+        host, port = "127.0.0.1", free_port()
+        command = [sys.executable, "server.py", "--port", str(port)]
+        if args.workers:
+            command += ["--workers", str(args.workers)]
+        server = subprocess.Popen(command, stdout=subprocess.DEVNULL)
+        wait_for(host, port)
+    try:
+        stats, elapsed = asyncio.run(run(host, port, args.concurrency, args.duration, args.format))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    print(f"{len(stats):,} requests in {elapsed:.1f} s from {args.concurrency} connections: "
+          f"{len(stats) / elapsed:,.0f} requests/s")
+    print(f"{'kind':10s} {'count':>7s} {'304s':>6s} {'errors':>6s} {'p50 ms':>7s} {'p95 ms':>7s} {'p99 ms':>7s}")
+    for kind in sorted({kind for kind, _, _ in stats}) + ["all"]:
+        rows = [row for row in stats if kind in ("all", row[0])]
+        p50, p95, p99 = percentiles([seconds for _, seconds, _ in rows])
+        not_modified = sum(status == 304 for _, _, status in rows)
+        errors = sum(status >= 400 for _, _, status in rows)
+        print(f"{kind:10s} {len(rows):7,d} {not_modified:6,d} {errors:6,d} {p50:7.2f} {p95:7.2f} {p99:7.2f}")
+
+if __name__ == "__main__":
+    main()
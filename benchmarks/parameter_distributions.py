@@ -0,0 +1,116 @@
+# File: benchmarks/parameter_distributions.py
+#
+# Compares the parameter distribution of each precomputed table in
+# parameter_tables with the rejection loop it replaced. For every table it
+# prints the total variation distance between the two, next to the distance
+# between two runs of the old loop (the sampling noise floor), the draws the
+# loop wasted, and any old outcomes the table no longer produces.
+# Run from the repository root:  python -m benchmarks.parameter_distributions [n]
+
+import random
+import sys
+import time
+from collections import Counter
+from math import gcd
+
+import parameter_tables
+
+# --- The rejection loops as they were before the tables ---
+
+def old_system_coefficients(rng):
+    a, b, c, d, draws = 0, 0, 0, 0, 0
+    while (a * d - b * c) == 0:
+        a, b, c, d = (rng.randint(-4, 4) for _ in range(4))
+        draws += 4
+        if a == 0 and b == 0 and c == 0 and d == 0: a = 1
+    return (a, b, c, d), draws
+
+def old_graphing_system_coefficients(rng):
+    a, b, c, d, draws = 1, 1, 1, 1, 0
+    while (a * d - b * c) == 0 or 0 in (a, b, c, d):
+        a, b, c, d = (rng.randint(-3, 3) for _ in range(4))
+        draws += 4
+    return (a, b, c, d), draws
+
+def old_distinct_points(rng):
+    x1, y1, x2, y2 = (rng.randint(-5, 5) for _ in range(4))
+    draws = 4
+    while x1 == x2 and y1 == y2:
+        x2, y2 = rng.randint(-5, 5), rng.randint(-5, 5)
+        draws += 2
+    return (x1, y1, x2, y2), draws
+
+def old_non_vertical_points(rng):
+    x1, y1, x2, y2 = (rng.randint(-5, 5) for _ in range(4))
+    draws = 4
+    while x1 == x2:
+        x2 = rng.randint(-5, 5)
+        draws += 1
+    return (x1, y1, x2, y2), draws
+
+def old_coprime_pairs(rng):
+    a, b = rng.randint(2, 8), rng.randint(2, 8)
+    draws = 2
+    while gcd(a, b) != 1:
+        a = rng.randint(2, 8)
+        draws += 1
+    return (a, b), draws
+
+def old_different_slopes(rng):
+    m1, m2 = rng.randint(-2, 2), rng.randint(-2, 2)
+    draws = 2
+    if m1 == 0: m1 = 1
+    if m2 == 0: m2 = -1
+    while m1 == m2:
+        m2 = rng.randint(-2, 2)
+        draws += 1
+    return (m1, m2), draws
+
+COMPARISONS = [
+    (parameter_tables.system_coefficients, old_system_coefficients),
+    (parameter_tables.graphing_system_coefficients, old_graphing_system_coefficients),
+    (parameter_tables.distinct_points, old_distinct_points),
+    (parameter_tables.non_vertical_points, old_non_vertical_points),
+    (parameter_tables.coprime_pairs, old_coprime_pairs),
+    (parameter_tables.different_slopes, old_different_slopes),
+]
+
+def total_variation(counts_a, counts_b, n):
+    keys = set(counts_a) | set(counts_b)
+    return sum(abs(counts_a[k] - counts_b[k]) for k in keys) / (2 * n)
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    rng = random.Random(0)
+
+    for table_func, old_func in COMPARISONS:
+        table = table_func()
+
+        old_a, old_b, draws = Counter(), Counter(), 0
+        start = time.perf_counter()
+        for _ in range(n):
+            params, used = old_func(rng)
+            old_a[params] += 1
+            draws += used
+        old_time = time.perf_counter() - start
+        for _ in range(n):
+            old_b[old_func(rng)[0]] += 1
+
+        new = Counter()
+        start = time.perf_counter()
+        for _ in range(n):
+            new[table.sample(rng)] += 1
+        new_time = time.perf_counter() - start
+
+        valid = {table[i] for i in range(len(table))}
+        dropped = sorted(set(old_a) - valid)
+        print(f"{table_func.__name__}: {len(table)} valid tuples")
+        print(f"    TV(old, table) = {total_variation(old_a, new, n):.4f}"
+              f"   noise floor TV(old, old) = {total_variation(old_a, old_b, n):.4f}")
+        print(f"    draws per sample: old {draws / n:.2f}, table 1"
+              f"   time per sample: old {old_time / n * 1e6:.2f} us, table {new_time / n * 1e6:.2f} us")
+        if dropped:
+            print(f"    old outcomes no longer produced: {dropped[:6]}{' ...' if len(dropped) > 6 else ''}")
+
+if __name__ == "__main__":
+    main()
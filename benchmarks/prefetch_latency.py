@@ -0,0 +1,59 @@
+# File: benchmarks/prefetch_latency.py
+#
+# Click-to-display latency with and without the prefetch buffers of
+# prefetch.py: for every topic, the time from "Generate Problem" to having
+# the problem ready to show (text, or its graph rendered), once drawing and
+# rendering on the spot and once popping from a Prefetcher. Clicks are
+# spaced by a think time, as a student's would be, so the workers can keep
+# up; the hit rate shows how often they did.
+# Run from the repository root:
+#   python -m benchmarks.prefetch_latency [clicks] [think seconds] [png|svg]
+
+import statistics
+import sys
+import time
+
+from prefetch import Prefetcher
+from problem_generator import TOPICS
+from problems import Problem
+from seeding import make_rng
+
+WARM_UP = 10 # Seconds for the workers to start and fill the first buffers
+
+def displayed(record, backend, prefetcher=None):
+    """What the page shows after a click: the problem text, or its graph."""
+    if not record.problem_is_graph:
+        return record.part(0)
+    image = prefetcher.image(record, 0) if prefetcher is not None else None
+    return image if image is not None else record.part(0, backend)
+
+def main():
+    clicks = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    think = float(sys.argv[2]) if len(sys.argv) > 2 else 0.3
+    backend = sys.argv[3] if len(sys.argv) > 3 else "png"
+    rng = make_rng(0, "prefetch benchmark")
+    prefetcher = Prefetcher(backend=backend)
+    time.sleep(WARM_UP)
+
+    try:
+        print(f"{'Topic':35s} {'direct p50 ms':>13s} {'max':>7s} {'popped p50 ms':>13s} {'max':>7s} {'hits':>5s}")
+        for topic in TOPICS:
+            direct, popped = [], []
+            for _ in range(clicks):
+                start = time.perf_counter()
+                displayed(Problem.generate(topic, rng), backend)
+                direct.append((time.perf_counter() - start) * 1000)
+
+                start = time.perf_counter()
+                displayed(prefetcher.pop(topic), backend, prefetcher)
+                popped.append((time.perf_counter() - start) * 1000)
+                time.sleep(think)
+            stats = next(row for row in prefetcher.stats() if row["topic"] == topic)
+            print(f"{topic:35s} {statistics.median(direct):13.2f} {max(direct):7.2f} "
+                  f"{statistics.median(popped):13.2f} {max(popped):7.2f} "
+                  f"{stats['hits']:2d}/{stats['hits'] + stats['misses']:<2d}")
+    finally:
+        prefetcher.close()
+
+if __name__ == "__main__":
+    main()
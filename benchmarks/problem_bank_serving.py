@@ -0,0 +1,68 @@
+# File: benchmarks/problem_bank_serving.py
+#
+# Builds a problem bank (problem_bank.py) of n problems per topic in the
+# temporary directory, then measures what serving from it costs: the time
+# to open it, the Python memory that takes (the header, against the size of
+# the file), and random problems per second served from the bank (a random
+# row, its text built from the stored parameters) against drawing and
+# building them with the generators. Also checks the memory held after
+# serving, which should not grow with the number of rows in the bank.
+# Run from the repository root:  python -m benchmarks.problem_bank_serving [problems per topic]
+
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import problem_bank
+from problems import TOPIC_NAMES, Problem
+from seeding import make_rng
+
+SERVES = 20_000 # Per topic
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    path = os.path.join(tempfile.gettempdir(), "problem_bank_benchmark.pgb")
+    start = time.perf_counter()
+    problem_bank.build_bank(path, n, seed=0)
+    build = time.perf_counter() - start
+    size = os.path.getsize(path)
+    print(f"Built {n:,} problems x {len(TOPIC_NAMES)} topics in {build:.1f} s: {size / 2**20:,.1f} MB, "
+          f"{size / (n * len(TOPIC_NAMES)):.1f} bytes a problem")
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    bank = problem_bank.ProblemBank(path)
+    opened = time.perf_counter() - start
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"Opened in {opened * 1000:.2f} ms, {held / 1024:,.0f} KB of Python memory for a {size / 2**20:,.1f} MB bank")
+
+    print(f"{'Topic':35s} {'bank/s':>9s} {'generated/s':>11s} {'speedup':>8s}")
+    rng = make_rng(0, "bank benchmark")
+    for topic in TOPIC_NAMES:
+        start = time.perf_counter()
+        for _ in range(SERVES):
+            bank.problem(topic, bank.random(topic, rng))
+        served = SERVES / (time.perf_counter() - start)
+        start = time.perf_counter()
+        for _ in range(SERVES):
+            Problem.generate(topic, rng).build()
+        generated = SERVES / (time.perf_counter() - start)
+        print(f"{topic:35s} {served:9,.0f} {generated:11,.0f} {served / generated:7.2f}x")
+
+    # Memory kept by serving: every topic's rows are touched, none of them is kept
+    tracemalloc.start()
+    for topic in TOPIC_NAMES:
+        for _ in range(SERVES // 10):
+            bank.problem(topic, bank.random(topic, rng))
+    after, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"Python memory kept after serving {SERVES // 10 * len(TOPIC_NAMES):,} problems: {after / 1024:,.0f} KB "
+          f"(peak {peak / 1024:,.0f} KB)")
+    bank.close()
+    os.remove(path)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+# File: benchmarks/problem_memory.py
+#
+# Memory needed to keep n generated problems around, as the (problem, answer)
+# string tuples the generators return, as a list of Problem records, and as
+# a ProblemStore. Text topics are mixed evenly; graphs are estimated from the
+# average PNG size since a million of them would not fit in memory.
+# Run from the repository root:  python -m benchmarks.problem_memory [n]
+
+import random
+import sys
+import time
+import tracemalloc
+
+import figure_manager
+from problem_generator import GRAPH_TOPICS, TOPICS
+from problems import Problem, ProblemStore
+
+def traced_mb(build):
+    """Returns (result, MB still allocated by build(), seconds) measured with tracemalloc."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return result, size / 2**20, elapsed
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    text_topics = [topic for topic in TOPICS if topic not in GRAPH_TOPICS]
+    topics = [text_topics[i % len(text_topics)] for i in range(n)]
+
+    random.seed(0)
+    tuples, tuples_mb, tuples_s = traced_mb(lambda: [TOPICS[topic]() for topic in topics])
+    del tuples
+
+    random.seed(0) # Same draws as above
+    records, records_mb, records_s = traced_mb(lambda: [Problem.generate(topic) for topic in topics])
+    store, store_mb, store_s = traced_mb(lambda: ProblemStore(records))
+    assert store[n // 2] == records[n // 2]
+    del records
+
+    # Every record rebuilds the problem the generator returned for the same draw
+    # (factoring answers may list the factors in the other, equivalent order)
+    random.seed(0)
+    sample = [TOPICS[topic]()[0] for topic in topics[:1000]]
+    assert [store[i].render()[0] for i in range(1000)] == sample
+
+    graph_kb = sum(len(png) for topic in GRAPH_TOPICS for _ in range(3)
+                   for png in figure_manager.render_result(TOPICS[topic]())
+                   if isinstance(png, bytes)) / (3 * len(GRAPH_TOPICS)) / 1024
+
+    print(f"{n:,} text problems")
+    print(f"{'(problem, answer) tuples':28s} {tuples_mb:9.1f} MB {tuples_mb * 2**20 / n:7.1f} B each  "
+          f"({tuples_s:.1f} s to generate)")
+    print(f"{'list of Problem records':28s} {records_mb:9.1f} MB {records_mb * 2**20 / n:7.1f} B each  "
+          f"({records_s:.1f} s to draw)")
+    print(f"{'ProblemStore':28s} {store_mb:9.1f} MB {store.nbytes() / n:7.1f} B each")
+    print(f"Graph topics kept as PNG bytes: ~{graph_kb:.0f} KB each, "
+          f"{graph_kb * n / 2**20:,.0f} GB for {n:,}; as records they cost the same as text")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+# File: benchmarks/raster_output.py
+#
+# Bytes per graph from raster.py against the full-color PNG at the
+# coordinate plane's DPI that graphs were sent as before, on n graphs of
+# every graphing topic: palette PNG and WebP at the same DPI, and at the
+# default width. Reports the mean size, the reduction, the time per image,
+# and how far the palette images are from the full-color pixels at the
+# same DPI (largest channel error, and the pixels per image off by more
+# than VISIBLE levels, on the grid and everywhere). Then times writing into
+# one reused buffer against returning new bytes, and prints raster.report.
+# Run from the repository root:  python -m benchmarks.raster_output [n per topic]
+
+import io
+import sys
+import time
+
+import numpy as np
+from PIL import Image
+
+import raster
+from coordinate_plane import DPI
+from problem_generator import GRAPH_TOPICS, TOPICS
+from seeding import make_rng
+
+VISIBLE = 24 # Levels of 255 in a channel
+
+RUNS = [
+    # label, options; the first is the reference
+    ("Full-color PNG", raster.Options("png", dpi=DPI, colors=0)),
+    ("Palette PNG", raster.Options("png", dpi=DPI)),
+    ("Palette WebP", raster.Options("webp", dpi=DPI)),
+    (f"Palette PNG {raster.WIDTH}px", raster.Options("png")),
+    (f"Palette WebP {raster.WIDTH}px", raster.Options("webp")),
+]
+
+def graphs(n):
+    """n seeded graphs of every graphing topic, as plot specs."""
+    specs = []
+    for topic in GRAPH_TOPICS:
+        rng = make_rng(0, topic)
+        for _ in range(n):
+            problem, answer = TOPICS[topic](rng)
+            specs.append(problem if not isinstance(problem, str) else answer)
+    return specs
+
+def pixels(image):
+    return np.asarray(Image.open(io.BytesIO(image)).convert("RGB")).astype(np.int16)
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    specs = graphs(n)
+    for _, options in RUNS:
+        raster.render(specs[0], options) # Draw every plane size once before timing
+    raster.report.clear()
+
+    print(f"{len(specs)} graphs ({n} per topic); reference: full-color PNG at {DPI} DPI")
+    print(f"{'Output':22s} {'size':>9s} {'mean KB':>8s} {'smaller':>8s} {'ms/image':>9s} {'max error':>9s} "
+          f"{f'>{VISIBLE} grid':>9s} {f'>{VISIBLE} all':>9s}")
+    reference = None
+    for label, options in RUNS:
+        start = time.perf_counter()
+        images = [raster.render(spec, options) for spec in specs]
+        seconds = (time.perf_counter() - start) / len(specs)
+        size = sum(map(len, images)) / len(images)
+        width, height = Image.open(io.BytesIO(images[0])).size
+        reference = reference or (size, images)
+        errors = ""
+        if options.dpi == DPI and options.colors:
+            worst, grid, everywhere = 0, 0, 0
+            for image, full in zip(images, reference[1]):
+                full_pixels = pixels(full)
+                error = np.abs(pixels(image) - full_pixels).max(axis=2)
+                # The plane's gray grid lines and black axes: pixels with equal channels that aren't white
+                on_grid = (full_pixels.max(axis=2) == full_pixels.min(axis=2)) & (full_pixels[..., 0] < 250)
+                worst = max(worst, int(error.max()))
+                grid += int((error[on_grid] > VISIBLE).sum())
+                everywhere += int((error > VISIBLE).sum())
+            errors = f"{worst:9d} {grid / len(images):9.1f} {everywhere / len(images):9.1f}"
+        print(f"{label:22s} {f'{width}x{height}':>9s} {size / 1024:8.1f} {reference[0] / size:7.1f}x "
+              f"{seconds * 1000:9.1f} {errors}")
+
+    # Buffer reuse: one BytesIO written over for every image, against new bytes per image
+    options = raster.DEFAULTS["png"]
+    out = io.BytesIO()
+    start = time.perf_counter()
+    for spec in specs:
+        raster.render_into(spec, out, options)
+    reused = (time.perf_counter() - start) / len(specs)
+    start = time.perf_counter()
+    for spec in specs:
+        raster.render(spec, options)
+    returned = (time.perf_counter() - start) / len(specs)
+    print(f"\nrender_into one buffer {reused * 1000:.1f} ms/image, render() {returned * 1000:.1f} ms/image")
+
+    print(f"\n{'format':7s} {'width':>6s} {'images':>7s} {'mean KB':>8s} {'min KB':>7s} {'max KB':>7s}")
+    for row in raster.report.rows():
+        print(f"{row['format']:7s} {row['width']:6d} {row['images']:7d} {row['mean KB']:8.1f} "
+              f"{row['min KB']:7.1f} {row['max KB']:7.1f}")
+
+if __name__ == "__main__":
+    main()
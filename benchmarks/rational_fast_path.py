@@ -0,0 +1,96 @@
+# File: benchmarks/rational_fast_path.py
+#
+# The four generators that do fraction arithmetic, with rational.py's int
+# pairs versus the fractions.Fraction code they used before (kept below as
+# the reference). Both draw from identically seeded streams and must give
+# identical problems. Also reduces n random fractions with the scalar and
+# the NumPy reduce.
+# Run from the repository root:  python -m benchmarks.rational_fast_path [n]
+
+import sys
+import time
+from fractions import Fraction
+
+import numpy as np
+
+import problem_generator as pg
+import rational
+from seeding import make_rng
+
+# --- The Fraction versions, as they were ---
+
+def _fraction_slope_from_points(x1, y1, x2, y2):
+    if x1 == x2:
+        return pg._format_slope_from_points(x1, y1, x2, y2, 0, 0)
+    slope = Fraction(y2 - y1, x2 - x1)
+    return pg._format_slope_from_points(x1, y1, x2, y2, slope.numerator, slope.denominator)
+
+def _fraction_multistep_equation_fractions(x, a_num, a_den, b, c):
+    d = Fraction(a_num, a_den) * (b * x + c)
+    return pg._format_multistep_equation_fractions(x, a_num, a_den, pg._LINEAR(b, c), d.numerator, d.denominator)
+
+def _fraction_write_equation_from_points(x1, y1, x2, y2):
+    m = Fraction(y2 - y1, x2 - x1)
+    b = y1 - m * x1
+    return pg._format_write_equation_from_points(x1, y1, x2, y2, pg._LINE_FRACTIONS(m.numerator, m.denominator,
+                                                                                    b.numerator, b.denominator))
+
+def _fraction_parallel_perpendicular_line(task, m_num, m_den, b, px, py):
+    m = Fraction(m_num, m_den)
+    if task == "parallel":
+        new_m = m
+    else:
+        if m == 0:
+            return pg._format_parallel_perpendicular_line(task, 0, b, px, py, None, None)
+        new_m = -1 / m
+    new_b = py - new_m * px
+    return pg._format_parallel_perpendicular_line(task, m.numerator, b, px, py,
+                                                  pg._LINE_FRACTIONS(m.numerator, m.denominator, b, 1),
+                                                  pg._LINE_FRACTIONS(new_m.numerator, new_m.denominator,
+                                                                     new_b.numerator, new_b.denominator))
+
+TOPICS = {
+    "Slope Between Two Points": "slope_from_points",
+    "Multi-Step Equations (Fractions)": "multistep_equation_fractions",
+    "Equation from Two Points": "write_equation_from_points",
+    "Parallel & Perpendicular Lines": "parallel_perpendicular_line",
+}
+
+def rate(draw, build, topic, n):
+    """Problems per second of build(*draw(rng)), and a few of them to compare."""
+    rng = make_rng(0, topic)
+    start = time.perf_counter()
+    for _ in range(n):
+        build(*draw(rng))
+    elapsed = time.perf_counter() - start
+    rng = make_rng(1, topic)
+    return n / elapsed, [build(*draw(rng)) for _ in range(1000)]
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+
+    print(f"{'Topic':35s} {'Fraction/s':>11s} {'int pairs/s':>11s} {'speedup':>8s}")
+    for topic, name in TOPICS.items():
+        draw = getattr(pg, "_draw_" + name)
+        fraction_rate, expected = rate(draw, globals()["_fraction_" + name], topic, n)
+        pair_rate, got = rate(draw, getattr(pg, "_build_" + name), topic, n)
+        assert got == expected, topic
+        print(f"{topic:35s} {fraction_rate:11,.0f} {pair_rate:11,.0f} {pair_rate / fraction_rate:7.2f}x")
+
+    rng = np.random.default_rng(0)
+    num = rng.integers(-60, 61, size=n)
+    den = rng.integers(1, 61, size=n) * rng.choice([-1, 1], size=n)
+    pairs = list(zip(num.tolist(), den.tolist()))
+    timings = {}
+    for label, reduce_all in (("Fraction", lambda: [Fraction(a, b) for a, b in pairs]),
+                              ("rational.reduce", lambda: [rational.reduce(a, b) for a, b in pairs]),
+                              ("rational.reduce_array", lambda: rational.reduce_array(num, den))):
+        start = time.perf_counter()
+        reduce_all()
+        timings[label] = time.perf_counter() - start
+    print()
+    for label, seconds in timings.items():
+        print(f"Reducing {n:,} fractions with {label:22s} {seconds * 1000:8.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+# File: benchmarks/render_backends.py
+#
+# Compares the two graph renderers on every graphing topic: matplotlib PNG
+# and the pure-Python SVG of svg_render.py. Reports render time per graph
+# and output size (raw and gzipped, as it would travel over HTTP), then the
+# cold start of each backend: a fresh interpreter importing everything it
+# needs and rendering one graph.
+# Run from the repository root:  python -m benchmarks.render_backends [n]
+
+import gzip
+import subprocess
+import sys
+import time
+
+import plot_spec
+from problem_generator import GRAPH_TOPICS, TOPICS
+from seeding import make_rng
+
+COLD_START = """
+import time
+start = time.perf_counter()
+import plot_spec
+from problem_generator import generate_graphing_linear_inequality
+problem, graph = generate_graphing_linear_inequality()
+plot_spec.render(graph, {backend!r})
+print(time.perf_counter() - start)
+"""
+
+def graphs(topic, n):
+    """n seeded graphs of a topic, as plot specs."""
+    rng = make_rng(0, topic)
+    specs = []
+    for _ in range(n):
+        problem, answer = TOPICS[topic](rng)
+        specs.append(problem if not isinstance(problem, str) else answer)
+    return specs
+
+def measure(specs, backend, repeats):
+    """Returns (microseconds per render, mean bytes, mean gzipped bytes)."""
+    plot_spec.render(specs[0], backend) # Warm caches and lazy imports
+    start = time.perf_counter()
+    for _ in range(repeats):
+        outputs = [plot_spec.render(spec, backend) for spec in specs]
+    elapsed = time.perf_counter() - start
+    raw = [output.encode() if isinstance(output, str) else output for output in outputs]
+    return (elapsed / (repeats * len(specs)) * 1e6,
+            sum(map(len, raw)) / len(raw), sum(len(gzip.compress(data)) for data in raw) / len(raw))
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+
+    print(f"{'Topic':35s} {'PNG us':>9s} {'SVG us':>7s} {'speedup':>8s} "
+          f"{'PNG KB':>7s} {'SVG KB':>7s} {'SVG gz KB':>9s}")
+    for topic in GRAPH_TOPICS:
+        specs = graphs(topic, n)
+        png_us, png_bytes, _ = measure(specs, "png", 1)
+        svg_us, svg_bytes, svg_gzip = measure(specs, "svg", 50)
+        print(f"{topic:35s} {png_us:9.0f} {svg_us:7.1f} {png_us / svg_us:7.0f}x "
+              f"{png_bytes / 1024:7.1f} {svg_bytes / 1024:7.1f} {svg_gzip / 1024:9.1f}")
+
+    for backend in plot_spec.BACKENDS:
+        result = subprocess.run([sys.executable, "-c", COLD_START.format(backend=backend)],
+                                capture_output=True, text=True, check=True)
+        print(f"Cold start to the first {backend.upper()} graph: {float(result.stdout) * 1000:.0f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+# File: benchmarks/sharded_generation.py
+#
+# Problem bank generation through coordinator.py on local process pools of
+# several sizes, and on two worker hosts on this machine (started with
+# "python coordinator.py serve", the same way as on real hosts). Every run
+# must produce the same bytes as the one-worker run. Reports problems per
+# second, the median shard throughput and the stragglers of each run, then
+# the full report of the last one; exits non-zero on any difference.
+# Run from the repository root:  python -m benchmarks.sharded_generation [count per topic] [worker counts, e.g. 1,2,4]
+
+import hashlib
+import io
+import os
+import secrets
+import subprocess
+import sys
+
+import coordinator
+from problems import TOPIC_NAMES
+
+SEED = 2024
+HOST_PORTS = (9131, 9132)
+
+def start_hosts(authkey):
+    """Starts a one-process worker host per port on this machine; returns the processes once they listen."""
+    environment = dict(os.environ, **{coordinator.AUTHKEY_VARIABLE: authkey})
+    hosts = [subprocess.Popen([sys.executable, "coordinator.py", "serve", "--port", str(port), "--workers", "1"],
+                              stdout=subprocess.PIPE, text=True, env=environment) for port in HOST_PORTS]
+    for host in hosts:
+        host.stdout.readline() # "Worker host on ..."
+    return hosts
+
+def run(counts, **where):
+    out = io.BytesIO()
+    report = coordinator.generate_bank(counts, SEED, out, **where)
+    return out.getvalue(), report
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    worker_counts = [int(n) for n in sys.argv[2].split(",")] if len(sys.argv) > 2 else [1, 2, 4]
+    counts = {topic: count for topic in TOPIC_NAMES}
+    authkey = secrets.token_hex(16)
+
+    runs = [(f"{workers} local worker{'s' if workers > 1 else ''}", {"workers": workers})
+            for workers in worker_counts]
+    runs.append((f"{len(HOST_PORTS)} worker hosts", {"hosts": [("127.0.0.1", port) for port in HOST_PORTS],
+                                                    "authkey": authkey.encode()}))
+
+    print(f"{count:,} problems per topic, {len(TOPIC_NAMES)} topics, shards of {coordinator.SHARD_SIZE:,}")
+    print(f"{'Run':18s} {'problems/s':>10s} {'seconds':>8s} {'shard median/s':>14s} {'stragglers':>10s}  sha256")
+    reference = None
+    failed = False
+    hosts = start_hosts(authkey)
+    try:
+        for label, where in runs:
+            bank, report = run(counts, **where)
+            digest = hashlib.sha256(bank).hexdigest()
+            reference = reference or digest
+            failed = failed or digest != reference
+            median = sorted((stop - start) / seconds for (n, topic, start, stop), seconds, worker in report.shards)
+            print(f"{label:18s} {report.problems / report.seconds:10,.0f} {report.seconds:8.2f} "
+                  f"{median[len(median) // 2]:14,.0f} {len(report.stragglers()):10d}  {digest[:16]}"
+                  f"{'' if digest == reference else '  DIFFERS'}")
+    finally:
+        for host in hosts:
+            host.terminate()
+            host.wait()
+    print()
+    print(report.text())
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+# File: benchmarks/suite.py
+#
+# Benchmark suite for every TOPICS generator and the two front-ends, with a
+# regression gate. For each topic it reports throughput, p50/p95/p99 latency
+# and tracemalloc allocations; graphing topics also report PNG render time,
+# PNG size and peak RSS. Each topic runs in its own interpreter so its peak
+# RSS and caches are not mixed up with the other topics'. Then it measures
+# the import time of problem_generator and the cold start of webapp.py
+# (scripted through Streamlit's AppTest) and main.py.
+#
+# Results are written as JSON so runs can be diffed. With --baseline the run
+# is compared against an earlier JSON file and the exit status is 1 if any
+# topic got slower by more than --threshold (a fraction, 0.25 = 25%).
+#
+# Run from the repository root:
+#   python -m benchmarks.suite --output bench.json
+#   python -m benchmarks.suite --output new.json --baseline bench.json --threshold 0.25
+#   python -m benchmarks.suite --load new.json --baseline bench.json   (compare only)
+
+import argparse
+import gc
+import json
+import platform
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+
+TEXT_ITERATIONS = 5000
+GRAPH_ITERATIONS = 40
+ALLOC_ITERATIONS = 200 # tracemalloc slows everything down, so it gets its own shorter pass
+DEFAULT_THRESHOLD = 0.25
+
+WEBAPP_COLD_START = """
+import json, time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+imported = time.perf_counter()
+app = AppTest.from_file("webapp.py", default_timeout=120)
+app.run()
+first_run = time.perf_counter()
+app.button[0].click().run()
+first_problem = time.perf_counter()
+app.selectbox[0].set_value("Graphing Linear Equations").run()
+app.button[0].click().run()
+first_graph = time.perf_counter()
+assert not app.exception, app.exception
+print(json.dumps({"import_streamlit_s": round(imported - start, 3), "first_run_s": round(first_run - imported, 3),
+                  "first_problem_s": round(first_problem - first_run, 3),
+                  "first_graph_s": round(first_graph - first_problem, 3)}))
+"""
+
+TK_COLD_START = """
+import json, runpy, time, tkinter
+start = time.perf_counter()
+# Draw the first frame, then return instead of blocking in the event loop
+tkinter.Tk.mainloop = lambda self, n=0: self.update()
+runpy.run_path("main.py", run_name="__main__")
+print(json.dumps({"first_frame_s": round(time.perf_counter() - start, 3)}))
+"""
+
+def percentiles(samples_ns):
+    """Returns p50/p95/p99 of nanosecond samples in microseconds (nearest rank)."""
+    ordered = sorted(samples_ns)
+    last = len(ordered) - 1
+    return {f"p{p}": round(ordered[round(last * p / 100)] / 1000, 2) for p in (50, 95, 99)}
+
+def measure_topic(topic, n):
+    """Measures one topic in this process; graphs are rendered to PNG like webapp.py does."""
+    import figure_manager
+    from problem_generator import GRAPH_TOPICS, TOPICS
+    from seeding import make_rng
+
+    generator_func = TOPICS[topic]
+    rng = make_rng(0, topic)
+    graph = topic in GRAPH_TOPICS
+    figure_manager.render_result(generator_func(rng)) # Warm caches and lazy imports
+
+    generate_ns, render_ns, png_bytes = [], [], 0
+    start = time.perf_counter()
+    for _ in range(n):
+        t0 = time.perf_counter_ns()
+        result = generator_func(rng)
+        t1 = time.perf_counter_ns()
+        generate_ns.append(t1 - t0)
+        if graph:
+            png_bytes += sum(len(part) for part in figure_manager.render_result(result)
+                             if isinstance(part, bytes))
+            render_ns.append(time.perf_counter_ns() - t1)
+    elapsed = time.perf_counter() - start
+    peak_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024 # Before tracemalloc adds its own
+
+    # Allocations: peak traced memory while building one problem, and what stays behind
+    alloc_n = min(n, ALLOC_ITERATIONS)
+    peaks = 0
+    tracemalloc.start()
+    figure_manager.render_result(generator_func(rng))
+    gc.collect()
+    baseline = tracemalloc.get_traced_memory()[0]
+    for _ in range(alloc_n):
+        before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        figure_manager.render_result(generator_func(rng))
+        peaks += tracemalloc.get_traced_memory()[1] - before
+    gc.collect() # Figures are reference cycles; only count what is really kept alive
+    retained = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+
+    stats = {
+        "iterations": n,
+        "per_second": round(n / elapsed, 1), # End to end, including the PNG for graphs
+        "latency_us": percentiles(generate_ns),
+        "alloc_peak_kb": round(peaks / alloc_n / 1024, 2),
+        "alloc_retained_kb": round(retained / 1024, 2),
+    }
+    if graph:
+        stats["render_us"] = percentiles(render_ns)
+        stats["png_kb"] = round(png_bytes / n / 1024, 1)
+        stats["peak_rss_mb"] = round(peak_rss_mb, 1)
+    return stats
+
+def _run_json(args, timeout=600):
+    """Runs a child interpreter and parses the JSON it prints last; errors are reported, not raised."""
+    try:
+        result = subprocess.run([sys.executable] + args, capture_output=True, text=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return {"error": f"timed out after {timeout} s"}
+    if result.returncode != 0:
+        return {"error": (result.stderr.strip().splitlines() or ["exit status %d" % result.returncode])[-1]}
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def run_topics(scale):
+    """Measures every topic, each in a fresh interpreter."""
+    from problem_generator import GRAPH_TOPICS, TOPICS
+
+    results = {}
+    for topic in TOPICS:
+        n = max(int((GRAPH_ITERATIONS if topic in GRAPH_TOPICS else TEXT_ITERATIONS) * scale), 5)
+        results[topic] = _run_json(["-m", "benchmarks.suite", "--topic", topic, "--iterations", str(n)])
+        print(f"  {topic:35s} {results[topic].get('per_second', results[topic].get('error'))}/s", file=sys.stderr)
+    return results
+
+def run_imports(repeats):
+    """Best-of-N import times in milliseconds for the scenarios in benchmarks.import_time."""
+    from benchmarks.import_time import SCENARIOS, import_time_us
+
+    return {label: round(min(import_time_us(code) for _ in range(repeats)) / 1000, 2)
+            for label, code in SCENARIOS.items()}
+
+def run_front_ends():
+    """Cold-start timings of webapp.py and main.py, each in a fresh interpreter."""
+    results = {}
+    for name, code in (("webapp", WEBAPP_COLD_START), ("tk", TK_COLD_START)):
+        start = time.perf_counter()
+        results[name] = _run_json(["-c", code])
+        results[name]["process_s"] = round(time.perf_counter() - start, 3)
+    return results
+
+def compare(current, baseline, threshold):
+    """Returns one message per topic that got slower than baseline by more than threshold."""
+    regressions = []
+    for topic, stats in current["topics"].items():
+        before = baseline.get("topics", {}).get(topic, {})
+        if "per_second" not in stats or "per_second" not in before:
+            continue
+        slowdown = before["per_second"] / stats["per_second"] - 1
+        if slowdown > threshold:
+            regressions.append(f"{topic}: {before['per_second']:,.0f}/s -> {stats['per_second']:,.0f}/s "
+                               f"({slowdown:.0%} slower, limit {threshold:.0%})")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark every topic and the front-ends.")
+    parser.add_argument("--output", help="write the JSON results here (default: stdout)")
+    parser.add_argument("--baseline", help="earlier JSON results to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed slowdown per topic as a fraction (default %(default)s)")
+    parser.add_argument("--load", help="compare this existing JSON file instead of running")
+    parser.add_argument("--quick", action="store_true", help="10x fewer iterations, no front-ends")
+    parser.add_argument("--topic", help=argparse.SUPPRESS) # Child mode: measure one topic
+    parser.add_argument("--iterations", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.topic:
+        print(json.dumps(measure_topic(args.topic, args.iterations)))
+        return
+
+    if args.load:
+        with open(args.load) as f:
+            results = json.load(f)
+    else:
+        results = {
+            "meta": {"python": platform.python_version(), "platform": platform.platform(),
+                     "time": time.strftime("%Y-%m-%dT%H:%M:%S"), "quick": args.quick},
+            "topics": run_topics(0.1 if args.quick else 1),
+            "imports_ms": run_imports(2 if args.quick else 5),
+        }
+        if not args.quick:
+            results["front_ends"] = run_front_ends()
+
+        text = json.dumps(results, indent=2, ensure_ascii=False)
+        if args.output:
+            with open(args.output, "w") as f:
+                f.write(text + "\n")
+        else:
+            print(text)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        for message in regressions:
+            print(f"REGRESSION {message}", file=sys.stderr)
+        print(f"{len(regressions)} topic(s) slower than the {args.threshold:.0%} threshold", file=sys.stderr)
+        sys.exit(1 if regressions else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+# File: benchmarks/term_formatting.py
+#
+# Writing n expressions with terms.py against the f-string and .replace
+# chains the generators used before (kept below as the reference), on
+# random coefficients in ranges like the generators': the left side of a
+# system's equation (ax + by), polynomials (ax² + bx + c) and binomials
+# (ax + b). Terms is timed called once per expression, as the _format_*
+# helpers do, and on whole NumPy columns with rows(). Also counts the
+# expressions the chains got wrong ("1y", "0x", "+ 0", "11x" -> "1x"),
+# checks every style against expressions written out by hand, called and
+# through rows(), and prints one expression with each way of writing
+# coefficients.
+# Run from the repository root:  python -m benchmarks.term_formatting [n]
+
+import sys
+import time
+
+import numpy as np
+
+from terms import STYLES, Terms
+
+# --- The replace chains, as they were ---
+
+def _chain_equation(a, b):
+    return f"{a}x + {b}y".replace('+ -', '- ').replace('1x', 'x')
+
+def _chain_polynomial(a, b, c):
+    return f"{a}x² + {b}x + {c}".replace('+ -', '- ')
+
+def _chain_binomial(a, b):
+    return f"{a}x + {b}".replace('+ -', '- ')
+
+SHAPES = [
+    # name, coefficient ranges, chain, Terms
+    ("ax + by", [(-4, 4), (-4, 4)], _chain_equation, Terms("x", "y")),
+    ("ax² + bx + c", [(-9, 9), (-9, 9), (-9, 9)], _chain_polynomial, Terms("x^2", "x", "")),
+    ("ax + b", [(-12, 12), (-12, 12)], _chain_binomial, Terms("x", "")),
+]
+
+# style, variables, number, coefficients, expected
+CHECKS = [
+    ("plain", ("x^2", "x", ""), None, (3, -1, 1), "3x² - x + 1"),
+    ("latex", ("x^2", "x", ""), None, (3, -1, 1), "3x^{2} - x + 1"),
+    ("mathml", ("x^2", "x", ""), None, (3, -1, 1),
+     "<mrow><mn>3</mn><mo>\u2062</mo><msup><mi>x</mi><mn>2</mn></msup><mo>−</mo><mi>x</mi><mo>+</mo><mn>1</mn></mrow>"),
+    ("plain", ("x", ""), "fraction", (-3, 4, 5, 2), "-3/4x + 5/2"),
+    ("latex", ("x", ""), "fraction", (-3, 4, 5, 2), "-\\frac{3}{4}x + \\frac{5}{2}"),
+    ("mathml", ("x", ""), "fraction", (-3, 4, 5, 2),
+     "<mrow><mo>−</mo><mfrac><mn>3</mn><mn>4</mn></mfrac><mo>\u2062</mo><mi>x</mi><mo>+</mo>"
+     "<mfrac><mn>5</mn><mn>2</mn></mfrac></mrow>"),
+    ("latex", ("x", "y"), None, (0, 0), "0"),
+    ("mathml", ("x", "y"), None, (1, -1), "<mrow><mi>x</mi><mo>−</mo><mi>y</mi></mrow>"),
+]
+
+def check_styles():
+    """Exits if any style writes a CHECKS expression differently, called or through rows()."""
+    for style, variables, number, coefficients, expected in CHECKS:
+        terms = Terms(*variables, style=style, number=number)
+        written = [terms(*coefficients), terms.rows(*([c] for c in coefficients))[0]]
+        if written != [expected, expected]:
+            sys.exit(f"{style} {variables}{coefficients}: expected {expected!r}, got {written}")
+    print(f"All {len(CHECKS)} style checks pass")
+
+def _timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rng = np.random.default_rng(0)
+    check_styles()
+
+    print(f"{n:,} expressions per shape")
+    print(f"{'Shape':16s} {'chain/s':>12s} {'Terms/s':>12s} {'rows()/s':>12s} {'speedup':>8s} {'rows()':>7s} "
+          f"{'chain wrong':>11s}")
+    for name, ranges, chain, terms in SHAPES:
+        columns = [rng.integers(low, high + 1, size=n) for low, high in ranges]
+        lists = [column.tolist() for column in columns]
+        chained, chain_seconds = _timed(lambda: list(map(chain, *lists)))
+        written, terms_seconds = _timed(lambda: list(map(terms, *lists)))
+        batched, rows_seconds = _timed(terms.rows, *columns)
+        if batched != written:
+            sys.exit(f"{name}: rows() and per-call Terms differ")
+        wrong = sum(old != new for old, new in zip(chained, written))
+        print(f"{name:16s} {n / chain_seconds:12,.0f} {n / terms_seconds:12,.0f} {n / rows_seconds:12,.0f} "
+              f"{chain_seconds / terms_seconds:7.1f}x {chain_seconds / rows_seconds:6.1f}x {wrong / n:10.1%}")
+
+    print()
+    for style in STYLES:
+        for number, coefficients in [(None, (-1, 0, 7)), (".2f", (-1.5, 0.004, 7)), ("fraction", (-3, 4, 0, 1, 5, 2))]:
+            print(f"{style:7s} {number or 'int':9s} {Terms('x^2', 'x', '', style=style, number=number)(*coefficients)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+# File: benchmarks/webapp_latency.py
+#
+# Click latency of webapp.py, scripted through Streamlit's AppTest: for each
+# graphing topic (and one text topic) it generates problems and reports the
+# median time of "Generate Problem", of the first "Show Answer" (which draws
+# an answer graph) and of clicking "Show Answer" again, with each graph
+# backend. AppTest always reruns the whole script, so these are upper bounds
+# for the fragment reruns a browser gets.
+# Run from the repository root:  python -m benchmarks.webapp_latency [clicks]
+
+import statistics
+import sys
+import time
+
+from streamlit.testing.v1 import AppTest
+
+from problem_generator import GRAPH_TOPICS
+
+TARGET_MS = 50
+
+def click_ms(app, button):
+    start = time.perf_counter()
+    app.button[button].click().run()
+    return (time.perf_counter() - start) * 1000
+
+def main():
+    clicks = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    slow = []
+
+    print(f"{'Topic':35s} {'backend':>7s} {'generate ms':>11s} {'first answer ms':>15s} {'again ms':>8s}")
+    for backend in ("svg", "png"):
+        app = AppTest.from_file("../webapp.py", default_timeout=120) # Relative to this file
+        app.query_params["graphs"] = backend
+        app.query_params["seed"] = "1"
+        app.run()
+        for topic in GRAPH_TOPICS + ["Order of Operations"]:
+            app.selectbox[0].set_value(topic).run()
+            generate, first, again = [], [], []
+            for _ in range(clicks):
+                generate.append(click_ms(app, 0))
+                first.append(click_ms(app, 1))
+                again.append(click_ms(app, 1))
+            assert not app.exception, app.exception
+            first, again = statistics.median(first), statistics.median(again)
+            print(f"{topic:35s} {backend:>7s} {statistics.median(generate):11.1f} {first:15.1f} {again:8.1f}")
+            if max(first, again) > TARGET_MS:
+                slow.append(f"{topic} ({backend})")
+
+    print(f"Show Answer over {TARGET_MS} ms: {', '.join(slow) or 'none'}")
+
+if __name__ == "__main__":
+    main()
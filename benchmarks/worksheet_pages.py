@@ -0,0 +1,77 @@
+# File: benchmarks/worksheet_pages.py
+#
+# Pages per second of worksheet.py's compositor against the way a page was
+# made before it: render every graph as its own PNG figure (plot_spec.render),
+# then decode, scale and paste the twelve images into a page and encode it.
+# Both make pages of worksheet.PER_PAGE graphs of the same mixed graph
+# problems, at the same page size and DPI. The specs are built beforehand, so
+# only drawing and stitching are timed. One page of each is written to the
+# temporary directory to compare by eye.
+# Run from the repository root:  python -m benchmarks.worksheet_pages [pages]
+
+import io
+import os
+import sys
+import tempfile
+import time
+
+from PIL import Image
+
+import worksheet
+from plot_spec import render
+from problem_generator import GRAPH_TOPICS
+from problems import Problem
+from seeding import make_rng
+
+def stitch_page(specs, columns=worksheet.COLUMNS):
+    """One PNG page from individually rendered figures, laid out on the compositor's grid."""
+    width, height = (round(side * worksheet.DPI) for side in worksheet.PAGE_SIZE)
+    page = Image.new("RGB", (width, height), "white")
+    rows = -(-len(specs) // columns)
+    cell_width, cell_height = width // columns, height // rows
+    for i, spec in enumerate(specs):
+        graph = Image.open(io.BytesIO(render(spec, "png"))).convert("RGB")
+        graph.thumbnail((cell_width, cell_height), Image.LANCZOS)
+        row, column = divmod(i, columns)
+        page.paste(graph, (column * cell_width + (cell_width - graph.width) // 2,
+                           row * cell_height + (cell_height - graph.height) // 2))
+    buffer = io.BytesIO()
+    page.save(buffer, format="png", dpi=(worksheet.DPI, worksheet.DPI))
+    return buffer.getvalue()
+
+def composed_page(specs):
+    return worksheet.render_page(specs)
+
+def rate(make_page, pages):
+    """Pages per second and the first page."""
+    start = time.perf_counter()
+    first = [make_page(specs) for specs in pages][0]
+    return len(pages) / (time.perf_counter() - start), first
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    rng = make_rng(0, "worksheet benchmark")
+    per_page = worksheet.PER_PAGE
+    records = [Problem.generate(GRAPH_TOPICS[i % len(GRAPH_TOPICS)], rng) for i in range(n * per_page)]
+    specs = [worksheet.graph_spec(record) for record in records]
+    pages = [specs[start:start + per_page] for start in range(0, len(specs), per_page)]
+
+    # Warm up both: imports, fonts, the plane and layout rasters
+    stitch_page(pages[0][:2])
+    composed_page(pages[0])
+
+    stitched_rate, stitched = rate(stitch_page, pages)
+    composed_rate, composed = rate(composed_page, pages)
+    print(f"{n} pages of {per_page} graphs, {worksheet.PAGE_SIZE[0]}x{worksheet.PAGE_SIZE[1]} in at {worksheet.DPI} dpi")
+    print(f"{'Individual figures, stitched':30s} {stitched_rate:7.2f} pages/s {1000 / stitched_rate:8.1f} ms/page")
+    print(f"{'Compositor':30s} {composed_rate:7.2f} pages/s {1000 / composed_rate:8.1f} ms/page")
+    print(f"Speedup {composed_rate / stitched_rate:.1f}x")
+
+    for name, png in (("worksheet_stitched.png", stitched), ("worksheet_composed.png", composed)):
+        path = os.path.join(tempfile.gettempdir(), name)
+        with open(path, "wb") as f:
+            f.write(png)
+        print(f"Wrote {path}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+# File: coordinate_plane.py
+#
+# Shared coordinate-plane renderer for the graphing generators.
+# The static part of every graph (axes, grid, 21 + 21 tick labels, axis lines,
+# title) is rendered once per style/size/DPI and cached as an RGBA raster.
+# Each new problem gets a figure that shows the cached raster underneath a
+# transparent axes at the exact same position. _blit() copies the cached
+# raster straight into an Agg buffer and draws only that transparent axes,
+# so rendering a problem costs just its own lines, shading and markers;
+# raster.py encodes the pixels.
+#
+# Figures are built with the object-oriented API and never registered with
+# pyplot, so nothing global keeps them alive; figure_manager bounds how many
+# of them may be live at once. Each render has its own figure, and each
+# thread blits into its own Agg buffer, kept for the next render of the same
+# size, so renders on different threads share nothing but the background
+# cache, whose entries are never changed once made; a lock makes sure each
+# one is drawn once even when many threads ask for it at the same time.
+
+import threading
+
+import matplotlib
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg, RendererAgg
+from matplotlib.figure import Figure
+
+import figure_manager
+
+FIGSIZE = (6, 6)
+DPI = 200 # Same resolution st.pyplot renders at
+LIMITS = (-10, 10)
+
+# Cache of rendered backgrounds: key -> (rgba array, axes position, crop box in inches)
+_BACKGROUNDS = {}
+_lock = threading.Lock() # Held while a missing background is drawn
+_local = threading.local() # Each thread's Agg buffer for _blit
+
+def _render_background(title, tick_step, xlabel, ylabel, grid_linewidth, figsize, dpi):
+    """Draws the static coordinate plane once and captures it as a raster."""
+    fig = Figure(figsize=figsize, dpi=dpi)
+    canvas = FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+
+    # --- Format the Coordinate Plane ---
+    ax.axhline(0, color='black', linewidth=0.7)
+    ax.axvline(0, color='black', linewidth=0.7)
+    ax.set_xlim(*LIMITS)
+    ax.set_ylim(*LIMITS)
+    ax.set_xticks(np.arange(LIMITS[0], LIMITS[1] + 1, tick_step))
+    ax.set_yticks(np.arange(LIMITS[0], LIMITS[1] + 1, tick_step))
+    if grid_linewidth is None:
+        ax.grid(True, linestyle='--')
+    else:
+        ax.grid(True, which='both', linestyle='--', linewidth=grid_linewidth)
+    ax.set_title(title)
+    if xlabel:
+        ax.set_xlabel(xlabel)
+    if ylabel:
+        ax.set_ylabel(ylabel)
+
+    canvas.draw()
+    background = np.asarray(canvas.buffer_rgba()).copy()
+    position = ax.get_position()
+
+    # Crop box equivalent to savefig(bbox_inches="tight")
+    crop = fig.get_tightbbox(canvas.get_renderer())
+    crop = crop.padded(matplotlib.rcParams['savefig.pad_inches'])
+
+    return background, position, crop
+
+def _background(key):
+    """Returns the cached background for a plane style, drawing it the first time it is asked for."""
+    cached = _BACKGROUNDS.get(key)
+    if cached is None:
+        with _lock:
+            if key not in _BACKGROUNDS:
+                _BACKGROUNDS[key] = _render_background(*key)
+            cached = _BACKGROUNDS[key]
+    return cached
+
+def _key(title="Correct Graph", tick_step=1, xlabel=None, ylabel=None,
+         grid_linewidth=None, figsize=FIGSIZE, dpi=DPI):
+    """The background cache key of a plane style; takes new_plane's arguments."""
+    return (title, tick_step, xlabel, ylabel, grid_linewidth, tuple(figsize), dpi)
+
+def dpi_for_width(width, **plane):
+    """The DPI at which a plane style (new_plane's arguments) comes out about width pixels wide, cropped."""
+    crop = _background(_key(**dict(plane, dpi=DPI)))[2] # In inches, which hardly depend on the DPI
+    return max(round(width / crop.width), 1)
+
+def new_plane(title="Correct Graph", tick_step=1, xlabel=None, ylabel=None,
+              grid_linewidth=None, figsize=FIGSIZE, dpi=DPI):
+    """Returns (fig, ax) for a new problem drawn over the cached coordinate plane."""
+    key = _key(title, tick_step, xlabel, ylabel, grid_linewidth, figsize, dpi)
+    background, position, crop = _background(key)
+
+    fig = Figure(figsize=figsize, dpi=dpi)
+    FigureCanvasAgg(fig)
+
+    # The cached raster fills the whole figure, one image pixel per output pixel
+    bg_ax = fig.add_axes([0, 0, 1, 1], zorder=-1)
+    bg_ax.imshow(background, aspect='auto', interpolation='none')
+    bg_ax.set_axis_off()
+
+    # Transparent axes exactly on top of the cached one for the per-problem artists
+    ax = fig.add_axes(position)
+    ax.set_xlim(*LIMITS)
+    ax.set_ylim(*LIMITS)
+    ax.set_axis_off()
+
+    # The background axes keeps fig.savefig()/st.pyplot() correct;
+    # _blit() skips it and copies the raster instead
+    fig.coordinate_plane = (key, ax)
+    figure_manager.track(fig)
+    return fig, ax
+
+def _renderer(width, height, dpi):
+    """This thread's Agg buffer, made again only when the size changes."""
+    renderer = getattr(_local, 'renderer', None)
+    if renderer is None or (renderer.width, renderer.height, renderer.dpi) != (width, height, dpi):
+        renderer = _local.renderer = RendererAgg(width, height, dpi)
+    return renderer
+
+def _blit(fig):
+    """Returns the cropped RGBA pixels of a plane figure without redrawing the plane.
+
+    The pixels are a view of this thread's Agg buffer: use them before the next _blit on the thread.
+    """
+    key, ax = fig.coordinate_plane
+    background, position, crop = _BACKGROUNDS[key]
+    height, width = background.shape[:2]
+
+    renderer = _renderer(width, height, fig.dpi)
+    pixels = np.asarray(renderer.buffer_rgba())
+    pixels[:] = background
+    ax.draw(renderer)
+
+    # Crop box is in inches from the bottom-left; pixel rows count from the top
+    dpi = fig.dpi
+    x0, x1 = max(int(round(crop.x0 * dpi)), 0), min(int(round(crop.x1 * dpi)), width)
+    y0, y1 = max(int(round(height - crop.y1 * dpi)), 0), min(int(round(height - crop.y0 * dpi)), height)
+    return pixels[y0:y1, x0:x1]
@@ -0,0 +1,305 @@
+# File: coordinator.py
+#
+# Term-long problem banks, generated in parallel. A job is a master seed and
+# a count per topic; problem i of a topic is drawn from problem_rng(seed, i),
+# so it is the same problem server.py's /problem?seed= serves. The job
+# is cut into shards of SHARD_SIZE consecutive problems of one topic. The
+# cut depends only on the job, never on how many workers there are, and a
+# shard's output depends only on the seed and its problems, so the merged
+# bank is byte-identical whatever runs it.
+#
+# Shards go to any concurrent.futures executor: a process pool on this
+# machine (the default), or a HostPool that sends them to worker hosts
+# started with "python coordinator.py serve". Finished shards are written
+# out in shard order as soon as every earlier one has arrived, as JSON
+# Lines, one problem a line:
+#
+#   {"topic": ..., "number": i, "id": "<topic id>-<index>", "problem": ..., "answer": ...}
+#
+# The id is the one grading.py grades against; graphs are "[graph]" and can
+# be rendered from it. Each shard reports how long it took and where it ran,
+# and the report flags stragglers: shards that took more than
+# STRAGGLER_FACTOR times as long per problem as the median shard of the same
+# topic (topics differ a lot in cost, so only like is compared with like).
+#
+# Run:
+#   python coordinator.py run --seed 7 --count 5000 -o bank.jsonl [--workers N] [--hosts a:9123,b:9123]
+#   python coordinator.py serve [--host 0.0.0.0] [--port 9123] [--workers N]     (on each worker host)
+# Hosts share the key in PROBLEM_GENERATOR_AUTHKEY (or --authkey).
+
+import argparse
+import json
+import multiprocessing
+import os
+import signal
+import socket
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, as_completed
+from multiprocessing.connection import Client, Listener
+
+from problems import TOPIC_IDS, TOPIC_NAMES, Problem
+from seeding import problem_rng
+
+SHARD_SIZE = 1000 # Problems per shard
+STRAGGLER_FACTOR = 2.0
+PORT = 9123
+AUTHKEY_VARIABLE = "PROBLEM_GENERATOR_AUTHKEY"
+
+# --- Shards ---
+
+def plan(counts, shard_size=SHARD_SIZE):
+    """Cuts a job ({topic: count}) into shards (shard number, topic, start, stop), in output order."""
+    shards = []
+    for topic, count in counts.items():
+        if topic not in TOPIC_IDS:
+            raise KeyError(topic)
+        for start in range(0, count, shard_size):
+            shards.append((len(shards), topic, start, min(start + shard_size, count)))
+    return shards
+
+def run_shard(seed, topic, start, stop):
+    """Worker task: problems start..stop-1 of a topic as JSON Lines; returns (bytes, seconds, worker)."""
+    began = time.perf_counter()
+    lines = []
+    for number in range(start, stop):
+        record = Problem.generate(topic, problem_rng(seed, number))
+        problem, answer = record.text()
+        lines.append(json.dumps({"topic": topic, "number": number, "id": f"{record.topic_id}-{record.index}",
+                                 "problem": problem, "answer": answer}, ensure_ascii=False))
+    payload = "".join(line + "\n" for line in lines).encode()
+    return payload, time.perf_counter() - began, f"{socket.gethostname()}:{os.getpid()}"
+
+# --- Worker hosts ---
+
+class HostPool(Executor):
+    """An executor that runs tasks on worker hosts ("python coordinator.py serve"), one connection per slot."""
+
+    def __init__(self, addresses, authkey, slots=1):
+        self.addresses = addresses
+        self.authkey = authkey
+        self.tasks = [] # (future, function, args), taken by the slot threads
+        self.ready = threading.Condition()
+        self.closed = False
+        self.threads = [threading.Thread(target=self._slot, args=(address,), daemon=True)
+                        for address in addresses for _ in range(slots)]
+        for thread in self.threads:
+            thread.start()
+
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+        with self.ready:
+            if self.closed:
+                raise RuntimeError("cannot submit after shutdown")
+            self.tasks.append((future, fn, args))
+            self.ready.notify()
+        return future
+
+    def shutdown(self, wait=True, *, cancel_futures=False):
+        with self.ready:
+            self.closed = True
+            if cancel_futures:
+                for future, fn, args in self.tasks:
+                    future.cancel()
+                self.tasks.clear()
+            self.ready.notify_all()
+        if wait:
+            for thread in self.threads:
+                thread.join()
+
+    def _next_task(self):
+        with self.ready:
+            while not self.tasks and not self.closed:
+                self.ready.wait()
+            return self.tasks.pop(0) if self.tasks else None
+
+    def _slot(self, address):
+        """Sends tasks to one host connection, one at a time, until shutdown.
+
+        A host that can't be reached or drops the connection fails the task
+        it was given, which fails the job rather than leaving it waiting.
+        """
+        try:
+            connection = Client(address, authkey=self.authkey)
+        except OSError as error:
+            connection, failure = None, error
+        while (task := self._next_task()) is not None:
+            future, fn, args = task
+            if not future.set_running_or_notify_cancel():
+                continue
+            if connection is None:
+                future.set_exception(ConnectionError(f"worker host {address[0]}:{address[1]}: {failure}"))
+                return
+            try:
+                connection.send((fn, args))
+                ok, value = connection.recv()
+            except (OSError, EOFError) as error:
+                connection.close()
+                future.set_exception(ConnectionError(f"worker host {address[0]}:{address[1]}: {error}"))
+                return
+            if ok:
+                future.set_result(value)
+            else:
+                future.set_exception(value)
+        if connection is not None:
+            connection.close()
+
+def serve(host, port, authkey, workers=None):
+    """Runs a worker host: every connection's tasks run in this machine's process pool."""
+    pool = _local_pool(workers)
+
+    def handle(connection):
+        with connection:
+            while True:
+                try:
+                    fn, args = connection.recv()
+                except EOFError:
+                    return
+                try:
+                    connection.send((True, pool.submit(fn, *args).result()))
+                except Exception as error: # Sent back to the coordinator, which raises it
+                    connection.send((False, error))
+
+    # Stop on SIGTERM like on Ctrl-C, so the pool's processes are shut down too
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    try:
+        with Listener((host, port), authkey=authkey) as listener:
+            print(f"Worker host on {host}:{port}", flush=True)
+            while True:
+                threading.Thread(target=handle, args=(listener.accept(),), daemon=True).start()
+    finally:
+        pool.shutdown(cancel_futures=True)
+
+# --- The Coordinator ---
+
+def _local_pool(workers):
+    return ProcessPoolExecutor(workers or os.cpu_count(), mp_context=multiprocessing.get_context("spawn"))
+
+class JobReport:
+    """How long each shard took and where it ran."""
+
+    def __init__(self):
+        self.shards = [] # (shard, seconds, worker)
+        self.started = time.perf_counter()
+        self.seconds = None
+
+    def add(self, shard, seconds, worker):
+        self.shards.append((shard, seconds, worker))
+
+    def finish(self):
+        self.seconds = time.perf_counter() - self.started
+
+    @property
+    def problems(self):
+        return sum(stop - start for (number, topic, start, stop), seconds, worker in self.shards)
+
+    def stragglers(self, factor=STRAGGLER_FACTOR):
+        """Shards that took more than factor times as long per problem as the median shard of their topic."""
+        per_problem = {} # topic -> seconds per problem of each of its shards
+        for (number, topic, start, stop), seconds, worker in self.shards:
+            per_problem.setdefault(topic, []).append(seconds / (stop - start))
+        medians = {topic: statistics.median(times) for topic, times in per_problem.items()}
+        slow = [item for item in self.shards
+                if item[1] / (item[0][3] - item[0][2]) > factor * medians[item[0][1]]]
+        return sorted(slow, key=lambda item: -item[1])
+
+    def workers(self):
+        """Per worker: shards, problems and problems per second of shard time."""
+        rows = {}
+        for (number, topic, start, stop), seconds, worker in self.shards:
+            row = rows.setdefault(worker, {"worker": worker, "shards": 0, "problems": 0, "seconds": 0.0})
+            row["shards"] += 1
+            row["problems"] += stop - start
+            row["seconds"] += seconds
+        for row in rows.values():
+            row["rate"] = row["problems"] / row["seconds"] if row["seconds"] else 0.0
+        return sorted(rows.values(), key=lambda row: row["worker"])
+
+    def text(self):
+        rates = [(stop - start) / seconds for (number, topic, start, stop), seconds, worker in self.shards if seconds]
+        lines = [f"{self.problems:,} problems in {len(self.shards)} shards, {self.seconds:.2f} s, "
+                 f"{self.problems / self.seconds:,.0f} problems/s",
+                 f"Shard throughput: median {statistics.median(rates):,.0f}/s, "
+                 f"slowest {min(rates):,.0f}/s, fastest {max(rates):,.0f}/s" if rates else "No shards",
+                 f"{'Worker':30s} {'shards':>6s} {'problems':>9s} {'problems/s':>10s}"]
+        for row in self.workers():
+            lines.append(f"{row['worker']:30s} {row['shards']:6d} {row['problems']:9,d} {row['rate']:10,.0f}")
+        stragglers = self.stragglers()
+        lines.append(f"Stragglers (over {STRAGGLER_FACTOR:g}x their topic's median time per problem): {len(stragglers)}")
+        for (number, topic, start, stop), seconds, worker in stragglers:
+            lines.append(f"  shard {number} ({topic} {start}-{stop - 1}) {seconds:.2f} s on {worker}")
+        return "\n".join(lines)
+
+def run_job(counts, seed, out, executor, shard_size=SHARD_SIZE):
+    """Generates a job's shards on executor and writes them to out (binary) in shard order; returns a JobReport."""
+    report = JobReport()
+    futures = {executor.submit(run_shard, seed, *shard[1:]): shard for shard in plan(counts, shard_size)}
+    finished = {} # Shard number -> bytes, until every earlier shard is written
+    next_shard = 0
+    for future in as_completed(futures):
+        shard = futures[future]
+        payload, seconds, worker = future.result()
+        report.add(shard, seconds, worker)
+        finished[shard[0]] = payload
+        while next_shard in finished:
+            out.write(finished.pop(next_shard))
+            next_shard += 1
+    report.finish()
+    return report
+
+def generate_bank(counts, seed, out, workers=None, hosts=None, authkey=None, shard_size=SHARD_SIZE):
+    """Runs a job on a local process pool of workers, or on worker hosts [(host, port), ...] if given."""
+    executor = HostPool(hosts, authkey, workers or 1) if hosts else _local_pool(workers)
+    try:
+        return run_job(counts, seed, out, executor, shard_size)
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+# --- Command line ---
+
+def _address(text):
+    host, _, port = text.rpartition(":")
+    return host or "127.0.0.1", int(port)
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate problem banks on many processes or hosts.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    run = commands.add_parser("run", help="generate a bank")
+    run.add_argument("--seed", type=int, required=True)
+    run.add_argument("--count", type=int, required=True, help="problems per topic")
+    run.add_argument("--topics", nargs="+", default=TOPIC_NAMES, metavar="TOPIC", help="default: every topic")
+    run.add_argument("-o", "--output", required=True, help="JSON Lines file; - for stdout")
+    run.add_argument("--workers", type=int, help="processes (default: CPUs), or connections per host")
+    run.add_argument("--hosts", help="worker hosts as host:port,host:port (default: this machine)")
+    run.add_argument("--shard-size", type=int, default=SHARD_SIZE)
+    run.add_argument("--authkey", default=os.environ.get(AUTHKEY_VARIABLE))
+    worker = commands.add_parser("serve", help="run a worker host")
+    worker.add_argument("--host", default="127.0.0.1")
+    worker.add_argument("--port", type=int, default=PORT)
+    worker.add_argument("--workers", type=int, help="processes (default: CPUs)")
+    worker.add_argument("--authkey", default=os.environ.get(AUTHKEY_VARIABLE))
+    args = parser.parse_args()
+
+    if (args.command == "serve" or args.hosts) and not args.authkey:
+        parser.error(f"worker hosts need a shared key: set {AUTHKEY_VARIABLE} or pass --authkey")
+    authkey = args.authkey.encode() if args.authkey else None
+    if args.command == "serve":
+        try:
+            serve(args.host, args.port, authkey, args.workers)
+        except KeyboardInterrupt:
+            pass
+        return
+
+    counts = {topic: args.count for topic in args.topics}
+    hosts = [_address(host) for host in args.hosts.split(",")] if args.hosts else None
+    if args.output == "-":
+        report = generate_bank(counts, args.seed, sys.stdout.buffer, args.workers, hosts, authkey, args.shard_size)
+    else:
+        with open(args.output, "wb") as out:
+            report = generate_bank(counts, args.seed, out, args.workers, hosts, authkey, args.shard_size)
+    print(report.text(), file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,266 @@
+# File: do_now.py
+#
+# Do Now sets: a handful of problems of mixed topics, e.g. 3 equations,
+# 1 factoring and 1 graph. A mix is a list of (choices, count): choices is
+# a category of CATEGORIES, a single topic, or {topic: weight}, and each of
+# its count problems gets a topic drawn by weight with an alias table, in
+# O(1) whatever the number of topics.
+#
+# A set is ready when every part of every problem is, graphs rendered. The
+# composer keeps a running cost per topic (seconds to build and render one
+# problem, starting from DEFAULT_COSTS and updated with every measured one).
+# Problems that cost more than INLINE_LIMIT, in practice matplotlib graphs,
+# go to a pool of worker processes, most expensive first, and the cheap
+# ones are built here while the pool works. With a worker per graph, a set
+# is ready in about the time of its slowest graph.
+#
+#   composer = Composer(backend="png")
+#   do_now = composer.compose(parse_mix("Equations=3, Factoring=1, Graphs=1"))
+#
+# Run:  python do_now.py [--mix "Equations=3, Factoring=1, Graphs=1"] [--seed N] [--graphs svg|png|webp] [--output DIR]
+
+import argparse
+import atexit
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from problem_generator import GRAPH_TOPICS
+from problems import TOPIC_IDS, TOPIC_NAMES, Problem
+from seeding import as_random, make_rng
+
+CATEGORIES = {
+    "Equations": ["Two-Step Linear Equations", "Multi-Step Equations (Fractions)", "Literal Equations",
+                  "One-Variable Word Problems", "Systems of Equations"],
+    "Expressions": ["Order of Operations", "Simplify Expressions", "Polynomial Operations", "Exponent Rules",
+                    "Radical Operations"],
+    "Factoring": ["Factor Simple Quadratics", "Factoring Binomials", "Factoring Quadratics (A>1)"],
+    "Inequalities": ["Multi-Step Inequalities", "Compound Inequalities"],
+    "Lines and Functions": ["Slope Between Two Points", "Evaluating Functions", "Equation from Two Points",
+                            "Parallel & Perpendicular Lines"],
+    "Graphs": GRAPH_TOPICS,
+}
+DEFAULT_MIX = [("Equations", 3), ("Factoring", 1), ("Graphs", 1)]
+
+# Seconds to build and render a problem until it has been measured: text
+# takes microseconds, an SVG graph well under a millisecond and a PNG or
+# WebP graph about a twentieth of a second (see benchmarks/raster_output.py)
+DEFAULT_COSTS = {"text": 0.0001, "svg": 0.0005, "png": 0.05, "webp": 0.06}
+INLINE_LIMIT = 0.005 # Seconds; problems expected to take longer go to the pool
+COST_SMOOTHING = 0.2 # Weight of a new measurement in the running cost
+
+# --- Weighted Topics ---
+
+class AliasTable:
+    """Weighted choice among items in O(1) per draw, with Vose's alias method."""
+
+    __slots__ = ('items', 'probability', 'alias')
+
+    def __init__(self, weights):
+        """weights: {item: weight}; weights must not be negative and at least one must be positive."""
+        self.items = list(weights)
+        total = sum(weights.values())
+        if not self.items or total <= 0 or min(weights.values()) < 0:
+            raise ValueError(f"Weights must be non-negative with a positive total: {weights!r}")
+        n = len(self.items)
+        scaled = [weights[item] * n / total for item in self.items]
+        self.probability = [1.0] * n # Leftovers keep 1.0, which only rounding keeps from being exact
+        self.alias = list(range(n))
+        small = [i for i, p in enumerate(scaled) if p < 1]
+        large = [i for i, p in enumerate(scaled) if p >= 1]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            self.probability[less] = scaled[less]
+            self.alias[less] = more
+            scaled[more] -= 1 - scaled[less]
+            (small if scaled[more] < 1 else large).append(more)
+
+    def sample(self, rng):
+        """Draws one item: a uniform column, then the item or its alias."""
+        column = rng.randrange(len(self.items))
+        return self.items[column if rng.random() < self.probability[column] else self.alias[column]]
+
+_tables = {} # Choices -> AliasTable
+
+def _table(choices):
+    """The alias table for a category, a topic, or {topic: weight}."""
+    key = choices if isinstance(choices, str) else tuple(choices.items())
+    table = _tables.get(key)
+    if table is None:
+        if isinstance(choices, str):
+            if choices not in CATEGORIES and choices not in TOPIC_IDS:
+                raise KeyError(choices)
+            weights = {topic: 1 for topic in CATEGORIES.get(choices, [choices])}
+        else:
+            unknown = [topic for topic in choices if topic not in TOPIC_IDS]
+            if unknown:
+                raise KeyError(unknown[0])
+            weights = choices
+        table = _tables[key] = AliasTable(weights)
+    return table
+
+def parse_mix(text):
+    """Reads "Equations=3, Graphing Linear Equations=1" into [(choices, count)]."""
+    mix = []
+    for entry in text.split(","):
+        if entry.strip():
+            name, _, count = entry.rpartition("=")
+            name = name.strip()
+            if name not in CATEGORIES and name not in TOPIC_IDS:
+                raise ValueError(f"Not a category or topic: {name!r}")
+            mix.append((name, int(count)))
+    return mix
+
+def draw_topics(mix, rng=None):
+    """The topic of every problem of a mix, in order."""
+    rng = as_random(rng)
+    return [_table(choices).sample(rng) for choices, count in mix for _ in range(count)]
+
+# --- Costs ---
+
+class CostTable:
+    """Running seconds to build and render one problem of each topic with a graph backend."""
+
+    def __init__(self, backend):
+        self.seconds = {topic: DEFAULT_COSTS[backend if topic in GRAPH_TOPICS else "text"] for topic in TOPIC_NAMES}
+        self.measured = dict.fromkeys(TOPIC_NAMES, 0)
+        self.warm = set() # Topics made in this process at least once
+        self.lock = threading.Lock()
+
+    def estimate(self, topic):
+        return self.seconds[topic]
+
+    def record(self, topic, seconds, warm=True):
+        """Counts a measurement; warm=False for one made here, where the first of a topic pays for imports."""
+        with self.lock:
+            if not warm and topic not in self.warm:
+                self.warm.add(topic)
+                return
+            self.measured[topic] += 1
+            weight = 1 if self.measured[topic] == 1 else COST_SMOOTHING # The first one replaces the default
+            self.seconds[topic] += weight * (seconds - self.seconds[topic])
+
+    def rows(self):
+        """One dict per topic: estimated milliseconds, how many were measured, and where it is made."""
+        with self.lock:
+            return [{"topic": topic, "ms": round(self.seconds[topic] * 1000, 3), "measured": self.measured[topic],
+                     "made": "pool" if self.seconds[topic] > INLINE_LIMIT else "inline"} for topic in TOPIC_NAMES]
+
+# --- Composing ---
+
+def _produce(topic_id, index, backend):
+    """Builds a problem with every graph rendered; returns ((problem, answer), seconds). Runs anywhere."""
+    began = time.perf_counter()
+    parts = Problem(topic_id, index).render(backend)
+    return parts, time.perf_counter() - began
+
+def _warm_worker(backend):
+    """Imports the plotting stack and draws the coordinate planes once in each pool process."""
+    for topic in GRAPH_TOPICS:
+        _produce(TOPIC_IDS[topic], 0, backend)
+
+class DoNowSet:
+    """A composed set: problem records, their ready parts, and where each was made."""
+
+    __slots__ = ('records', 'parts', 'made', 'seconds')
+
+    def __init__(self, records, parts, made, seconds):
+        self.records = records # Problem records, in order
+        self.parts = parts # (problem, answer) per record; graphs are PNG bytes or SVG text
+        self.made = made # "inline" or "pool" per record
+        self.seconds = seconds # From the call to the set being ready
+
+    def __len__(self):
+        return len(self.records)
+
+class Composer:
+    """Composes Do Now sets, rendering the expensive problems on a pool of worker processes."""
+
+    def __init__(self, backend="svg", workers=None, processes=True):
+        self.backend = backend
+        self.costs = CostTable(backend)
+        self.workers = workers = workers or os.cpu_count()
+        if processes:
+            self.pool = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"),
+                                            initializer=_warm_worker, initargs=(backend,))
+            if DEFAULT_COSTS[backend] > INLINE_LIMIT:
+                for _ in range(workers):
+                    self.pool.submit(int) # Start (and warm) every worker now rather than for the first set
+        else:
+            self.pool = ThreadPoolExecutor(workers, thread_name_prefix="do-now")
+        atexit.register(self.close)
+
+    def close(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+    def compose(self, mix=DEFAULT_MIX, rng=None):
+        """Draws a set for a mix and returns it as a DoNowSet once every part is ready."""
+        began = time.perf_counter()
+        records = [Problem.generate(topic, rng) for topic in draw_topics(mix, rng)]
+        estimates = [self.costs.estimate(record.topic) for record in records]
+
+        # The pool gets the expensive problems first, longest first, so it starts before the inline work
+        pooled = sorted((i for i, cost in enumerate(estimates) if cost > INLINE_LIMIT), key=lambda i: -estimates[i])
+        futures = {i: self.pool.submit(_produce, records[i].topic_id, records[i].index, self.backend)
+                   for i in pooled}
+        parts = [None] * len(records)
+        for i, record in enumerate(records):
+            if i not in futures:
+                parts[i], seconds = _produce(record.topic_id, record.index, self.backend)
+                self.costs.record(record.topic, seconds, warm=False)
+        for i, future in futures.items():
+            parts[i], seconds = future.result()
+            self.costs.record(records[i].topic, seconds)
+
+        made = ["pool" if i in futures else "inline" for i in range(len(records))]
+        return DoNowSet(records, parts, made, time.perf_counter() - began)
+
+    def measure(self, samples=3, rng=None):
+        """Measures every topic's cost on samples problems, made here one at a time."""
+        rng = as_random(rng)
+        for topic in TOPIC_NAMES:
+            for _ in range(samples):
+                record = Problem.generate(topic, rng)
+                self.costs.record(topic, _produce(record.topic_id, record.index, self.backend)[1], warm=False)
+
+# --- Command line ---
+
+def main():
+    parser = argparse.ArgumentParser(description="Compose a Do Now set of mixed topics.")
+    parser.add_argument("--mix", default=", ".join(f"{name}={count}" for name, count in DEFAULT_MIX),
+                        help=f"category or topic=count, comma separated; categories: {', '.join(CATEGORIES)}")
+    parser.add_argument("--seed", type=int, help="reproduce a set")
+    parser.add_argument("--graphs", choices=("svg", "png", "webp"), default="png")
+    parser.add_argument("--output", help="directory to write the graphs to")
+    parser.add_argument("--workers", type=int, help="render processes (default: CPUs)")
+    args = parser.parse_args()
+
+    composer = Composer(args.graphs, args.workers)
+    do_now = composer.compose(parse_mix(args.mix), make_rng(args.seed))
+    if args.output:
+        os.makedirs(args.output, exist_ok=True)
+
+    answers = []
+    for number, (record, parts) in enumerate(zip(do_now.records, do_now.parts), 1):
+        shown = []
+        for part, name, is_graph in zip(parts, ("problem", "answer"), (record.problem_is_graph, record.answer_is_graph)):
+            if not is_graph:
+                shown.append(part)
+            elif args.output:
+                path = os.path.join(args.output, f"{number}_{name}.{args.graphs}")
+                with open(path, "w" if isinstance(part, str) else "wb") as f:
+                    f.write(part)
+                shown.append(f"[graph: {path}]")
+            else:
+                shown.append("[graph]")
+        print(f"{number}. ({record.topic}) {shown[0]}\n")
+        answers.append(f"{number}. {shown[1]}")
+    print("Answers:\n" + "\n".join(answers))
+    pooled = do_now.made.count("pool")
+    print(f"\nReady in {do_now.seconds * 1000:.0f} ms: {len(do_now) - pooled} made inline, {pooled} on the pool")
+    composer.close()
+
+if __name__ == "__main__":
+    main()
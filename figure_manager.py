@@ -0,0 +1,60 @@
+# File: figure_manager.py
+#
+# Lifecycle management for the figures made by the graphing generators.
+# Figures are created outside pyplot's global registry (see coordinate_plane),
+# and every one of them is tracked here against a fixed budget. When the
+# budget is exceeded the oldest figure is released: its artists are cleared
+# so the memory it held is returned even if someone still references it.
+# The generators return plot specs (see plot_spec.py), so figures only
+# exist while one is rendered; render_result() turns a problem's specs into
+# PNG bytes.
+
+import threading
+from collections import OrderedDict
+
+MAX_LIVE_FIGURES = 32
+
+_live = OrderedDict() # id(fig) -> fig, oldest first
+_lock = threading.Lock()
+
+def _free(fig):
+    """Drops everything a figure holds so it can no longer pin memory."""
+    fig.clear()
+    vars(fig).pop('coordinate_plane', None)
+
+def track(fig):
+    """Registers a new figure, releasing the oldest ones beyond the budget."""
+    with _lock:
+        _live[id(fig)] = fig
+        evicted = []
+        while len(_live) > MAX_LIVE_FIGURES:
+            evicted.append(_live.popitem(last=False)[1])
+    for old_fig in evicted:
+        _free(old_fig)
+
+def release(fig):
+    """Stops tracking a figure the caller is done with.
+
+    The figure is not registered anywhere else, so dropping the last
+    reference to it is enough for it to be collected.
+    """
+    with _lock:
+        _live.pop(id(fig), None)
+
+def release_all():
+    """Releases every tracked figure."""
+    with _lock:
+        figures = list(_live.values())
+        _live.clear()
+    for fig in figures:
+        _free(fig)
+
+def live_count():
+    """Returns how many tracked figures are currently alive."""
+    with _lock:
+        return len(_live)
+
+def render_result(result):
+    """Turns a (problem, answer) pair into one where every graph (plot spec) is PNG bytes."""
+    import plot_spec
+    return tuple(item if isinstance(item, str) else plot_spec.render(item) for item in result)
@@ -0,0 +1,617 @@
+# File: grading.py
+#
+# Grades typed student answers against the problems they were given.
+# A response is parsed in the notations the generators write answers in,
+# and both it and the expected answer are normalized to one canonical value
+# per kind of answer, so equivalent forms compare equal: "x = 4" and "4",
+# (x + 2)(x - 3) and (x - 3)(x + 2), 6/8 and 3/4, "x > 2" and "(2, ∞)",
+# 2^7 and 128. A wrong answer is compared with the expected one to name its
+# error pattern: a sign error, an endpoint that should be closed, the right
+# slope with the wrong intercept, a radical that isn't simplified, ...
+#
+# Batches are CSV or JSONL files, read and graded one row at a time, so
+# their size doesn't matter. A row names its problem by id, "<topic id>-
+# <index>" as server.py gives it, or by topic and expected answer text:
+#   student,problem,response            student,topic,answer,response
+# Graded rows get two more fields: correct (1, 0, or empty when the
+# answer is a graph) and error (the pattern, empty when correct).
+#
+# Students answering the same Do Now type the same few answers, so parsed
+# answers are memoized: grading a repeated answer is two dict lookups.
+#
+# Run:  python grading.py responses.csv [-o graded.csv]
+
+import argparse
+import csv
+import json
+import re
+import sys
+from collections import Counter
+from fractions import Fraction
+from functools import lru_cache
+
+import parameter_spaces
+from problems import TOPIC_IDS, TOPIC_NAMES, Problem
+
+CACHE_SIZE = 1 << 16 # Parsed answers kept, across all kinds
+MAX_EXPONENT = 64 # Larger powers in a response are not evaluated
+
+# How each topic's answers are parsed; topics missing here have graph answers
+ANSWER_KINDS = {
+    "Order of Operations": "number",
+    "Two-Step Linear Equations": "number",
+    "Multi-Step Equations (Fractions)": "number",
+    "Literal Equations": "formula",
+    "One-Variable Word Problems": "number",
+    "Simplify Expressions": "polynomial",
+    "Polynomial Operations": "polynomial",
+    "Factor Simple Quadratics": "factored",
+    "Factoring Binomials": "factored",
+    "Factoring Quadratics (A>1)": "factored",
+    "Slope Between Two Points": "number",
+    "Evaluating Functions": "number",
+    "Multi-Step Inequalities": "solution_set",
+    "Compound Inequalities": "solution_set",
+    "Systems of Equations": "point",
+    "Equation from Two Points": "line",
+    "Parallel & Perpendicular Lines": "line",
+    "Exponent Rules": "power",
+    "Radical Operations": "radical",
+    "Visual Domain and Range": "domain_range",
+}
+
+class Unreadable(ValueError):
+    """A response that can't be parsed as its topic's kind of answer."""
+
+# --- Cleaning ---
+
+_CHARACTERS = str.maketrans({"−": "-", "–": "-", "÷": "/", "⁄": "/", "×": "*", "·": "*", "∪": "u",
+                             "²": "^2", "³": "^3", " ": None, "\t": None})
+_SPELLINGS = (("infinity", "∞"), ("inf", "∞"), ("sqrt", "√"), ("**", "^"),
+              (">=", "≥"), ("=>", "≥"), ("<=", "≤"), ("=<", "≤"))
+
+def _clean(text, lower=True):
+    """Removes spaces and trailing periods and spells symbols one way (≥, ∞, √, ^)."""
+    text = text.translate(_CHARACTERS).rstrip(".")
+    if lower:
+        text = text.lower()
+    for spelling, symbol in _SPELLINGS:
+        if spelling in text:
+            text = text.replace(spelling, symbol)
+    return text
+
+def _strip_label(part):
+    """Removes a "Label:" prefix like "Interval:" or "Domain (Inequality):"."""
+    label, colon, rest = part.partition(":")
+    return rest if colon else part
+
+# --- Parsers ---
+# Each takes the raw text and returns a hashable canonical value, or raises.
+
+NUMBER = r"[-+]?(?:\d+(?:\.\d*)?|\.\d+)(?:/\d+)?"
+_NUMBERS = re.compile(NUMBER)
+
+def _fraction(text):
+    """A number in cleaned text: an integer, a decimal or a fraction, maybe in parentheses."""
+    if text.startswith("(") and text.endswith(")"):
+        text = text[1:-1]
+    try:
+        return Fraction(text)
+    except (ValueError, ZeroDivisionError):
+        raise Unreadable(f"Not a number: {text!r}")
+
+def _parse_number(text):
+    """"x = 4", "f(3) = 7", "The slope is 3/4." or just the number; "undefined" for a vertical slope."""
+    text = _clean(text)
+    if "undefined" in text or "novalue" in text:
+        return "undefined"
+    if "=" in text:
+        return _fraction(text.rsplit("=", 1)[1])
+    numbers = _NUMBERS.findall(text)
+    if len(numbers) != 1:
+        raise Unreadable(f"Expected one number: {text!r}")
+    return _fraction(numbers[0])
+
+_TERM = re.compile(r"(\d+(?:\.\d*)?)?(?:/(\d+))?\*?(?:([a-z])(?:\^(\d+))?)?")
+_TERMS = re.compile(r"[-+]?[^-+]+")
+_PARENTHESIZED_FRACTION = re.compile(r"\((\d+/\d+)\)")
+
+def _polynomial(text):
+    """Coefficients of a polynomial in one variable, constant first, trailing zeros trimmed."""
+    text = _PARENTHESIZED_FRACTION.sub(r"\1", text) # (3/4)x -> 3/4x
+    terms = _TERMS.findall(text)
+    if not terms or "".join(terms) != text:
+        raise Unreadable(f"Not a polynomial: {text!r}")
+    variable = None
+    coefficients = {}
+    for term in terms:
+        sign = -1 if term[0] == "-" else 1
+        body = term[1:] if term[0] in "+-" else term
+        match = _TERM.fullmatch(body)
+        if not body or match is None:
+            raise Unreadable(f"Not a term: {term!r}")
+        number, denominator, letter, power = match.groups()
+        if letter is not None:
+            if variable not in (None, letter):
+                raise Unreadable(f"More than one variable: {text!r}")
+            variable = letter
+        coefficient = Fraction(number or 1) / int(denominator or 1) * sign
+        degree = 0 if letter is None else int(power or 1)
+        if degree > MAX_EXPONENT:
+            raise Unreadable(f"Degree too high: {text!r}")
+        coefficients[degree] = coefficients.get(degree, 0) + coefficient
+    values = [coefficients.get(degree, Fraction(0)) for degree in range(max(coefficients) + 1)]
+    while len(values) > 1 and values[-1] == 0:
+        values.pop()
+    return tuple(values)
+
+def _parse_polynomial(text):
+    """"7x² - 3x + 2", in any term order, with ^ or ²."""
+    text = _clean(text)
+    return _polynomial(text.rsplit("=", 1)[1] if "=" in text else text)
+
+_FACTOR = re.compile(r"\(([^()]+)\)(?:\^(\d+))?")
+
+def _parse_factored(text):
+    """"(x - 3)(x + 2)", "2(3x + 5)", "(x - 3)^2": ("factored", constant, sorted factors).
+
+    Each factor's leading coefficient is made positive, its sign moving to the constant.
+    Text without parentheses is ("expanded", polynomial), so it can be told apart from a factoring.
+    """
+    text = _clean(text).replace("*", "")
+    if "=" in text:
+        text = text.rsplit("=", 1)[1]
+    if "(" not in text:
+        return ("expanded", _polynomial(text))
+    lead, rest = text[:text.index("(")], text[text.index("("):]
+    constant = _fraction(lead + "1" if lead in ("", "+", "-") else lead)
+    matches = list(_FACTOR.finditer(rest))
+    if "".join(match.group(0) for match in matches) != rest:
+        raise Unreadable(f"Not a product of factors: {text!r}")
+    factors = []
+    for match in matches:
+        factor = _polynomial(match.group(1))
+        repeat = int(match.group(2) or 1)
+        if repeat > MAX_EXPONENT:
+            raise Unreadable(f"Exponent too large: {text!r}")
+        if len(factor) == 1:
+            constant *= factor[0] ** repeat
+            continue
+        if factor[-1] < 0:
+            factor = tuple(-c for c in factor)
+            constant *= (-1) ** repeat
+        factors.extend([factor] * repeat)
+    return ("factored", constant, tuple(sorted(factors)))
+
+_INTERVAL = re.compile(rf"([(\[])(-?∞|{NUMBER}),(\+?∞|{NUMBER})([)\]])")
+_RELATIONS = re.compile(r"([<>≤≥=])")
+_FLIPPED = {"<": ">", ">": "<", "≤": "≥", "≥": "≤", "=": "="}
+_REAL_LINE = ((None, False, None, False),)
+
+def _interval_key(interval):
+    lower = interval[0]
+    return (lower is not None, lower or 0, not interval[1])
+
+def _inequality_interval(part):
+    """One "and"-chain like "-2<x≤4" or "x>2andx<5" as an interval (lower, closed, upper, closed)."""
+    lower, lower_closed, upper, upper_closed = None, False, None, False
+    for chain in part.split("and"):
+        tokens = _RELATIONS.split(chain)
+        if len(tokens) < 3:
+            raise Unreadable(f"Not an inequality: {chain!r}")
+        for left, relation, right in zip(tokens[0:-2:2], tokens[1:-1:2], tokens[2::2]):
+            if left.isalpha() and len(left) == 1:
+                value = _fraction(right)
+            elif right.isalpha() and len(right) == 1:
+                value, relation = _fraction(left), _FLIPPED[relation]
+            else:
+                raise Unreadable(f"Not an inequality: {chain!r}")
+            closed = relation in "≤≥="
+            if relation in ">≥=" and (lower is None or value > lower or (value == lower and not closed)):
+                lower, lower_closed = value, closed
+            if relation in "<≤=" and (upper is None or value < upper or (value == upper and not closed)):
+                upper, upper_closed = value, closed
+    return lower, lower_closed, upper, upper_closed
+
+def _solution_set(text):
+    """A cleaned solution in inequality or interval notation, as a sorted tuple of intervals."""
+    if "allreal" in text or text in ("ℝ", "(-∞,∞)"):
+        return _REAL_LINE
+    if "nosolution" in text or text in ("∅", "{}"):
+        return ()
+    if any(c.isalpha() and c not in "orandu" for c in text):
+        intervals = [_inequality_interval(part) for part in text.split("or")]
+    else:
+        intervals = []
+        for part in text.split("u"):
+            match = _INTERVAL.fullmatch(part)
+            if match is None:
+                raise Unreadable(f"Not an interval: {part!r}")
+            left, lower, upper, right = match.groups()
+            lower = None if "∞" in lower else _fraction(lower)
+            upper = None if "∞" in upper else _fraction(upper)
+            intervals.append((lower, left == "[" and lower is not None, upper, right == "]" and upper is not None))
+    return tuple(sorted(intervals, key=_interval_key))
+
+def _parse_solution_set(text):
+    """"Inequality: x > 2 | Interval: (2, ∞)", either part alone, or both; ("inconsistent",) if they differ."""
+    sets = {_solution_set(_clean(_strip_label(part))) for part in re.split(r"[|\n;]", text) if part.strip()}
+    if not sets:
+        raise Unreadable("Blank")
+    return sets.pop() if len(sets) == 1 else ("inconsistent",)
+
+def _parse_domain_range(text):
+    """Labeled "Domain ...: ..." and "Range ...: ..." parts as (domain, range); a missing one is None."""
+    found = {"domain": set(), "range": set()}
+    unlabeled = []
+    for part in re.split(r"[|\n;]", text):
+        if not part.strip():
+            continue
+        label = part.partition(":")[0].lower() if ":" in part else ""
+        value = _solution_set(_clean(_strip_label(part)))
+        if "domain" in label:
+            found["domain"].add(value)
+        elif "range" in label:
+            found["range"].add(value)
+        else:
+            unlabeled.append(value)
+    if not found["domain"] and not found["range"] and len(unlabeled) == 2:
+        found["domain"].add(unlabeled[0]) # Unlabeled: domain first, like the answers list them
+        found["range"].add(unlabeled[1])
+    result = []
+    for values in (found["domain"], found["range"]):
+        result.append(None if not values else values.pop() if len(values) == 1 else ("inconsistent",))
+    if result == [None, None]:
+        raise Unreadable(f"No domain or range: {text!r}")
+    return tuple(result)
+
+_POINT = re.compile(rf"\(?({NUMBER}),({NUMBER})\)?")
+_COORDINATE = re.compile(rf"([xy])=({NUMBER})")
+
+def _parse_point(text):
+    """"(3, -2)" or "x = 3, y = -2"."""
+    text = _clean(text)
+    coordinates = dict(_COORDINATE.findall(text))
+    if len(coordinates) == 2:
+        return _fraction(coordinates["x"]), _fraction(coordinates["y"])
+    match = _POINT.fullmatch(text)
+    if match is None:
+        raise Unreadable(f"Not a point: {text!r}")
+    return _fraction(match.group(1)), _fraction(match.group(2))
+
+def _parse_line(text):
+    """"y = 3/4x - 5/2" as ("y", slope, intercept), in any term order; "x = 4" as ("x", 4).
+
+    An expression on its own, like "3/4x - 5/2", is read as what y equals.
+    """
+    text = _clean(text).replace("f(x)", "y")
+    sides = text.split("=") if "=" in text else ["y", text]
+    if len(sides) != 2:
+        raise Unreadable(f"Not an equation: {text!r}")
+    left, right = sides
+    if right in ("x", "y") and left not in ("x", "y"):
+        left, right = right, left
+    if left == "x":
+        return ("x", _fraction(right))
+    if left != "y":
+        raise Unreadable(f"Not solved for y: {text!r}")
+    coefficients = _polynomial(right)
+    if len(coefficients) > 2:
+        raise Unreadable(f"Not a line: {text!r}")
+    return ("y", coefficients[1] if len(coefficients) == 2 else Fraction(0), coefficients[0])
+
+_POWER = r"(\d+)(?:\^\(?(-?\d+)\)?)?"
+_QUOTIENT_OF_POWERS = re.compile(rf"{_POWER}(?:/{_POWER})?")
+
+def _parse_power(text):
+    """"2^7", "1 / 3^4", "3^-4" or the value itself, as its exact value."""
+    text = _clean(text)
+    match = _QUOTIENT_OF_POWERS.fullmatch(text.rsplit("=", 1)[1] if "=" in text else text)
+    if match is None:
+        raise Unreadable(f"Not a power: {text!r}")
+    base, exponent, divisor_base, divisor_exponent = match.groups()
+    exponents = [int(exponent or 1), int(divisor_exponent or 1)]
+    if max(map(abs, exponents)) > MAX_EXPONENT:
+        raise Unreadable(f"Exponent too large: {text!r}")
+    return Fraction(int(base)) ** exponents[0] / Fraction(int(divisor_base or 1)) ** exponents[1]
+
+_RADICAL = re.compile(r"([-+]?\d*)\*?(?:√\(?(\d+)\)?)?")
+
+def _parse_radical(text):
+    """"3√2", "3sqrt(2)", "√2" or an integer, as (coefficient, radicand); integers have radicand 1."""
+    match = _RADICAL.fullmatch(_clean(text))
+    if match is None or match.group(0) in ("", "+", "-"):
+        raise Unreadable(f"Not a radical: {text!r}")
+    coefficient, radicand = match.groups()
+    coefficient = int(coefficient + "1" if coefficient in ("", "+", "-") else coefficient)
+    radicand = int(radicand or 1)
+    return (0, 1) if coefficient == 0 or radicand == 0 else (coefficient, radicand)
+
+def _parse_formula(text):
+    """The right-hand side of "l = (P - 2w) / 2", spaces and "*" removed; the letters keep their case."""
+    text = _clean(text, lower=False).replace("*", "").replace("pi", "π")
+    sides = text.split("=")
+    if len(sides) == 1:
+        return sides[0]
+    if len(sides) != 2:
+        raise Unreadable(f"Not a formula: {text!r}")
+    left, right = sides
+    if len(right) == 1 and len(left) > 1: # (P - 2w) / 2 = l
+        left, right = right, left
+    if len(left) != 1:
+        raise Unreadable(f"Not solved for one variable: {text!r}")
+    return right
+
+_PARSERS = {
+    "number": _parse_number,
+    "polynomial": _parse_polynomial,
+    "factored": _parse_factored,
+    "solution_set": _parse_solution_set,
+    "domain_range": _parse_domain_range,
+    "point": _parse_point,
+    "line": _parse_line,
+    "power": _parse_power,
+    "radical": _parse_radical,
+    "formula": _parse_formula,
+}
+
+@lru_cache(maxsize=CACHE_SIZE)
+def normalize(kind, text):
+    """Returns the canonical value of an answer of a kind, or None if it can't be read."""
+    try:
+        return _PARSERS[kind](text)
+    except (Unreadable, ValueError, ZeroDivisionError, OverflowError):
+        return None
+
+# --- Error Patterns ---
+
+def _expand(value):
+    """The polynomial a parsed factored answer multiplies out to."""
+    if value[0] == "expanded":
+        return value[1]
+    _, constant, factors = value
+    product = [constant]
+    for factor in factors:
+        result = [Fraction(0)] * (len(product) + len(factor) - 1)
+        for i, a in enumerate(product):
+            for j, b in enumerate(factor):
+                result[i + j] += a * b
+        product = result
+    return tuple(product)
+
+def _term_name(degree):
+    return "constant" if degree == 0 else "x term" if degree == 1 else f"x^{degree} term"
+
+def _interval_pattern(expected, got):
+    """Compares two solution sets by boundaries, endpoints and direction."""
+    if len(expected) != len(got):
+        return "wrong number of pieces"
+    bounds = lambda intervals: sorted(v for i in intervals for v in (i[0], i[2]) if v is not None)
+    if bounds(expected) != bounds(got):
+        if bounds(expected) == sorted(-v for v in bounds(got)):
+            return "sign error in boundary"
+        return "wrong boundary"
+    shape = lambda intervals: [(i[0] is None, i[2] is None) for i in intervals]
+    if shape(expected) != shape(got):
+        return "inequality direction (sign not flipped?)"
+    return "open/closed endpoint"
+
+def _pattern(kind, expected, got):
+    """Names how a readable wrong answer differs from the expected one."""
+    if kind in ("number", "power"):
+        if isinstance(expected, str) or isinstance(got, str):
+            return "missed the undefined slope" if expected == "undefined" else "called it undefined"
+        if got == -expected:
+            return "sign error"
+        if got and expected and got == 1 / expected:
+            return "reciprocal"
+        if abs(got - expected) == 1:
+            return "off by one"
+        return "wrong value"
+    if kind == "polynomial":
+        if len(got) == len(expected) and all(abs(a) == abs(b) for a, b in zip(expected, got)):
+            return "sign error"
+        wrong = [_term_name(d) for d in range(max(len(expected), len(got)))
+                 if (expected[d] if d < len(expected) else 0) != (got[d] if d < len(got) else 0)]
+        return "wrong " + " and ".join(reversed(wrong))
+    if kind == "factored":
+        if _expand(expected) == _expand(got):
+            if got[0] == "expanded":
+                return "not factored"
+            return "not fully factored" if abs(got[1]) < abs(expected[1]) else "factored differently"
+        if got[0] == "factored" and len(got[2]) == len(expected[2]):
+            if sorted(tuple(map(abs, f)) for f in got[2]) == sorted(tuple(map(abs, f)) for f in expected[2]):
+                return "sign error in a factor"
+        return "wrong factors"
+    if kind == "solution_set":
+        if got == ("inconsistent",):
+            return "inequality and interval disagree"
+        return _interval_pattern(expected, got)
+    if kind == "domain_range":
+        wrong = [name for name, e, g in zip(("domain", "range"), expected, got) if e != g]
+        if any(got[("domain", "range").index(name)] is None for name in wrong):
+            return "missing " + " and ".join(n for n in wrong if got[("domain", "range").index(n)] is None)
+        return "wrong " + " and ".join(wrong)
+    if kind == "point":
+        if got == expected[::-1]:
+            return "x and y swapped"
+        if got[0] == expected[0]:
+            return "wrong y"
+        if got[1] == expected[1]:
+            return "wrong x"
+        return "wrong point"
+    if kind == "line":
+        if got[0] != expected[0]:
+            return "vertical/horizontal mix-up"
+        if got[0] == "x":
+            return "wrong x-value"
+        if got[1] == expected[1]:
+            return "wrong intercept"
+        if got[2] == expected[2]:
+            return "negative reciprocal slope" if got[1] * expected[1] == -1 else "wrong slope"
+        return "wrong slope and intercept"
+    if kind == "radical":
+        if got[0] ** 2 * got[1] == expected[0] ** 2 * expected[1]:
+            return "not simplified"
+        if got == (-expected[0], expected[1]):
+            return "sign error"
+        return "wrong coefficient" if got[1] == expected[1] else "wrong radicand"
+    return "wrong formula"
+
+@lru_cache(maxsize=CACHE_SIZE)
+def error_pattern(kind, expected, got):
+    """Returns the error pattern of a wrong answer given their canonical values (got None: unreadable)."""
+    if got is None:
+        return "unreadable"
+    return _pattern(kind, expected, got)
+
+# --- Grading ---
+
+def grade_answer(topic, expected, response):
+    """Grades one response; returns (correct, error pattern), with correct None when the answer is a graph."""
+    kind = ANSWER_KINDS.get(topic)
+    if kind is None:
+        return None, "graph answer"
+    return _grade(kind, _expected_value(kind, expected), response)
+
+def _grade(kind, expected_value, response):
+    if not response or response.isspace():
+        return False, "blank"
+    value = normalize(kind, response)
+    if value == expected_value:
+        return True, None
+    return False, error_pattern(kind, expected_value, value)
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _expected_value(kind, answer):
+    value = normalize(kind, answer)
+    if value is None:
+        raise ValueError(f"Can't read the expected {kind} answer {answer!r}")
+    return value
+
+@lru_cache(maxsize=CACHE_SIZE)
+def expected_answer(problem_id):
+    """Returns (topic, kind, canonical answer) for a problem id "<topic id>-<index>"; kind None for graphs."""
+    topic_id, index = map(int, problem_id.split("-"))
+    topic = TOPIC_NAMES[topic_id]
+    if not 0 <= index < parameter_spaces.space(topic).size:
+        raise ValueError(f"No problem {index} in {topic}")
+    kind = ANSWER_KINDS.get(topic)
+    if kind is None:
+        return topic, None, None
+    return topic, kind, _expected_value(kind, Problem(topic_id, index).text()[1])
+
+class Report:
+    """Per-topic counts of graded responses by outcome: "correct" or an error pattern."""
+
+    def __init__(self):
+        self.topics = {} # topic -> Counter of outcomes
+
+    def add(self, topic, correct, pattern):
+        outcomes = self.topics.get(topic)
+        if outcomes is None:
+            outcomes = self.topics[topic] = Counter()
+        outcomes["correct" if correct else pattern] += 1
+
+    def summary(self, patterns=3):
+        """One row per topic: responses, correct, accuracy and the most common error patterns."""
+        rows = []
+        for topic, outcomes in sorted(self.topics.items(), key=lambda item: TOPIC_IDS.get(item[0], -1)):
+            total = sum(outcomes.values())
+            errors = [(pattern, count) for pattern, count in outcomes.most_common() if pattern != "correct"]
+            rows.append({"topic": topic, "responses": total, "correct": outcomes["correct"],
+                         "accuracy": round(100 * outcomes["correct"] / total, 1),
+                         "errors": ", ".join(f"{pattern} ({count})" for pattern, count in errors[:patterns])})
+        return rows
+
+    def text(self):
+        lines = [f"{'Topic':35s} {'responses':>9s} {'correct':>8s} {'%':>6s}  most common errors"]
+        for row in self.summary():
+            lines.append(f"{row['topic']:35s} {row['responses']:9,d} {row['correct']:8,d} "
+                         f"{row['accuracy']:6.1f}  {row['errors']}")
+        return "\n".join(lines)
+
+def grade_rows(rows, report=None):
+    """Grades rows (dicts) one at a time, yielding (row, correct, pattern) and counting them in report."""
+    for row in rows:
+        problem_id = row.get("problem")
+        try:
+            if problem_id:
+                topic, kind, expected = expected_answer(problem_id)
+            else:
+                topic = row.get("topic", "")
+                if topic.isdigit():
+                    topic = TOPIC_NAMES[int(topic)]
+                kind = ANSWER_KINDS.get(topic)
+                expected = _expected_value(kind, row["answer"]) if kind else None
+        except (ValueError, IndexError, KeyError):
+            topic, correct, pattern = row.get("topic") or "?", False, "unknown problem"
+        else:
+            if kind is None:
+                correct, pattern = None, "graph answer"
+            else:
+                response = row.get("response")
+                if response is not None and not isinstance(response, str): # A bare number in JSONL
+                    response = str(response)
+                correct, pattern = _grade(kind, expected, response)
+        if report is not None and correct is not None:
+            report.add(topic, correct, pattern)
+        yield row, correct, pattern
+
+# --- Files ---
+
+def file_format(path):
+    return "jsonl" if path.endswith((".jsonl", ".json", ".ndjson")) else "csv"
+
+def read_rows(stream, fmt="csv"):
+    """Yields the rows of a CSV (with a header) or JSONL stream as dicts, one line at a time."""
+    if fmt == "jsonl":
+        loads = json.loads
+        for line in stream:
+            if not line.isspace():
+                yield loads(line)
+    else:
+        yield from csv.DictReader(stream)
+
+def grade_stream(stream, fmt="csv", out=None):
+    """Grades every row of a stream, writing graded rows to out (same format) if given; returns the Report."""
+    report = Report()
+    graded = grade_rows(read_rows(stream, fmt), report)
+    if out is None:
+        for _ in graded:
+            pass
+        return report
+    writer = None
+    for row, correct, pattern in graded:
+        row["correct"] = "" if correct is None else int(correct)
+        row["error"] = pattern or ""
+        if fmt == "jsonl":
+            out.write(json.dumps(row, ensure_ascii=False) + "\n")
+        else:
+            if writer is None:
+                writer = csv.DictWriter(out, fieldnames=list(row))
+                writer.writeheader()
+            writer.writerow(row)
+    return report
+
+def grade_file(path, out_path=None):
+    """Grades a CSV or JSONL file (by extension), writing the graded rows to out_path if given."""
+    with open(path, newline="", encoding="utf-8") as stream:
+        if out_path is None:
+            return grade_stream(stream, file_format(path))
+        with open(out_path, "w", newline="", encoding="utf-8") as out:
+            return grade_stream(stream, file_format(path), out)
+
+def main():
+    parser = argparse.ArgumentParser(description="Grade a CSV or JSONL file of student responses.")
+    parser.add_argument("responses", help="CSV (student,problem,response) or JSONL file; - for CSV on stdin")
+    parser.add_argument("-o", "--output", help="write the graded rows here")
+    args = parser.parse_args()
+    if args.responses == "-":
+        report = grade_stream(sys.stdin)
+    else:
+        report = grade_file(args.responses, args.output)
+    print(report.text())
+
+if __name__ == "__main__":
+    main()
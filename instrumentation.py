@@ -0,0 +1,287 @@
+# File: instrumentation.py
+#
+# Opt-in metrics and profiling for the TOPICS generators. The front-ends
+# make every problem through call(topic, func, ...). Off by default, and then
+# nothing is wrapped and call() is a single flag check. enable() (or setting
+# PROBLEM_GENERATOR_METRICS=1) swaps timing wrappers onto the pieces every
+# problem goes through, so each call is split into exclusive per-phase times:
+#
+#   draw       the generator itself: parameter draws and control flow
+#   math       the _build_* helpers (fraction math, answers, plot specs)
+#   format     the _format_* helpers (string building)
+#   figure     plot_spec.render: drawing a graph's spec onto a new figure
+#              (SVG graphs are drawn and written here too)
+#   rasterize  raster._rasterize: the figure becomes palette PNG or WebP bytes
+#
+# Graphs are drawn when shown, usually after the generator returned. Their
+# figure and rasterize time still counts for their topic, but only counts
+# toward its latency when they are drawn inside call().
+#
+# Per topic it keeps a call counter, an error counter, a latency histogram
+# and the seconds spent in each phase. snapshot_text() renders them in the
+# Prometheus text format, written to PROBLEM_GENERATOR_METRICS_FILE (if set)
+# at most every SNAPSHOT_INTERVAL seconds and at exit. profile_next(n)
+# captures cProfile stats for the next n problems, also dumped in pstats
+# format to PROBLEM_GENERATOR_PROFILE_FILE if set.
+
+import atexit
+import cProfile
+import io
+import os
+import pstats
+import threading
+import time
+
+import plot_spec
+import problem_generator as pg
+import raster
+
+ENV_ENABLE = "PROBLEM_GENERATOR_METRICS"
+ENV_SNAPSHOT_FILE = "PROBLEM_GENERATOR_METRICS_FILE"
+ENV_PROFILE_FILE = "PROBLEM_GENERATOR_PROFILE_FILE"
+SNAPSHOT_INTERVAL = 10.0 # Seconds
+PHASES = ("draw", "math", "format", "figure", "rasterize")
+BUCKETS = (1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4, 1e-3, 2.5e-3, 5e-3,
+           1e-2, 2.5e-2, 5e-2, 0.1, 0.25, 0.5, 1.0, 2.5) # Latency histogram bounds in seconds
+
+_enabled = False
+_lock = threading.Lock()
+_local = threading.local() # .topic being generated, .stack of child times
+
+_calls = {} # topic -> problems generated
+_errors = {} # topic -> generator exceptions
+_latency = {} # topic -> [count per bucket..., count above the last bucket, sum of seconds]
+_phase_seconds = {} # (topic, phase) -> exclusive seconds
+
+_patched = [] # (module, name, original) to undo in disable()
+_snapshot_path = None
+_last_snapshot = 0.0
+
+_profiler = None
+_profile_remaining = 0
+_profile_lock = threading.Lock() # A profiler only follows one call at a time
+_profile_report = ""
+
+# --- Switching On and Off ---
+
+def enabled():
+    """Returns True while instrumentation is on."""
+    return _enabled
+
+def enable(snapshot_path=None):
+    """Turns instrumentation on for the whole process; snapshot_path gets periodic Prometheus snapshots."""
+    global _enabled, _snapshot_path
+    with _lock:
+        if snapshot_path:
+            _snapshot_path = snapshot_path
+        if _enabled:
+            return
+        for name in dir(pg):
+            if name.startswith("_format_"):
+                _patch(pg, name, "format")
+            elif name.startswith("_build_"):
+                _patch(pg, name, "math")
+        _patch(plot_spec, "render", "figure")
+        _patch(raster, "_rasterize", "rasterize")
+        _enabled = True
+
+def disable():
+    """Turns instrumentation off and restores the original functions; the metrics are kept."""
+    global _enabled
+    with _lock:
+        while _patched:
+            module, name, original = _patched.pop()
+            setattr(module, name, original)
+        _enabled = False
+
+def reset():
+    """Clears every metric."""
+    with _lock:
+        _calls.clear()
+        _errors.clear()
+        _latency.clear()
+        _phase_seconds.clear()
+
+def _patch(module, name, phase):
+    """Replaces module.name with a version that records its exclusive time under phase."""
+    original = getattr(module, name)
+    _patched.append((module, name, original))
+    setattr(module, name, _phase_timer(phase, original))
+
+# --- Recording ---
+
+def _phase_timer(phase, func):
+    """Wraps func so its own time (minus nested timed calls) is added to phase."""
+    def timed(*args, **kwargs):
+        return _timed_call(phase, func, args, kwargs)
+    timed.__wrapped__ = func
+    return timed
+
+def _timed_call(phase, func, args, kwargs):
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    topic = getattr(_local, "topic", None)
+    if phase in ("figure", "rasterize") and args:
+        # Graphs are rendered after their generator returned; call() tagged them with the topic
+        topic = _local.topic = getattr(args[0], "problem_topic", topic)
+    children = [0.0]
+    stack.append(children)
+    start = time.perf_counter()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        elapsed = time.perf_counter() - start
+        stack.pop()
+        if stack:
+            stack[-1][0] += elapsed
+        else:
+            _local.topic = None
+        with _lock:
+            _phase_seconds[topic, phase] = _phase_seconds.get((topic, phase), 0.0) + elapsed - children[0]
+
+def _record(topic, seconds, failed):
+    """Adds one generator call to the counters and the latency histogram."""
+    with _lock:
+        _calls[topic] = _calls.get(topic, 0) + 1
+        if failed:
+            _errors[topic] = _errors.get(topic, 0) + 1
+        histogram = _latency.get(topic)
+        if histogram is None:
+            histogram = _latency[topic] = [0] * (len(BUCKETS) + 1) + [0.0]
+        bucket = 0
+        while bucket < len(BUCKETS) and seconds > BUCKETS[bucket]:
+            bucket += 1
+        histogram[bucket] += 1
+        histogram[-1] += seconds
+
+def call(topic, func, *args):
+    """Calls func(*args) to generate a problem of topic, recording it if instrumentation is on."""
+    if not _enabled:
+        return func(*args)
+
+    global _last_snapshot
+    profiler = _start_profiling()
+    _local.topic = topic
+    start = time.perf_counter()
+    failed = True
+    try:
+        result = _timed_call("draw", func, args, {})
+        failed = False
+    finally:
+        _record(topic, time.perf_counter() - start, failed)
+        if profiler is not None:
+            _stop_profiling(profiler)
+
+    parts = result.build() if hasattr(result, "build") else result # A problems.Problem builds its (cached) pair
+    if isinstance(parts, tuple):
+        for item in parts:
+            if hasattr(item, "__dict__"):
+                item.problem_topic = topic # So rendering a graph later is counted for this topic
+
+    if _snapshot_path and time.monotonic() - _last_snapshot > SNAPSHOT_INTERVAL:
+        _last_snapshot = time.monotonic()
+        write_snapshot()
+    return result
+
+# --- Profiling ---
+
+def profile_next(n):
+    """Captures cProfile stats for the next n problems; read them with profile_report()."""
+    global _profiler, _profile_remaining
+    with _profile_lock:
+        _profiler = cProfile.Profile()
+        _profile_remaining = n
+
+def _start_profiling():
+    # Non-blocking: a call made while another thread is being profiled just isn't profiled
+    if _profiler is None or not _profile_lock.acquire(blocking=False):
+        return None
+    if _profiler is None: # Finished while we were waiting for the lock
+        _profile_lock.release()
+        return None
+    _profiler.enable()
+    return _profiler
+
+def _stop_profiling(profiler):
+    global _profiler, _profile_remaining, _profile_report
+    profiler.disable()
+    _profile_remaining -= 1
+    if _profile_remaining <= 0:
+        _profiler = None
+        text = io.StringIO()
+        pstats.Stats(profiler, stream=text).sort_stats("cumulative").print_stats(25)
+        _profile_report = text.getvalue()
+        if os.environ.get(ENV_PROFILE_FILE):
+            profiler.dump_stats(os.environ[ENV_PROFILE_FILE])
+    _profile_lock.release()
+
+def profiling():
+    """Returns how many problems are still to be profiled (0 when no capture is running)."""
+    return _profile_remaining if _profiler is not None else 0
+
+def profile_report():
+    """Returns the pstats text of the last finished capture, or "" if there is none."""
+    return _profile_report
+
+# --- Reporting ---
+
+def summary():
+    """Returns one dict per topic with its call count, errors, mean latency and mean phase times in ms."""
+    with _lock:
+        rows = []
+        for topic, count in _calls.items():
+            row = {"topic": topic, "calls": count, "errors": _errors.get(topic, 0),
+                   "mean_ms": round(_latency[topic][-1] / count * 1000, 3)}
+            for phase in PHASES:
+                row[f"{phase}_ms"] = round(_phase_seconds.get((topic, phase), 0.0) / count * 1000, 3)
+            rows.append(row)
+    return rows
+
+def _label(value):
+    """Escapes a Prometheus label value."""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def snapshot_text():
+    """Returns every metric in the Prometheus text exposition format."""
+    lines = []
+    with _lock:
+        lines += ["# HELP problem_generator_problems_total Problems generated.",
+                  "# TYPE problem_generator_problems_total counter"]
+        lines += [f'problem_generator_problems_total{{topic="{_label(t)}"}} {n}' for t, n in _calls.items()]
+        lines += ["# HELP problem_generator_errors_total Generator calls that raised.",
+                  "# TYPE problem_generator_errors_total counter"]
+        lines += [f'problem_generator_errors_total{{topic="{_label(t)}"}} {n}' for t, n in _errors.items()]
+
+        lines += ["# HELP problem_generator_latency_seconds Time to generate one problem.",
+                  "# TYPE problem_generator_latency_seconds histogram"]
+        for topic, histogram in _latency.items():
+            label = _label(topic)
+            cumulative = 0
+            for bound, count in zip(BUCKETS + ("+Inf",), histogram):
+                cumulative += count
+                lines.append(f'problem_generator_latency_seconds_bucket{{topic="{label}",le="{bound}"}} {cumulative}')
+            lines.append(f'problem_generator_latency_seconds_sum{{topic="{label}"}} {histogram[-1]:.9f}')
+            lines.append(f'problem_generator_latency_seconds_count{{topic="{label}"}} {cumulative}')
+
+        lines += ["# HELP problem_generator_phase_seconds_total Exclusive time per generation phase.",
+                  "# TYPE problem_generator_phase_seconds_total counter"]
+        for (topic, phase), seconds in _phase_seconds.items():
+            lines.append(f'problem_generator_phase_seconds_total{{topic="{_label(topic)}",phase="{phase}"}} '
+                         f'{seconds:.9f}')
+    return "\n".join(lines) + "\n"
+
+def write_snapshot(path=None):
+    """Writes snapshot_text() to path (default: the configured snapshot file) atomically."""
+    path = path or _snapshot_path
+    if not path:
+        return
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        f.write(snapshot_text())
+    os.replace(temp_path, path) # Scrapers never see a half-written file
+
+atexit.register(write_snapshot)
+
+if os.environ.get(ENV_ENABLE):
+    enable(os.environ.get(ENV_SNAPSHOT_FILE))
@@ -1,70 +1,187 @@
 # File: main.py
+#
+# Tkinter front-end. Clicks never do the work on the event thread: drawing
+# a problem and rendering its graph run on a worker thread, which puts the
+# result on a queue, and the event loop collects it with after() every
+# FRAME_MS, so the window keeps redrawing at 60 fps however slow a topic
+# is. Graphs are shown in one image widget whose picture is pasted over in
+# place, never recreated.
+#
+# Problems, with their graphs already rendered, come from a prefetcher's
+# worker processes. Those processes import this script, so the window is
+# only built when it is run as __main__.
 
+import io
+import queue
 import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
 from tkinter import ttk
 from problem_generator import TOPICS # Import our topics dictionary
+from no_repeat import ClassSession, TopicExhausted
+from problems import Problem
+from prefetch import Prefetcher
+import instrumentation # Records metrics only when PROBLEM_GENERATOR_METRICS is set
 
-# --- Global variables to hold the current problem and answer ---
-current_problem = ""
-current_answer = ""
+FRAME_MS = 16 # How often finished work is collected: about 60 frames a second
+GRAPH_SIZE = (420, 420) # Pixels of the graph widget; graphs are scaled to fit
+
+# --- Global state, touched only by the event thread ---
+current_record = None
+request_id = 0 # Bumped on every Generate, so results of earlier clicks are dropped
+
+# --- Work done on the worker thread ---
+# One worker, so the "No repeats" draws and renders happen one at a time
+worker = ThreadPoolExecutor(1, thread_name_prefix="problem-worker")
+results = queue.Queue() # (request id, display function, arguments), for the event thread
+
+# "No repeats" draws for this window
+class_session = ClassSession()
+
+def new_problem(topic, no_repeat):
+    """Draws the next problem record for the topic, honoring "No repeats"."""
+    if no_repeat:
+        return Problem.at(topic, class_session.draw(topic))
+    return prefetcher.pop(topic)
+
+def graph_picture(record, which):
+    """Renders a graph part (or takes the prefetched one) and scales it into a GRAPH_SIZE picture."""
+    from PIL import Image
+    png = prefetcher.image(record, which) or record.part(which, "png")
+    graph = Image.open(io.BytesIO(png)).convert("RGB")
+    graph.thumbnail(GRAPH_SIZE, Image.LANCZOS)
+    picture = Image.new("RGB", GRAPH_SIZE, "white")
+    picture.paste(graph, ((GRAPH_SIZE[0] - graph.width) // 2, (GRAPH_SIZE[1] - graph.height) // 2))
+    return picture
+
+def generate(topic, no_repeat):
+    """Draws a problem and prepares what is shown for it: (record, text, picture or None)."""
+    note = ""
+    try:
+        record = instrumentation.call(topic, new_problem, topic, no_repeat)
+    except TopicExhausted as exhausted:
+        # Every problem has been used; start a new pass in a new order
+        note = f"{exhausted}. Starting over.\n\n"
+        class_session.reset(topic)
+        record = instrumentation.call(topic, new_problem, topic, no_repeat)
+    if record.problem_is_graph:
+        return record, f"{note}Find the domain and range of the graph.", graph_picture(record, 0)
+    return record, f"{note}{record.text()[0]}", None
+
+def answer_graph(record):
+    """The answer's graph picture, to be shown under the answer label."""
+    return graph_picture(record, 1), answer_label
+
+def submit(request, show, work, *args):
+    """Runs work(*args) on the worker; the event thread then calls show with its result."""
+    def run():
+        try:
+            results.put((request, show, work(*args)))
+        except Exception as error: # Show it instead of losing it on the worker thread
+            results.put((request, show_error, (error,)))
+    worker.submit(run)
+
+# --- Functions run by the event loop ---
+def collect_results():
+    """Shows finished work from the worker, then checks again next frame."""
+    try:
+        while True:
+            request, show, value = results.get_nowait()
+            if request == request_id:
+                show(*value)
+    except queue.Empty:
+        pass
+    window.after(FRAME_MS, collect_results)
+
+def show_graph(picture, below):
+    """Pastes a picture into the persistent graph widget under the widget below, or hides it for None."""
+    if picture is None:
+        graph_label.pack_forget()
+    else:
+        graph_photo.paste(picture) # Same widget and image, new pixels
+        graph_label.pack(after=below, pady=5)
+
+def show_problem(record, text, picture):
+    global current_record
+    current_record = record
+    problem_label.config(text=text)
+    show_graph(picture, problem_label)
+    answer_button.state(["!disabled"])
+
+def show_error(error):
+    problem_label.config(text=f"Something went wrong: {error}")
 
-# --- Functions to handle button clicks ---
 def handle_generate():
-    """Gets a new problem and displays it."""
-    global current_problem, current_answer
-    
-    # Get the selected topic from the dropdown
-    selected_topic = topic_selector.get()
-    
-    # Get the corresponding generator function from the TOPICS dictionary
-    generator_func = TOPICS[selected_topic]
-    
-    # Generate a new problem and answer
-    current_problem, current_answer = generator_func()
-    
-    # Update the labels on the screen
-    problem_label.config(text=current_problem)
+    """Asks the worker for a new problem; it is shown when it is ready."""
+    global current_record, request_id
+    request_id += 1
+    # No answer until the new problem is shown; the old one's would be taken for it
+    current_record = None
+    answer_button.state(["disabled"])
     answer_label.config(text="") # Hide the old answer
+    graph_label.pack_forget()
+    submit(request_id, show_problem, generate, topic_selector.get(), no_repeats.get())
 
 def handle_show_answer():
-    """Displays the answer to the current problem."""
-    answer_label.config(text=f"Answer: {current_answer}")
+    """Displays the answer to the current problem; a graph is rendered on the worker first."""
+    if current_record is None:
+        return
+    if current_record.answer_is_graph:
+        answer_label.config(text="Answer:")
+        submit(request_id, show_graph, answer_graph, current_record)
+    else:
+        answer_label.config(text=f"Answer: {current_record.text()[1]}")
+
+
+if __name__ == "__main__":
+    # Ready-made problems per topic, graphs rendered as PNG, from worker processes
+    prefetcher = Prefetcher(backend="png")
+
+    # --- Set up the main application window ---
+    window = tk.Tk()
+    window.title("Algebra I 'Do Now' Generator")
+    window.geometry("540x780") # Set the window size
 
+    # --- Create and place the UI elements ---
+    # Frame for better organization
+    main_frame = ttk.Frame(window, padding="20")
+    main_frame.pack(expand=True, fill="both")
 
-# --- Set up the main application window ---
-window = tk.Tk()
-window.title("Algebra I 'Do Now' Generator")
-window.geometry("500x350") # Set the window size
+    # Title Label
+    title_label = ttk.Label(main_frame, text="Select a Topic", font=("Helvetica", 16))
+    title_label.pack(pady=10)
 
-# --- Create and place the UI elements ---
-# Frame for better organization
-main_frame = ttk.Frame(window, padding="20")
-main_frame.pack(expand=True, fill="both")
+    # Dropdown menu for topic selection
+    topic_selector = ttk.Combobox(main_frame, values=list(TOPICS.keys()), font=("Helvetica", 12))
+    topic_selector.pack(pady=10)
+    topic_selector.current(0) # Set the default selection to the first item
 
-# Title Label
-title_label = ttk.Label(main_frame, text="Select a Topic", font=("Helvetica", 16))
-title_label.pack(pady=10)
+    # Never show the same problem twice until the topic runs out
+    no_repeats = tk.BooleanVar(value=False)
+    no_repeats_check = ttk.Checkbutton(main_frame, text="No repeats", variable=no_repeats)
+    no_repeats_check.pack()
 
-# Dropdown menu for topic selection
-topic_selector = ttk.Combobox(main_frame, values=list(TOPICS.keys()), font=("Helvetica", 12))
-topic_selector.pack(pady=10)
-topic_selector.current(0) # Set the default selection to the first item
+    # Generate Problem Button
+    generate_button = ttk.Button(main_frame, text="Generate Problem", command=handle_generate)
+    generate_button.pack(pady=10)
 
-# Generate Problem Button
-generate_button = ttk.Button(main_frame, text="Generate Problem", command=handle_generate)
-generate_button.pack(pady=10)
+    # Label to display the problem
+    problem_label = ttk.Label(main_frame, text="Click 'Generate Problem' to start!", font=("Helvetica", 14, "bold"),
+                              wraplength=480)
+    problem_label.pack(pady=20)
 
-# Label to display the problem
-problem_label = ttk.Label(main_frame, text="Click 'Generate Problem' to start!", font=("Helvetica", 14, "bold"))
-problem_label.pack(pady=20)
+    # The one graph widget: shown under the problem when there is a graph, updated in place
+    from PIL import ImageTk
+    graph_photo = ImageTk.PhotoImage("RGB", GRAPH_SIZE)
+    graph_label = ttk.Label(main_frame, image=graph_photo)
 
-# Show Answer Button
-answer_button = ttk.Button(main_frame, text="Show Answer", command=handle_show_answer)
-answer_button.pack(pady=5)
+    # Show Answer Button
+    answer_button = ttk.Button(main_frame, text="Show Answer", command=handle_show_answer)
+    answer_button.pack(pady=5)
 
-# Label to display the answer
-answer_label = ttk.Label(main_frame, text="", font=("Helvetica", 14))
-answer_label.pack(pady=10)
+    # Label to display the answer
+    answer_label = ttk.Label(main_frame, text="", font=("Helvetica", 14), wraplength=480)
+    answer_label.pack(pady=10)
 
-# --- Start the application ---
-window.mainloop()
\ No newline at end of file
+    # --- Start the application ---
+    window.after(FRAME_MS, collect_results)
+    window.mainloop()
@@ -0,0 +1,179 @@
+# File: no_repeat.py
+#
+# "No repeats" mode: a class never sees the same problem twice in a topic
+# until every problem of that topic has been used.
+#
+# Each topic's problems have a dense index (see parameter_spaces.py). A class
+# walks every generator branch (variant) of a topic in a keyed pseudorandom
+# order: a small Feistel network over the next power of four, cycle-walked
+# back into [0, size), is a bijection on the variant's indices. Draw k is
+# position k of that order, so the indices a class has used are just a
+# prefix of it and need no storage. Problems that were used some other way
+# (handed out on paper, skipped by the teacher) are recorded with mark_used()
+# in a bitmap that is only allocated 4096 bits at a time, for the chunks that
+# are actually touched, and the walk steps over them.
+#
+# Per class and topic that is a few integers, so thousands of classes can be
+# kept in memory at once. Branches are picked in proportion to the problems
+# they have left, so every unused problem is equally likely to come next and
+# a small branch is not used up in the first few dozen draws.
+
+import random
+
+import parameter_spaces
+from seeding import derive_seed
+
+ROUNDS = 4
+CHUNK_BITS = 4096
+_MULTIPLIER = 0x9E3779B97F4A7C15 # 2^64 / golden ratio
+_MASK64 = (1 << 64) - 1
+
+class TopicExhausted(LookupError):
+    """Raised when a class has used every problem a topic can produce."""
+
+    def __init__(self, topic, size):
+        super().__init__(f"All {size} problems of {topic!r} have been used")
+        self.topic = topic
+        self.size = size
+
+# --- Keyed Permutation ---
+
+def _round(value, key, number, mask):
+    """Feistel round function; any function works, it only has to mix well."""
+    mixed = ((value + key + number * _MULTIPLIER) * _MULTIPLIER) & _MASK64
+    return (mixed ^ (mixed >> 29)) & mask
+
+def _half_bits(size):
+    """Bits per Feistel half, so the network covers [0, 4 ** half_bits) >= [0, size)."""
+    return max(1, ((size - 1).bit_length() + 1) // 2)
+
+def permute(position, size, key):
+    """Maps position in [0, size) to the index at that position of the keyed order."""
+    half = _half_bits(size)
+    mask = (1 << half) - 1
+    value = position
+    while True:
+        left, right = value >> half, value & mask
+        for number in range(ROUNDS):
+            left, right = right, left ^ _round(right, key, number, mask)
+        value = (left << half) | right
+        if value < size: # Cycle-walk until we land back inside the range
+            return value
+
+def unpermute(index, size, key):
+    """Inverse of permute(): the position of index in the keyed order."""
+    half = _half_bits(size)
+    mask = (1 << half) - 1
+    value = index
+    while True:
+        left, right = value >> half, value & mask
+        for number in reversed(range(ROUNDS)):
+            left, right = right ^ _round(left, key, number, mask), left
+        value = (left << half) | right
+        if value < size:
+            return value
+
+# --- Class Sessions ---
+
+class _TopicUse:
+    """What one class has used of one topic."""
+
+    __slots__ = ('cycle', 'walked', 'remaining', 'marked', 'draws')
+
+    def __init__(self, space, cycle=0):
+        self.cycle = cycle # How many times the topic was reset; changes the order
+        self.walked = [0] * len(space.variants) # Positions consumed per variant
+        self.remaining = [variant.size for variant in space.variants]
+        self.marked = None # Chunk number -> bytearray, allocated on first mark
+        self.draws = 0
+
+    def is_marked(self, index):
+        if self.marked is None:
+            return False
+        chunk = self.marked.get(index // CHUNK_BITS)
+        if chunk is None:
+            return False
+        offset = index % CHUNK_BITS
+        return bool(chunk[offset >> 3] & (1 << (offset & 7)))
+
+    def set_marked(self, index):
+        if self.marked is None:
+            self.marked = {}
+        chunk = self.marked.get(index // CHUNK_BITS)
+        if chunk is None:
+            chunk = self.marked[index // CHUNK_BITS] = bytearray(CHUNK_BITS // 8)
+        offset = index % CHUNK_BITS
+        chunk[offset >> 3] |= 1 << (offset & 7)
+
+class ClassSession:
+    """No-repeat problem draws for one class; the same seed replays the same problems."""
+
+    __slots__ = ('seed', '_topics')
+
+    def __init__(self, seed=None):
+        self.seed = random.getrandbits(64) if seed is None else seed
+        self._topics = {}
+
+    def _use(self, topic):
+        if topic not in self._topics:
+            self._topics[topic] = _TopicUse(parameter_spaces.space(topic))
+        return self._topics[topic]
+
+    def _key(self, topic, use, number):
+        """Permutation key of one variant of one topic for this class."""
+        return derive_seed(self.seed, "no_repeat", topic, use.cycle, number)
+
+    def draw(self, topic):
+        """Returns the index of a problem this class has not used yet and marks it used."""
+        space = parameter_spaces.space(topic)
+        use = self._use(topic)
+        total = sum(use.remaining)
+        if not total:
+            raise TopicExhausted(topic, space.size)
+
+        # Uniform over the unused problems: walk the variants' remaining counts to the drawn one
+        choice = derive_seed(self.seed, "no_repeat", topic, use.cycle, "draw", use.draws) % total
+        number = 0
+        while choice >= use.remaining[number]:
+            choice -= use.remaining[number]
+            number += 1
+        use.draws += 1
+
+        size = space.variants[number].size
+        key = self._key(topic, use, number)
+        while True:
+            index = space.offsets[number] + permute(use.walked[number], size, key)
+            use.walked[number] += 1
+            if not use.is_marked(index): # Marked problems were already counted as used
+                break
+        use.remaining[number] -= 1
+        return index
+
+    def generate(self, topic):
+        """Returns a (problem, answer) pair like TOPICS[topic]() that this class has not seen."""
+        return parameter_spaces.space(topic).problem(self.draw(topic))
+
+    def mark_used(self, topic, index):
+        """Records a problem used outside of draw(); returns False if it was already used."""
+        space = parameter_spaces.space(topic)
+        number, local = space.locate(index)
+        use = self._use(topic)
+        size = space.variants[number].size
+        if unpermute(local, size, self._key(topic, use, number)) < use.walked[number] or use.is_marked(index):
+            return False
+        use.set_marked(index)
+        use.remaining[number] -= 1
+        return True
+
+    def remaining(self, topic):
+        """Number of problems of a topic this class has not used yet."""
+        if topic not in self._topics:
+            return parameter_spaces.space(topic).size
+        return sum(self._topics[topic].remaining)
+
+    def reset(self, topic=None):
+        """Forgets what has been used, for one topic or all of them; the next pass is in a new order."""
+        for name in list(self._topics) if topic is None else [topic]:
+            if name in self._topics:
+                space = parameter_spaces.space(name)
+                self._topics[name] = _TopicUse(space, self._topics[name].cycle + 1)
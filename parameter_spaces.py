@@ -0,0 +1,248 @@
+# File: parameter_spaces.py
+#
+# The complete set of problems each topic can produce, as a dense index.
+# A topic's space is a list of variants, one per branch the generator picks
+# between (template, task, function type). Each variant is a product of
+# dimensions: a range or list of values, or a sequence of tuples for values
+# that are only valid together (a ParameterTable, or pairs like the two
+# breakpoints of a piecewise function). Indices are mixed-radix over those
+# dimensions, variant after variant, so every problem has exactly one index
+# in [0, space.size) and problem(index) recreates it with the same _build_*
+# helper the generator calls.
+#
+# Dimensions list the values a generator can actually end up with, after
+# its fix-ups (e.g. "if m == 0: m = 1"), so every index is a different problem.
+# Where different draws give the same problem (swapped factors, unreduced
+# slopes) the dimension keeps one row per problem and a key function, and
+# encode() maps any of those draws to that row.
+
+from fractions import Fraction
+from functools import lru_cache
+from itertools import product
+
+import parameter_tables
+import problem_generator as pg
+
+class Variant:
+    """One generator branch: an optional leading label and a product of dimensions."""
+
+    __slots__ = ('label', 'dims', 'size')
+
+    def __init__(self, label, *dims):
+        self.label = label
+        self.dims = dims
+        self.size = 1
+        for dim in dims:
+            self.size *= len(dim)
+
+    def decode(self, index):
+        """Returns the parameter tuple at index within this variant."""
+        values = []
+        for dim in reversed(self.dims):
+            index, position = divmod(index, len(dim))
+            value = dim[position]
+            if isinstance(value, tuple):
+                values.extend(reversed(value))
+            else:
+                values.append(value)
+        if self.label is not None:
+            values.append(self.label)
+        return tuple(reversed(values))
+
+    def encode(self, params):
+        """Returns the index of a parameter tuple within this variant."""
+        params = list(params[1:] if self.label is not None else params)
+        index = 0
+        for dim in self.dims:
+            width = len(dim[0]) if isinstance(dim[0], tuple) else 1
+            if width == 1:
+                value = params.pop(0)
+            else:
+                value, params = tuple(params[:width]), params[width:]
+            index = index * len(dim) + _position(dim, value)
+        if params:
+            raise ValueError(f"Too many parameters for variant {self.label!r}")
+        return index
+
+class ParameterSpace:
+    """Every problem of one topic; index i is built by problem_generator.<build>(*decode(i))."""
+
+    __slots__ = ('build', 'variants', 'offsets', 'size')
+
+    def __init__(self, build, *variants):
+        self.build = build # Looked up on every call, like the generators do, so wrappers apply
+        self.variants = variants
+        self.offsets = []
+        self.size = 0
+        for variant in variants:
+            self.offsets.append(self.size)
+            self.size += variant.size
+
+    def locate(self, index):
+        """Splits a topic index into (variant number, index within that variant)."""
+        if not 0 <= index < self.size:
+            raise IndexError(index)
+        for number in range(len(self.variants) - 1, -1, -1):
+            if index >= self.offsets[number]:
+                return number, index - self.offsets[number]
+
+    def decode(self, index):
+        """Returns the parameter tuple at a topic index."""
+        number, index = self.locate(index)
+        return self.variants[number].decode(index)
+
+    def encode(self, params):
+        """Returns the topic index of a parameter tuple."""
+        for number, variant in enumerate(self.variants):
+            if variant.label is None or variant.label == params[0]:
+                return self.offsets[number] + variant.encode(params)
+        raise ValueError(f"No variant for {params[0]!r}")
+
+    def problem(self, index):
+        """Builds the (problem, answer) pair at a topic index."""
+        return getattr(pg, self.build)(*self.decode(index))
+
+def _position(dim, value):
+    """Returns where value sits in one dimension."""
+    if isinstance(dim, (range, list, tuple)):
+        return dim.index(value)
+    key = getattr(dim, "key", None)
+    return _table_positions(dim)[key(*value) if key else value]
+
+@lru_cache(maxsize=None)
+def _table_positions(table):
+    """Reverse lookup from row (or row key) to row number for a ParameterTable."""
+    key = getattr(table, "key", None)
+    return {key(*table[i]) if key else table[i]: i for i in range(len(table))}
+
+def _distinct(width, rows, key):
+    """Keeps the first of the rows that give the same problem, as a ParameterTable with that key."""
+    first_rows = {}
+    for row in rows:
+        first_rows.setdefault(key(*row), row)
+    table = parameter_tables.ParameterTable(width, first_rows.values())
+    table.key = key
+    return table
+
+def _nonzero(low, high):
+    """Integers in [low, high] except 0."""
+    return [v for v in range(low, high + 1) if v != 0]
+
+def _reduced_slopes():
+    """Every distinct m_num/m_den with m_num in [-5, 5] and m_den in [1, 5], in lowest terms."""
+    slopes = sorted({Fraction(n, d) for n in range(-5, 6) for d in range(1, 6)})
+    return _distinct(2, ((m.numerator, m.denominator) for m in slopes), Fraction)
+
+# --- Topic Spaces ---
+
+@lru_cache(maxsize=None)
+def _spaces():
+    """Builds the space for every topic in pg.TOPICS."""
+    symbols = ['<', '>', '≤', '≥']
+    vertex_form = (range(-5, 6), range(-5, 6), [-2, -1, 1, 2]) # h, k, a
+    return {
+        "Order of Operations": ParameterSpace(
+            "_build_order_of_operations",
+            Variant(1, range(10, 21), range(2, 5), range(2, 4), range(2, 6), range(2, 5)),
+            Variant(2, range(15, 31), range(2, 5), range(2, 5), range(2, 4), range(2, 4), range(1, 11)),
+            Variant(3, range(2, 5), range(2, 6), range(2, 5), range(2, 4), range(3, 7),
+                    range(2, 5), range(2, 5), range(1, 16))),
+        "Two-Step Linear Equations": ParameterSpace(
+            "_build_linear_equation",
+            Variant(None, range(2, 10), range(1, 11), range(-5, 6))),
+        "Multi-Step Equations (Fractions)": ParameterSpace(
+            "_build_multistep_equation_fractions",
+            Variant(None, range(-6, 7), range(1, 6), range(1, 6), range(2, 6), range(-10, 11))),
+        "Literal Equations": ParameterSpace(
+            "_format_literal_equation",
+            Variant(None, range(len(pg.LITERAL_FORMULAS)))),
+        "One-Variable Word Problems": ParameterSpace(
+            "_build_word_problem",
+            Variant("equation", range(5, 51)),
+            Variant("inequality", range(80, 201), range(5, 16), range(10, 26))),
+        "Simplify Expressions": ParameterSpace(
+            "_build_simplify_expression",
+            Variant(None, range(2, 6), range(2, 7), range(1, 6), range(1, 10))),
+        "Polynomial Operations": ParameterSpace(
+            "_build_polynomial_operations",
+            *[Variant(task, range(1, 6), range(-7, 8), range(-7, 8),
+                      range(1, 6), range(-7, 8), range(-7, 8)) for task in ("add", "subtract")],
+            Variant("multiply", range(1, 7), range(-7, 8), range(1, 7), range(-7, 8))),
+        "Factor Simple Quadratics": ParameterSpace(
+            "_build_factoring_quadratic",
+            # (x - r1)(x - r2) and (x - r2)(x - r1) are the same trinomial
+            Variant(None, _distinct(2, product(_nonzero(-9, 10), _nonzero(-10, 9)),
+                                    lambda r1, r2: (r1 + r2, r1 * r2)))),
+        "Factoring Binomials": ParameterSpace(
+            "_format_factoring_binomials",
+            Variant("gcf", range(2, 11), parameter_tables.coprime_pairs()),
+            Variant("diff_squares", (1,), range(2, 8), range(2, 8))),
+        "Factoring Quadratics (A>1)": ParameterSpace(
+            "_build_factoring_harder_quadratic",
+            # Swapped or rescaled factors can multiply out to the same trinomial
+            Variant(None, _distinct(4, product(range(2, 5), _nonzero(-5, 5), range(2, 5), _nonzero(-5, 5)),
+                                    lambda a, b, c, d: (a * c, a * d + b * c, b * d)))),
+        "Slope Between Two Points": ParameterSpace(
+            "_build_slope_from_points",
+            Variant(None, parameter_tables.distinct_points())),
+        "Evaluating Functions": ParameterSpace(
+            "_build_evaluate_function",
+            Variant(None, _nonzero(-5, 5), range(-10, 11), range(-5, 6))),
+        "Multi-Step Inequalities": ParameterSpace(
+            "_build_multistep_inequality",
+            # Only a * x - offset reaches the problem, so different (x, offset) can collide
+            Variant(None, _distinct(4, product(_nonzero(-7, 7), range(-5, 6), range(-10, 11), range(1, 6)),
+                                    lambda a, x, b, offset: (a, b, a * x - offset)),
+                    symbols)),
+        "Compound Inequalities": ParameterSpace(
+            "_build_compound_inequality",
+            Variant("conjunction", [(low, low + width) for low in range(-5, 6) for width in range(3, 9)],
+                    range(2, 6), range(-7, 8), ['<', '≤'], ['<', '≤']),
+            Variant("disjunction", range(-5, 1), range(1, 7),
+                    range(2, 6), range(-7, 8), ['<', '≤'], ['>', '≥'])),
+        "Systems of Equations": ParameterSpace(
+            "_build_system_of_equations",
+            Variant(None, range(-5, 6), range(-5, 6), parameter_tables.system_coefficients())),
+        "Equation from Two Points": ParameterSpace(
+            "_build_write_equation_from_points",
+            Variant(None, parameter_tables.non_vertical_points())),
+        "Parallel & Perpendicular Lines": ParameterSpace(
+            "_build_parallel_perpendicular_line",
+            Variant(None, ["parallel", "perpendicular"], _reduced_slopes(), range(-10, 11),
+                    range(-6, 7), range(-6, 7))),
+        "Exponent Rules": ParameterSpace(
+            "_format_exponent_rules",
+            Variant("product", range(2, 7), range(2, 6), range(2, 6)),
+            Variant("power", range(2, 7), range(2, 5), range(2, 5)),
+            Variant("negative", range(2, 7), range(2, 6), (0,)),
+            Variant("quotient", range(2, 7), range(5, 10), range(2, 5))),
+        "Radical Operations": ParameterSpace(
+            "_build_radical_operations",
+            Variant("simplify", range(2, 6), [2, 3, 5, 6, 7], (0,), (0,)),
+            Variant("multiply", range(2, 6), range(2, 4), range(2, 6), [2, 3, 5])),
+        "Graphing Linear Equations": ParameterSpace(
+            "_build_graphing_linear_equation",
+            Variant(None, _nonzero(-3, 3), range(-5, 6))),
+        "Graphing Linear Inequalities": ParameterSpace(
+            "_build_graphing_linear_inequality",
+            Variant(None, _nonzero(-3, 3), range(-5, 6), symbols)),
+        "Graphing Systems of Equations": ParameterSpace(
+            "_build_graphing_system_equations",
+            Variant(None, range(-5, 6), range(-5, 6), parameter_tables.graphing_system_coefficients())),
+        "Graphing Systems of Inequalities": ParameterSpace(
+            "_build_graphing_system_inequalities",
+            Variant(None, parameter_tables.different_slopes(), range(-4, 5), range(-4, 5),
+                    ['>', '≥'], ['<', '≤'])),
+        "Visual Domain and Range": ParameterSpace(
+            "_build_domain_range_graph",
+            Variant("linear", _nonzero(-2, 2), range(-4, 5)),
+            Variant("quadratic", *vertex_form),
+            Variant("absolute_value", *vertex_form),
+            Variant("square_root", *vertex_form),
+            Variant("piecewise_linear", [(x1, x2) for x1 in range(-5, 0) for x2 in range(x1 + 2, 7)],
+                    _nonzero(-2, 2), range(-3, 4), _nonzero(-2, 2), range(-3, 4))),
+    }
+
+def space(topic):
+    """Returns the ParameterSpace of a topic in pg.TOPICS."""
+    return _spaces()[topic]
@@ -0,0 +1,74 @@
+# File: parameter_tables.py
+#
+# Precomputed tables of valid parameters for the generators that used to spin
+# in rejection loops (nonzero determinants, distinct points, coprime pairs,
+# different slopes). Each table lists every valid parameter tuple once,
+# packed into a flat array of small ints, and is built the first time it is
+# used. Sampling a row is a single randrange, so every valid problem is
+# equally likely and there is no worst-case retry latency.
+
+from array import array
+from functools import lru_cache
+from itertools import product
+from math import gcd
+
+class ParameterTable:
+    """Every valid parameter tuple of one kind, packed row by row into an int8 array."""
+
+    def __init__(self, width, rows):
+        self.width = width
+        self.values = array('b')
+        for row in rows:
+            self.values.extend(row)
+        self.size = len(self.values) // width
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, index):
+        start = index * self.width
+        return tuple(self.values[start:start + self.width])
+
+    def sample(self, rng):
+        """Returns one valid tuple, chosen uniformly with rng."""
+        return self[rng.randrange(self.size)]
+
+@lru_cache(maxsize=None)
+def system_coefficients():
+    """(a, b, c, d) in [-4, 4] with ad - bc != 0, for generate_system_of_equations."""
+    values = range(-4, 5)
+    return ParameterTable(4, ((a, b, c, d) for a, b, c, d in product(values, repeat=4)
+                              if a * d - b * c != 0))
+
+@lru_cache(maxsize=None)
+def graphing_system_coefficients():
+    """Nonzero (a, b, c, d) in [-3, 3] with ad - bc != 0, for generate_graphing_system_equations."""
+    values = [v for v in range(-3, 4) if v != 0]
+    return ParameterTable(4, ((a, b, c, d) for a, b, c, d in product(values, repeat=4)
+                              if a * d - b * c != 0))
+
+@lru_cache(maxsize=None)
+def distinct_points():
+    """(x1, y1, x2, y2) in [-5, 5] with two different points, for generate_slope_from_points."""
+    values = range(-5, 6)
+    return ParameterTable(4, ((x1, y1, x2, y2) for x1, y1, x2, y2 in product(values, repeat=4)
+                              if (x1, y1) != (x2, y2)))
+
+@lru_cache(maxsize=None)
+def non_vertical_points():
+    """(x1, y1, x2, y2) in [-5, 5] with x1 != x2, for generate_write_equation_from_points."""
+    values = range(-5, 6)
+    return ParameterTable(4, ((x1, y1, x2, y2) for x1, y1, x2, y2 in product(values, repeat=4)
+                              if x1 != x2))
+
+@lru_cache(maxsize=None)
+def coprime_pairs():
+    """(a, b) in [2, 8] with gcd(a, b) == 1, for the GCF case of generate_factoring_binomials."""
+    values = range(2, 9)
+    return ParameterTable(2, ((a, b) for a, b in product(values, repeat=2) if gcd(a, b) == 1))
+
+@lru_cache(maxsize=None)
+def different_slopes():
+    """Nonzero (m1, m2) in [-2, 2] with m1 != m2, for generate_graphing_system_inequalities."""
+    values = [-2, -1, 1, 2]
+    return ParameterTable(2, ((m1, m2) for m1, m2 in product(values, repeat=2) if m1 != m2))
@@ -0,0 +1,148 @@
+# File: plot_spec.py
+#
+# Declarative graphs. The graph builders in problem_generator describe what
+# to draw as a PlotSpec instead of drawing it: the coordinate plane (title,
+# tick step, axis labels, grid), the curves, the shaded regions between
+# them, the points, and whether there is a legend. A spec is a handful of
+# small Python objects and needs neither NumPy nor matplotlib, so a graph
+# problem costs about as much to generate as a text one. render() turns a
+# spec into an image, and is only called for a graph that is being shown:
+# palette PNG or WebP bytes drawn by matplotlib (see raster.py), or an SVG
+# string from svg_render.py, which needs neither NumPy nor matplotlib.
+#
+# The viewport is the fixed [-10, 10] square of coordinate_plane; curves are
+# sampled across it with np.linspace(*X_RANGE) unless they set their own range.
+
+X_RANGE = (-10, 10, 400) # np.linspace arguments: left edge, right edge, samples
+BACKENDS = ("png", "svg", "webp")
+
+# --- Marks ---
+
+def _evaluate(np, kind, params, x_vals):
+    """Returns y for each x of a 'linear' (m, b) curve, or a (h, k, a) vertex-form curve."""
+    if kind == 'linear':
+        m, b = params
+        return m * x_vals + b
+    h, k, a = params
+    if kind == 'quadratic':
+        return a * ((x_vals - h)**2) + k
+    if kind == 'absolute_value':
+        return a * np.abs(x_vals - h) + k
+    if kind == 'square_root':
+        return a * np.sqrt(x_vals - h) + k
+    raise ValueError(f"Unknown curve kind: {kind!r}")
+
+class Curve:
+    """y = f(x) sampled over x_range (from x_from on, if set), drawn with ax.plot(x, y, fmt, **style)."""
+
+    __slots__ = ('kind', 'params', 'x_range', 'x_from', 'fmt', 'style')
+
+    def __init__(self, kind, params, x_range=X_RANGE, x_from=None, fmt=None, **style):
+        self.kind = kind
+        self.params = params
+        self.x_range = x_range
+        self.x_from = x_from
+        self.fmt = fmt
+        self.style = style
+
+    def x_values(self, np):
+        x_vals = np.linspace(*self.x_range)
+        if self.x_from is not None:
+            x_vals = x_vals[x_vals >= self.x_from] # e.g. a square root starts at its vertex
+        return x_vals
+
+    def y_values(self, np, x_vals):
+        return _evaluate(np, self.kind, self.params, x_vals)
+
+    def draw(self, np, ax):
+        x_vals = self.x_values(np)
+        fmt = (self.fmt,) if self.fmt else ()
+        ax.plot(x_vals, self.y_values(np, x_vals), *fmt, **self.style)
+
+class Region:
+    """The area between lower and upper (a Curve or a constant y); with where_above, only where upper > lower."""
+
+    __slots__ = ('lower', 'upper', 'where_above', 'style')
+
+    def __init__(self, lower, upper, where_above=False, **style):
+        self.lower = lower
+        self.upper = upper
+        self.where_above = where_above
+        self.style = style
+
+    def draw(self, np, ax):
+        curve = self.lower if isinstance(self.lower, Curve) else self.upper
+        x_vals = curve.x_values(np)
+        lower, upper = (bound.y_values(np, x_vals) if isinstance(bound, Curve) else bound
+                        for bound in (self.lower, self.upper))
+        style = dict(self.style)
+        if self.where_above:
+            style['where'] = upper > lower
+        ax.fill_between(x_vals, lower, upper, **style)
+
+class Point:
+    """A single marker, drawn with ax.plot(x, y, fmt, **style)."""
+
+    __slots__ = ('x', 'y', 'fmt', 'style')
+
+    def __init__(self, x, y, fmt, **style):
+        self.x = x
+        self.y = y
+        self.fmt = fmt
+        self.style = style
+
+    def draw(self, np, ax):
+        ax.plot(self.x, self.y, self.fmt, **self.style)
+
+# --- Specs ---
+
+class PlotSpec:
+    """A whole graph: the plane's style (new_plane arguments) plus its curves, regions and points."""
+
+    # No __slots__: instrumentation tags a spec with its topic, as it did figures
+
+    def __init__(self, title="Correct Graph", tick_step=1, xlabel=None, ylabel=None, grid_linewidth=None):
+        self.plane = {"title": title, "tick_step": tick_step, "xlabel": xlabel, "ylabel": ylabel,
+                      "grid_linewidth": grid_linewidth}
+        self.curves = []
+        self.regions = []
+        self.points = []
+        self.legend = False
+
+    def curve(self, kind, *params, **options):
+        """Adds a curve (see Curve) and returns it, so regions can refer to it."""
+        curve = Curve(kind, params, **options)
+        self.curves.append(curve)
+        return curve
+
+    def region(self, lower, upper, where_above=False, **style):
+        self.regions.append(Region(lower, upper, where_above, **style))
+
+    def point(self, x, y, fmt, **style):
+        self.points.append(Point(x, y, fmt, **style))
+
+    def to_figure(self, dpi=None):
+        """Draws the spec over a new coordinate plane (at the plane's DPI by default) and returns the figure.
+
+        The figure is tracked by figure_manager.
+        """
+        import numpy as np
+        from coordinate_plane import new_plane
+
+        fig, ax = new_plane(**self.plane, **({"dpi": dpi} if dpi else {}))
+        # Regions are collections and always sit under the lines, whatever the order
+        for mark in self.curves + self.regions + self.points:
+            mark.draw(np, ax)
+        if self.legend:
+            ax.legend()
+        return fig
+
+def render(spec, backend="png"):
+    """Renders a spec: "png" and "webp" give palette image bytes drawn by matplotlib, "svg" an SVG string."""
+    if backend == "svg":
+        from svg_render import render_svg
+        return render_svg(spec)
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend: {backend!r} (expected one of {BACKENDS})")
+    import raster
+    return raster.render(spec, raster.DEFAULTS[backend]) # The figure only lives for the duration of the call
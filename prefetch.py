@@ -0,0 +1,163 @@
+# File: prefetch.py
+#
+# Ready-to-serve problems, so a click never waits for a generator or a render.
+# A Prefetcher keeps a bounded ring buffer (a deque) of problems per topic,
+# each one already drawn and, for graph topics, already rendered. Worker
+# processes fill the buffers in batches and hand the results back through
+# the process pool's result queue: a batch is just (index, problem image,
+# answer image) triples, since a problem record is only a topic and an index.
+#
+# Buffer sizes follow demand. Every pop adds to an exponentially decaying
+# count of recent pops for its topic (half-life DEMAND_HALF_LIFE seconds),
+# and a topic's target size is that count clamped to [MIN_BUFFER, MAX_BUFFER],
+# so topics a class is working on are kept deep and the rest stay shallow.
+# When a buffer is empty pop() falls back to generating in-process.
+#
+# Spawned workers import the main script, so one that builds a window or
+# starts a server at import time must do that only under __main__ (like
+# main.py), or use processes=False to fill the buffers from a thread.
+
+import atexit
+import math
+import multiprocessing
+import os
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from problems import TOPIC_NAMES, Problem
+from seeding import make_rng
+
+MIN_BUFFER = 2
+MAX_BUFFER = 32
+MAX_BATCH = 8 # Problems per worker task
+DEMAND_HALF_LIFE = 60.0 # Seconds
+IMAGE_CACHE_SIZE = 256 # Images of popped problems, kept until they are shown
+
+def _produce(topic, seed, batch, count, backend):
+    """Worker task: draws count problems of topic and renders their graphs with backend (None: don't)."""
+    rng = make_rng(seed, "prefetch", topic, batch)
+    produced = []
+    for _ in range(count):
+        record = Problem.generate(topic, rng)
+        images = (None, None)
+        if backend is not None:
+            images = tuple(record.part(which, backend) if graph else None
+                           for which, graph in enumerate((record.problem_is_graph, record.answer_is_graph)))
+        produced.append((record.index, images))
+    return produced
+
+class _TopicBuffer:
+    """One topic's ready problems, the batches on their way, and its recent demand."""
+
+    __slots__ = ('ready', 'in_flight', 'batches', 'demand', 'demand_time', 'hits', 'misses')
+
+    def __init__(self):
+        self.ready = deque(maxlen=MAX_BUFFER) # (index, images), oldest first
+        self.in_flight = 0
+        self.batches = 0
+        self.demand = 0.0
+        self.demand_time = time.monotonic()
+        self.hits = 0
+        self.misses = 0
+
+    def recent_demand(self, now):
+        """The decayed pop count as of now."""
+        return self.demand * 0.5 ** ((now - self.demand_time) / DEMAND_HALF_LIFE)
+
+    def target(self, now):
+        return min(max(math.ceil(self.recent_demand(now)), MIN_BUFFER), MAX_BUFFER)
+
+class Prefetcher:
+    """Per-topic buffers of pre-generated (and pre-rendered) problems, refilled by worker processes."""
+
+    def __init__(self, backend="svg", workers=None, seed=None, topics=TOPIC_NAMES, processes=True):
+        self.backend = backend
+        self.seed = random.randrange(2**63) if seed is None else seed
+        workers = workers or max(os.cpu_count() // 2, 1)
+        if processes:
+            self.pool = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"))
+        else:
+            self.pool = ThreadPoolExecutor(workers, thread_name_prefix="prefetch")
+        self.buffers = {topic: _TopicBuffer() for topic in TOPIC_NAMES}
+        self.images = {} # (topic_id, index, which) -> image of a popped problem, oldest first
+        self.lock = threading.Lock()
+        self.closed = False
+        atexit.register(self.close)
+        for topic in topics: # Every topic starts with MIN_BUFFER problems on the way
+            self._refill(topic)
+
+    def close(self):
+        """Stops the workers; later pops generate in-process."""
+        self.closed = True
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+    def pop(self, topic):
+        """Returns the next problem record for topic; its graphs, if any, are already rendered."""
+        buffer = self.buffers[topic]
+        now = time.monotonic()
+        with self.lock:
+            buffer.demand = buffer.recent_demand(now) + 1
+            buffer.demand_time = now
+            entry = buffer.ready.popleft() if buffer.ready else None
+            if entry is not None:
+                buffer.hits += 1
+            else:
+                buffer.misses += 1
+        self._refill(topic)
+
+        if entry is None: # Nothing ready: generate it here, like without a prefetcher
+            return Problem.generate(topic)
+        index, images = entry
+        record = Problem.at(topic, index)
+        with self.lock:
+            for which, image in enumerate(images):
+                if image is not None:
+                    self.images[record.topic_id, index, which] = image
+            while len(self.images) > IMAGE_CACHE_SIZE:
+                del self.images[next(iter(self.images))]
+        return record
+
+    def image(self, record, which):
+        """Returns the pre-rendered graph of a popped problem's part, or None if there is none."""
+        with self.lock:
+            return self.images.get((record.topic_id, record.index, which))
+
+    def _refill(self, topic):
+        """Sends a batch to the workers if the buffer and what's on its way are below target."""
+        buffer = self.buffers[topic]
+        with self.lock:
+            if self.closed:
+                return
+            count = min(buffer.target(time.monotonic()) - len(buffer.ready) - buffer.in_flight, MAX_BATCH)
+            if count <= 0:
+                return
+            buffer.in_flight += count
+            buffer.batches += 1
+            batch = buffer.batches
+        try:
+            future = self.pool.submit(_produce, topic, self.seed, batch, count, self.backend)
+        except RuntimeError: # The pool was shut down meanwhile
+            return
+        future.add_done_callback(lambda done: self._arrived(topic, count, done))
+
+    def _arrived(self, topic, count, future):
+        """Runs when a batch is done: moves it into the buffer and tops up again."""
+        buffer = self.buffers[topic]
+        with self.lock:
+            buffer.in_flight -= count
+            if not future.cancelled() and future.exception() is None:
+                buffer.ready.extend(future.result())
+        if not future.cancelled() and future.exception() is None:
+            self._refill(topic)
+
+    def stats(self):
+        """Returns one dict per topic that has been used: buffer level, target, demand, hits and misses."""
+        now = time.monotonic()
+        with self.lock:
+            return [{"topic": topic, "ready": len(buffer.ready), "in_flight": buffer.in_flight,
+                     "target": buffer.target(now), "demand": round(buffer.recent_demand(now), 2),
+                     "hits": buffer.hits, "misses": buffer.misses}
+                    for topic, buffer in self.buffers.items() if buffer.hits or buffer.misses]
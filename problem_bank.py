@@ -0,0 +1,241 @@
+# File: problem_bank.py
+#
+# Pre-generated problems on disk, served without generating anything. A bank
+# holds count draws of every topic, made by the topic's generator (so it
+# has the same mix of problems as clicking), stored per topic as a
+# struct-of-arrays: one column per generator parameter, int8 or int16 as
+# the values need, plus the variant (uint8) and the problem's index in its
+# parameter space (uint32). String parameters (labels, inequality symbols)
+# are stored as codes into a small per-topic table. Rows are sorted into
+# LEVELS difficulty thirds per topic, by the sum of the absolute values of
+# their integer parameters, and the header records where each level starts.
+#
+# Opening a bank maps the file and reads the JSON header; the columns are
+# memoryviews into the map, so nothing is read until a row is used. Serving
+# a random problem is one randrange and reading one row; the text is built
+# by the generator's own _build_* / _format_* function from the stored
+# parameters, and no object is made for any other row.
+#
+#   bank = ProblemBank("bank.pgb")
+#   row = bank.random("Factor Simple Quadratics", rng, level="hard")
+#   problem, answer = bank.problem("Factor Simple Quadratics", row)
+#
+# Run:  python problem_bank.py build bank.pgb --count 1000000 [--seed 0]
+#       python problem_bank.py show bank.pgb "Factor Simple Quadratics" [--level hard] [-n 5]
+
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+import parameter_spaces
+import problem_generator as pg
+from problems import TOPIC_IDS, TOPIC_NAMES, Problem
+from seeding import as_random, make_rng
+
+MAGIC = b"PGBANK01"
+LEVELS = ("easy", "medium", "hard")
+ALIGN = 8 # Every column starts on a multiple of this
+# The modules that decide which parameters an index stands for
+SPACE_MODULES = ("parameter_spaces.py", "parameter_tables.py")
+
+def space_version():
+    """Returns a short hash of the parameter-space code, so a bank is only read with the spaces it was built for."""
+    digest = hashlib.blake2b(digest_size=6)
+    here = os.path.dirname(os.path.abspath(__file__))
+    for name in SPACE_MODULES:
+        with open(os.path.join(here, name), "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+# --- Building ---
+
+def _int_format(values):
+    """The smallest signed array typecode that holds every value."""
+    low, high = min(values, default=0), max(values, default=0)
+    if -2**7 <= low and high < 2**7:
+        return 'b'
+    if -2**15 <= low and high < 2**15:
+        return 'h'
+    return 'i'
+
+def _topic_columns(topic, count, seed):
+    """Draws count problems of a topic and returns (header entry, [(typecode, values)]) with rows sorted by level."""
+    space = parameter_spaces.space(topic)
+    rng = make_rng(seed, "bank", topic)
+    indices = [Problem.generate(topic, rng).index for _ in range(count)]
+    located = [space.locate(index) for index in indices]
+    rows = [space.variants[number].decode(position) for number, position in located]
+
+    # Easiest third first: rows ordered by the size of their numbers, draw order within a tie
+    scores = [sum(abs(value) for value in row if isinstance(value, int)) for row in rows]
+    order = sorted(range(count), key=scores.__getitem__)
+    levels = [[count * level // len(LEVELS), count * (level + 1) // len(LEVELS)] for level in range(len(LEVELS))]
+
+    widths = [len(variant.decode(0)) for variant in space.variants]
+    values = [] # The table of coded values: strings, and any ints sharing a column with them
+    codes = {}
+    columns = [('I', [indices[i] for i in order]), ('B', [located[i][0] for i in order])]
+    column_kinds = []
+    for j in range(max(widths)):
+        column = [rows[i][j] if j < len(rows[i]) else 0 for i in order]
+        if all(isinstance(value, int) for value in column):
+            columns.append((_int_format(column), column))
+            column_kinds.append("int")
+        else:
+            coded = []
+            for value in column:
+                if value not in codes:
+                    codes[value] = len(values)
+                    values.append(value)
+                coded.append(codes[value])
+            columns.append((_int_format(coded), coded))
+            column_kinds.append("code")
+    entry = {"rows": count, "widths": widths, "values": values, "kinds": column_kinds, "levels": levels}
+    return entry, columns
+
+def build_bank(path, count, seed=0, topics=TOPIC_NAMES):
+    """Draws count problems of each topic and writes them to a bank file at path."""
+    header = {"version": space_version(), "byteorder": sys.byteorder, "seed": seed, "topics": {}}
+    blobs = [] # (topic, column number, bytes), in file order
+    for topic in topics:
+        entry, columns = _topic_columns(topic, count, seed)
+        entry["columns"] = [[typecode, None] for typecode, _ in columns] # Offsets are filled in below
+        header["topics"][topic] = entry
+        blobs.extend((topic, j, array(typecode, column).tobytes()) for j, (typecode, column) in enumerate(columns))
+
+    # Column offsets count from the start of the data, the first aligned position after the header
+    offset = 0
+    for topic, j, blob in blobs:
+        header["topics"][topic]["columns"][j][1] = offset
+        offset = _aligned(offset + len(blob))
+    header_bytes = json.dumps(header).encode()
+    data_start = _aligned(len(MAGIC) + 4 + len(header_bytes))
+
+    with open(path, "wb") as f:
+        f.write(MAGIC + struct.pack("<I", len(header_bytes)) + header_bytes)
+        for topic, j, blob in blobs:
+            f.write(b"\0" * (data_start + header["topics"][topic]["columns"][j][1] - f.tell()))
+            f.write(blob)
+
+def _aligned(offset):
+    return -(-offset // ALIGN) * ALIGN
+
+# --- Serving ---
+
+class _TopicColumns:
+    """One topic's columns in the map, and what is needed to turn a row back into a problem."""
+
+    __slots__ = ('topic_id', 'build', 'rows', 'widths', 'values', 'coded', 'levels', 'index', 'variant', 'params')
+
+    def __init__(self, topic, entry, buffer):
+        self.topic_id = TOPIC_IDS[topic]
+        self.build = getattr(pg, parameter_spaces.space(topic).build)
+        self.rows = entry["rows"]
+        self.widths = entry["widths"]
+        self.values = entry["values"]
+        self.coded = [kind == "code" for kind in entry["kinds"]]
+        self.levels = entry["levels"]
+        columns = [buffer[offset:offset + self.rows * array(typecode).itemsize].cast(typecode)
+                   for typecode, offset in entry["columns"]]
+        self.index, self.variant, self.params = columns[0], columns[1], columns[2:]
+
+class ProblemBank:
+    """A bank file mapped into memory; rows are fetched by (topic, row number)."""
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.map[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a problem bank")
+        length, = struct.unpack_from("<I", self.map, len(MAGIC))
+        self.header = json.loads(self.map[len(MAGIC) + 4:len(MAGIC) + 4 + length])
+        if self.header["byteorder"] != sys.byteorder:
+            raise ValueError(f"{path} was built on a {self.header['byteorder']}-endian machine")
+        if self.header["version"] != space_version():
+            raise ValueError(f"{path} was built for other parameter spaces; build it again")
+        self.buffer = memoryview(self.map)[_aligned(len(MAGIC) + 4 + length):] # The data
+        self.topics = {topic: _TopicColumns(topic, entry, self.buffer)
+                       for topic, entry in self.header["topics"].items()}
+
+    def close(self):
+        """Releases the column views and unmaps the file; rows can't be read after this."""
+        for columns in self.topics.values():
+            for column in (columns.index, columns.variant, *columns.params):
+                column.release()
+        self.topics.clear()
+        self.buffer.release()
+        self.map.close()
+
+    def count(self, topic, level=None):
+        """Rows of a topic, or of one of its LEVELS."""
+        columns = self.topics[topic]
+        if level is None:
+            return columns.rows
+        start, stop = columns.levels[LEVELS.index(level)]
+        return stop - start
+
+    def random(self, topic, rng=None, level=None):
+        """Returns a random row number of a topic (of one level, if given); O(1), nothing else is read."""
+        columns = self.topics[topic]
+        start, stop = (0, columns.rows) if level is None else columns.levels[LEVELS.index(level)]
+        return start + as_random(rng).randrange(stop - start)
+
+    def level(self, topic, row):
+        """Returns the difficulty level of a row."""
+        return next(name for name, (start, stop) in zip(LEVELS, self.topics[topic].levels) if start <= row < stop)
+
+    def params(self, topic, row):
+        """Returns the generator parameters of a row, as parameter_spaces decodes them."""
+        columns = self.topics[topic]
+        width = columns.widths[columns.variant[row]]
+        return tuple(columns.values[column[row]] if coded else column[row]
+                     for column, coded in zip(columns.params[:width], columns.coded))
+
+    def problem(self, topic, row):
+        """Builds a row's (problem, answer) with the generator's own formatting; graphs as PlotSpecs."""
+        return self.topics[topic].build(*self.params(topic, row))
+
+    def record(self, topic, row):
+        """Returns a row as a Problem record (for rendering graphs, grading and no-repeat draws)."""
+        columns = self.topics[topic]
+        return Problem(columns.topic_id, columns.index[row])
+
+    def nbytes(self):
+        """Size of the mapped file."""
+        return len(self.map)
+
+# --- Command line ---
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or read a memory-mapped problem bank.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="draw problems and write a bank")
+    build.add_argument("path")
+    build.add_argument("--count", type=int, required=True, help="problems per topic")
+    build.add_argument("--seed", type=int, default=0)
+    build.add_argument("--topics", nargs="+", default=TOPIC_NAMES, metavar="TOPIC", help="default: every topic")
+    show = commands.add_parser("show", help="print random problems from a bank")
+    show.add_argument("path")
+    show.add_argument("topic")
+    show.add_argument("--level", choices=LEVELS)
+    show.add_argument("-n", type=int, default=5)
+    args = parser.parse_args()
+
+    if args.command == "build":
+        build_bank(args.path, args.count, args.seed, args.topics)
+        print(f"Wrote {args.count:,} problems of {len(args.topics)} topics to {args.path} "
+              f"({os.path.getsize(args.path) / 2**20:,.1f} MB)")
+        return
+    bank = ProblemBank(args.path)
+    for _ in range(args.n):
+        row = bank.random(args.topic, level=args.level)
+        problem, answer = (part if isinstance(part, str) else "[graph]" for part in bank.problem(args.topic, row))
+        print(f"#{row} ({bank.level(args.topic, row)}) {problem}\n  Answer: {answer}\n")
+
+if __name__ == "__main__":
+    main()
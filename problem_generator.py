@@ -1,17 +1,19 @@
 # File: problem_generator.py
-from fractions import Fraction
-import random
+import parameter_tables
+import rational
+from plot_spec import PlotSpec
+from seeding import as_random, problem_rng
+from terms import Terms
 
-def generate_linear_equation():
-    """Generates a two-step linear equation like ax + b = c."""
-    a = random.randint(2, 9)
-    b = random.randint(1, 10)
-    # Choose a simple integer solution for x first
-    x = random.randint(-5, 5)
-    
-    # Calculate c based on a, b, and x
-    c = a * x + b
-    
+# Expression formatters shared by the generators (see terms.py)
+_LINEAR = Terms("x", "") # ax + b
+_LINEAR_XY = Terms("x", "y") # ax + by
+_QUADRATIC = Terms("x^2", "x", "") # ax² + bx + c
+_LINE_FRACTIONS = Terms("x", "", number="fraction") # (m_num, m_den, b_num, b_den)
+_LINE_DECIMALS = Terms("x", "", number=".2f")
+
+def _format_linear_equation(a, b, c, x):
+    """Formats the problem and answer text for ax + b = c."""
     # Ensure b is positive for the initial problem format
     sign = "+" if b > 0 else "-"
     
@@ -19,136 +21,232 @@ def generate_linear_equation():
     answer = f"x = {x}"
     return problem, answer
 
-def generate_simplify_expression():
+def generate_linear_equation(rng=None):
+    """Generates a two-step linear equation like ax + b = c."""
+    return _build_linear_equation(*_draw_linear_equation(as_random(rng)))
+
+def _draw_linear_equation(rng):
+    """Draws the arguments of _build_linear_equation."""
+    a = rng.randint(2, 9)
+    b = rng.randint(1, 10)
+    # Choose a simple integer solution for x first
+    x = rng.randint(-5, 5)
+    
+    return a, b, x
+
+def _build_linear_equation(a, b, x):
+    """Builds ax + b = c from its coefficients and solution."""
+    # Calculate c based on a, b, and x
+    c = a * x + b
+    
+    return _format_linear_equation(a, b, c, x)
+
+def _format_simplify_expression(a, inner, subtracted, simplified):
+    """Formats the problem and answer text for a(bx + d) - cx; the expressions come written."""
+    problem = f"Simplify the expression: {a}({inner}) - {subtracted}"
+    return problem, simplified
+
+def generate_simplify_expression(rng=None):
     """Generates an expression to simplify like 3(2x + 4) - 5x."""
-    a = random.randint(2, 5)
-    b = random.randint(2, 6)
-    c = random.randint(1, 5)
-    d = random.randint(1, 9)
+    return _build_simplify_expression(*_draw_simplify_expression(as_random(rng)))
 
+def _draw_simplify_expression(rng):
+    """Draws the arguments of _build_simplify_expression."""
+    a = rng.randint(2, 5)
+    b = rng.randint(2, 6)
+    c = rng.randint(1, 5)
+    d = rng.randint(1, 9)
+
+    return a, b, c, d
+
+def _build_simplify_expression(a, b, c, d):
+    """Builds a(bx + d) - cx and its simplified form."""
     # Simplified form coefficients
     final_x_coeff = a * b - c
     final_const = a * d
 
-    problem = f"Simplify the expression: {a}({b}x + {d}) - {c}x"
-    answer = f"{final_x_coeff}x + {final_const}"
+    return _format_simplify_expression(a, _LINEAR(b, d), _LINEAR(c, 0), _LINEAR(final_x_coeff, final_const))
+
+def _format_factoring_quadratic(r1, r2, trinomial):
+    """Formats the problem and answer text for x^2 + bx + c = (x - r1)(x - r2), given the trinomial written."""
+    problem = f"Factor the trinomial: {trinomial}"
+    
+    # Format the answer string (x - r1)(x - r2)
+    r1_sign = "-" if r1 > 0 else "+"
+    r2_sign = "-" if r2 > 0 else "+"
+    answer = f"(x {r1_sign} {abs(r1)})(x {r2_sign} {abs(r2)})"
+    
     return problem, answer
 
-def generate_factoring_quadratic():
+def generate_factoring_quadratic(rng=None):
     """Generates a simple quadratic to factor: x^2 + bx + c."""
+    return _build_factoring_quadratic(*_draw_factoring_quadratic(as_random(rng)))
+
+def _draw_factoring_quadratic(rng):
+    """Draws the arguments of _build_factoring_quadratic."""
     # Start with the roots to ensure nice integer factoring
-    r1 = random.randint(-9, 9)
-    r2 = random.randint(-9, 9)
+    r1 = rng.randint(-9, 9)
+    r2 = rng.randint(-9, 9)
     
     # Avoid roots that are zero to keep it a trinomial
     if r1 == 0: r1 = 10
     if r2 == 0: r2 = -10
         
+    return r1, r2
+
+def _build_factoring_quadratic(r1, r2):
+    """Builds x^2 + bx + c from its two roots."""
     # Calculate coefficients b and c for x^2 + bx + c = (x - r1)(x - r2)
     b = -(r1 + r2)
     c = r1 * r2
     
-    # Determine signs for the problem string
-    b_sign = "+" if b > 0 else "-"
-    c_sign = "+" if c > 0 else "-"
-    
-    problem = f"Factor the trinomial: x^2 {b_sign} {abs(b)}x {c_sign} {abs(c)}"
-    
-    # Format the answer string (x - r1)(x - r2)
-    r1_sign = "-" if r1 > 0 else "+"
-    r2_sign = "-" if r2 > 0 else "+"
-    answer = f"(x {r1_sign} {abs(r1)})(x {r2_sign} {abs(r2)})"
-    
+    return _format_factoring_quadratic(r1, r2, _QUADRATIC(1, b, c))
+
+_format_fraction = rational.format_fraction
+
+def _format_slope_from_points(x1, y1, x2, y2, slope_num, slope_den):
+    """Formats the problem and answer text for a slope; den == 0 means vertical."""
+    problem = f"Find the slope between the points ({x1}, {y1}) and ({x2}, {y2})."
+
+    if slope_den == 0:
+        answer = "The slope is undefined (vertical line)."
+    else:
+        answer = f"The slope is {_format_fraction(slope_num, slope_den)}."
+        
     return problem, answer
 
-def generate_slope_from_points():
+def generate_slope_from_points(rng=None):
     """Generates a problem for finding the slope between two points."""
-    # Generate two distinct points (x1, y1) and (x2, y2)
-    x1 = random.randint(-5, 5)
-    y1 = random.randint(-5, 5)
-    x2 = random.randint(-5, 5)
-    y2 = random.randint(-5, 5)
+    return _build_slope_from_points(*_draw_slope_from_points(as_random(rng)))
 
-    # Ensure the points are not the same to avoid a 0/0 slope
-    while x1 == x2 and y1 == y2:
-        x2 = random.randint(-5, 5)
-        y2 = random.randint(-5, 5)
+def _draw_slope_from_points(rng):
+    """Draws the arguments of _build_slope_from_points."""
+    # Pick two distinct points (x1, y1) and (x2, y2); the same point would give a 0/0 slope
+    x1, y1, x2, y2 = parameter_tables.distinct_points().sample(rng)
 
-    problem = f"Find the slope between the points ({x1}, {y1}) and ({x2}, {y2})."
+    return x1, y1, x2, y2
 
+def _build_slope_from_points(x1, y1, x2, y2):
+    """Builds the slope problem for two distinct points."""
     # Calculate the slope and handle the undefined case
     if x1 == x2:
-        answer = "The slope is undefined (vertical line)."
-    else:
-        # To display a nice fraction, we can simplify it
-        # This is a bit more advanced, but makes the answers look cleaner
-        from fractions import Fraction
-        slope = Fraction(y2 - y1, x2 - x1)
-        answer = f"The slope is {slope}."
-        
+        return _format_slope_from_points(x1, y1, x2, y2, 0, 0)
+
+    # To display a nice fraction, we can simplify it
+    # This is a bit more advanced, but makes the answers look cleaner
+    slope_num, slope_den = rational.reduce(y2 - y1, x2 - x1)
+    return _format_slope_from_points(x1, y1, x2, y2, slope_num, slope_den)
+
+def _format_evaluate_function(function, x_val, answer_val):
+    """Formats the problem and answer text for evaluating f(x) = mx + b, given mx + b written."""
+    problem = f"Given f(x) = {function}, find the value of f({x_val})."
+    answer = f"f({x_val}) = {answer_val}"
+    
     return problem, answer
 
-def generate_evaluate_function():
+def generate_evaluate_function(rng=None):
     """Generates a problem for evaluating a linear function."""
-    m = random.randint(-5, 5)
-    b = random.randint(-10, 10)
-    x_val = random.randint(-5, 5)
+    return _build_evaluate_function(*_draw_evaluate_function(as_random(rng)))
+
+def _draw_evaluate_function(rng):
+    """Draws the arguments of _build_evaluate_function."""
+    m = rng.randint(-5, 5)
+    b = rng.randint(-10, 10)
+    x_val = rng.randint(-5, 5)
 
     # Avoid m=0 to keep it interesting
     if m == 0: m = 1
 
-    # Format b for the function string
-    b_sign = "+" if b >= 0 else "-"
-    
-    problem = f"Given f(x) = {m}x {b_sign} {abs(b)}, find the value of f({x_val})."
-    
+    return m, b, x_val
+
+def _build_evaluate_function(m, b, x_val):
+    """Builds f(x) = mx + b evaluated at x_val."""
     # Calculate the answer
     answer_val = m * x_val + b
-    answer = f"f({x_val}) = {answer_val}"
+    
+    return _format_evaluate_function(_LINEAR(m, b), x_val, answer_val)
+
+def _format_multistep_equation_fractions(x, a_num, a_den, binomial, d_num, d_den):
+    """Formats the problem and answer text for a(bx + c) = d with a = a_num/a_den and bx + c written."""
+    # Format the fraction for display (a is shown unreduced, d reduced)
+    a_str = f"{a_num}/{a_den}" if a_den != 1 else str(a_num)
+    
+    problem = f"Solve for x: {a_str}({binomial}) = {_format_fraction(d_num, d_den)}"
+    answer = f"x = {x}"
     
     return problem, answer
 
-def generate_multistep_equation_fractions():
+def generate_multistep_equation_fractions(rng=None):
     """Generates a multi-step equation with distribution and fractions."""
+    return _build_multistep_equation_fractions(*_draw_multistep_equation_fractions(as_random(rng)))
+
+def _draw_multistep_equation_fractions(rng):
+    """Draws the arguments of _build_multistep_equation_fractions."""
     # Work backwards from an integer solution to keep it clean
-    x = random.randint(-6, 6)
+    x = rng.randint(-6, 6)
     
     # Coefficients for a(bx + c) = d
-    a_num = random.randint(1, 5)
-    a_den = random.randint(1, 5)
-    a = Fraction(a_num, a_den)
+    a_num = rng.randint(1, 5)
+    a_den = rng.randint(1, 5)
 
-    b = random.randint(2, 5)
-    c = random.randint(-10, 10)
+    b = rng.randint(2, 5)
+    c = rng.randint(-10, 10)
     
-    # Calculate d based on the other values
-    d = a * (b * x + c)
+    return x, a_num, a_den, b, c
+
+def _build_multistep_equation_fractions(x, a_num, a_den, b, c):
+    """Builds a(bx + c) = d from its solution and coefficients."""
+    # Calculate d based on the other values: d = a_num * (bx + c) / a_den
+    d_num, d_den = rational.reduce(a_num * (b * x + c), a_den)
     
-    # Format the fraction for display
-    a_str = f"{a_num}/{a_den}" if a_den != 1 else str(a_num)
+    return _format_multistep_equation_fractions(x, a_num, a_den, _LINEAR(b, c), d_num, d_den)
+
+def _format_multistep_inequality(expression, c, x, symbol, final_symbol):
+    """Formats the problem and answer text for ax + b (symbol) c; ax + b and the boundary (c - b) / a come written."""
+    problem = f"Solve the inequality: {expression} {symbol} {c}"
     
-    problem = f"Solve for x: {a_str}({b}x + {c}) = {d}"
-    answer = f"x = {x}"
+    # Create the inequality part of the answer
+    inequality_notation = f"x {final_symbol} {x}"
     
+    # Determine the interval notation based on the final symbol
+    if final_symbol == '>':
+        interval_notation = f"({x}, ∞)"
+    elif final_symbol == '≥':
+        interval_notation = f"[{x}, ∞)"
+    elif final_symbol == '<':
+        interval_notation = f"(-∞, {x})"
+    else: # Must be '≤'
+        interval_notation = f"(-∞, {x}]"
+            
+    # Combine both notations for the final answer
+    answer = f"Inequality: {inequality_notation} | Interval: {interval_notation}"
+
     return problem, answer
 
-def generate_multistep_inequality():
+def generate_multistep_inequality(rng=None):
     """Generates a multi-step inequality where the sign might flip."""
+    return _build_multistep_inequality(*_draw_multistep_inequality(as_random(rng)))
+
+def _draw_multistep_inequality(rng):
+    """Draws the arguments of _build_multistep_inequality."""
     # Structure: ax + b > c
-    a = random.randint(-7, 7)
-    x = random.randint(-5, 5)
-    b = random.randint(-10, 10)
+    a = rng.randint(-7, 7)
+    x = rng.randint(-5, 5)
+    b = rng.randint(-10, 10)
     
     if a == 0: a = -1
 
-    symbol = random.choice(['<', '>', '≤', '≥'])
+    symbol = rng.choice(['<', '>', '≤', '≥'])
+    offset = rng.randint(1,5)
     
-    c = a * x + b - random.randint(1,5)
-    
-    b_sign = "+" if b >= 0 else "-"
-    problem = f"Solve the inequality: {a}x {b_sign} {abs(b)} {symbol} {c}"
-    
-    # --- MODIFIED SECTION ---
+    return a, x, b, offset, symbol
+
+def _build_multistep_inequality(a, x, b, offset, symbol):
+    """Builds ax + b (symbol) c where c sits offset below the boundary value."""
+    c = a * x + b - offset
+
+    # The solution's boundary is (c - b) / a, which is x - offset / a, not x itself
+    boundary_num, boundary_den = rational.reduce(c - b, a)
     
     # Determine the correct final symbol, flipping if 'a' is negative
     final_symbol = symbol
@@ -158,310 +256,364 @@ def generate_multistep_inequality():
         elif symbol == '≤': final_symbol = '≥'
         elif symbol == '≥': final_symbol = '≤'
     
-    # Create the inequality part of the answer
-    inequality_notation = f"x {final_symbol} {x}"
-    
-    # Determine the interval notation based on the final symbol
-    if final_symbol == '>':
-        interval_notation = f"({x}, ∞)"
-    elif final_symbol == '≥':
-        interval_notation = f"[{x}, ∞)"
-    elif final_symbol == '<':
-        interval_notation = f"(-∞, {x})"
-    else: # Must be '≤'
-        interval_notation = f"(-∞, {x}]"
-            
-    # Combine both notations for the final answer
-    answer = f"Inequality: {inequality_notation} | Interval: {interval_notation}"
+    return _format_multistep_inequality(_LINEAR(a, b), c, _format_fraction(boundary_num, boundary_den),
+                                        symbol, final_symbol)
+
+def _format_compound_inequality(task, x_lower, x_upper, expression, s1, s2, left_bound, right_bound):
+    """Formats the problem and answer text for a conjunction or disjunction of mx + c, given written."""
+    if task == "conjunction":
+        problem = f"Solve: {left_bound} {s1} {expression} {s2} {right_bound}"
+        
+        # Format the Answer
+        inequality_notation = f"{x_lower} {s1} x {s2} {x_upper}"
+        left_bracket = '(' if s1 == '<' else '['
+        right_bracket = ')' if s2 == '<' else ']'
+        interval_notation = f"{left_bracket}{x_lower}, {x_upper}{right_bracket}"
 
+    else:
+        # Format the problem
+        problem = f"Solve: {expression} {s1} {left_bound} OR {expression} {s2} {right_bound}"
+
+        # Format the Answer
+        inequality_notation = f"x {s1} {x_lower} OR x {s2} {x_upper}"
+        left_bracket = ')' if s1 == '<' else ']'
+        right_bracket = '(' if s2 == '>' else '['
+        interval_notation = f"(-∞, {x_lower}{left_bracket} U {right_bracket}{x_upper}, ∞)"
+
+    answer = f"Inequality: {inequality_notation} | Interval: {interval_notation}"
     return problem, answer
 
-def generate_compound_inequality():
+def generate_compound_inequality(rng=None):
     """Generates both conjunction and disjunction compound inequalities."""
+    return _build_compound_inequality(*_draw_compound_inequality(as_random(rng)))
+
+def _draw_compound_inequality(rng):
+    """Draws the arguments of _build_compound_inequality."""
     # Randomly choose which type of inequality to create
-    task = random.choice(["conjunction", "disjunction"])
+    task = rng.choice(["conjunction", "disjunction"])
     
     # --- Part 1: Conjunction ("and") Problems ---
     # Example: -5 < 2x + 1 < 11
     if task == "conjunction":
         # Start with a clean integer solution, e.g., -2 < x <= 4
-        x_lower = random.randint(-5, 5)
-        x_upper = x_lower + random.randint(3, 8)
+        x_lower = rng.randint(-5, 5)
+        x_upper = x_lower + rng.randint(3, 8)
 
         # Choose the coefficients for the expression mx + c
-        m = random.randint(2, 5)
-        c = random.randint(-7, 7)
-        
-        s1 = random.choice(['<', '≤'])
-        s2 = random.choice(['<', '≤'])
-        
-        # Calculate the outside bounds of the problem
-        left_bound = m * x_lower + c
-        right_bound = m * x_upper + c
+        m = rng.randint(2, 5)
+        c = rng.randint(-7, 7)
         
-        c_sign = "+" if c >= 0 else "-"
-        problem = f"Solve: {left_bound} {s1} {m}x {c_sign} {abs(c)} {s2} {right_bound}"
-        
-        # Format the Answer
-        inequality_notation = f"{x_lower} {s1} x {s2} {x_upper}"
-        left_bracket = '(' if s1 == '<' else '['
-        right_bracket = ')' if s2 == '<' else ']'
-        interval_notation = f"{left_bracket}{x_lower}, {x_upper}{right_bracket}"
-        answer = f"Inequality: {inequality_notation} | Interval: {interval_notation}"
+        s1 = rng.choice(['<', '≤'])
+        s2 = rng.choice(['<', '≤'])
 
     # --- Part 2: Disjunction ("or") Problems ---
     # Example: 3x - 1 < -7 OR 3x - 1 > 5
     else: 
         # Start with a clean integer solution, e.g., x < -2 OR x > 2
-        x_lower = random.randint(-5, 0)
-        x_upper = random.randint(1, 6)
+        x_lower = rng.randint(-5, 0)
+        x_upper = rng.randint(1, 6)
 
-        m = random.randint(2, 5) # Using positive m for simplicity
-        c = random.randint(-7, 7)
-        
-        s1 = random.choice(['<', '≤'])
-        s2 = random.choice(['>', '≥'])
+        m = rng.randint(2, 5) # Using positive m for simplicity
+        c = rng.randint(-7, 7)
         
-        # Calculate the bounds
-        left_bound = m * x_lower + c
-        right_bound = m * x_upper + c
-        
-        # Format the problem
-        c_sign = "+" if c >= 0 else "-"
-        expression = f"{m}x {c_sign} {abs(c)}"
-        problem = f"Solve: {expression} {s1} {left_bound} OR {expression} {s2} {right_bound}"
-
-        # Format the Answer
-        inequality_notation = f"x {s1} {x_lower} OR x {s2} {x_upper}"
-        left_bracket = ')' if s1 == '<' else ']'
-        right_bracket = '(' if s2 == '>' else '['
-        interval_notation = f"(-∞, {x_lower}{left_bracket} U {right_bracket}{x_upper}, ∞)"
-        answer = f"Inequality: {inequality_notation} | Interval: {interval_notation}"
+        s1 = rng.choice(['<', '≤'])
+        s2 = rng.choice(['>', '≥'])
             
+    return task, x_lower, x_upper, m, c, s1, s2
+
+def _build_compound_inequality(task, x_lower, x_upper, m, c, s1, s2):
+    """Builds a conjunction or disjunction from its solution bounds and mx + c."""
+    # Calculate the outside bounds of the problem
+    left_bound = m * x_lower + c
+    right_bound = m * x_upper + c
+
+    return _format_compound_inequality(task, x_lower, x_upper, _LINEAR(m, c), s1, s2, left_bound, right_bound)
+
+def _format_system_of_equations(left1, left2, e, f, x, y):
+    """Formats the problem and answer text for ax + by = e, cx + dy = f; the left sides come written."""
+    eq1 = f"{left1} = {e}"
+    eq2 = f"{left2} = {f}"
+    
+    problem = f"Solve the system of equations:\n{eq1}\n{eq2}"
+    answer = f"({x}, {y})"
+    
     return problem, answer
 
-def generate_system_of_equations():
+def generate_system_of_equations(rng=None):
     """Generates a 2x2 system of linear equations with a unique integer solution."""
+    return _build_system_of_equations(*_draw_system_of_equations(as_random(rng)))
+
+def _draw_system_of_equations(rng):
+    """Draws the arguments of _build_system_of_equations."""
     # Start with a clean integer solution
-    x = random.randint(-5, 5)
-    y = random.randint(-5, 5)
-    
-    # Generate random coefficients for two equations: ax + by = e, cx + dy = f
-    # Ensure the determinant (ad-bc) is not zero, which guarantees a unique solution
-    a, b, c, d = 0, 0, 0, 0
-    while (a * d - b * c) == 0:
-        a = random.randint(-4, 4)
-        b = random.randint(-4, 4)
-        c = random.randint(-4, 4)
-        d = random.randint(-4, 4)
-        # Avoid all zero coefficients
-        if a==0 and b==0 and c==0 and d==0: a=1
+    x = rng.randint(-5, 5)
+    y = rng.randint(-5, 5)
+    
+    # Pick random coefficients for two equations: ax + by = e, cx + dy = f
+    # The table only holds a nonzero determinant (ad-bc), which guarantees a unique solution
+    a, b, c, d = parameter_tables.system_coefficients().sample(rng)
+
+    return x, y, a, b, c, d
 
+def _build_system_of_equations(x, y, a, b, c, d):
+    """Builds ax + by = e, cx + dy = f from its solution and coefficients."""
     # Calculate the constants e and f
     e = a * x + b * y
     f = c * x + d * y
     
-    # Build the problem string nicely, handling signs and coefficients
-    eq1 = f"{a}x + {b}y = {e}".replace('+ -', '- ').replace('1x', 'x')
-    eq2 = f"{c}x + {d}y = {f}".replace('+ -', '- ').replace('1x', 'x')
+    return _format_system_of_equations(_LINEAR_XY(a, b), _LINEAR_XY(c, d), e, f, x, y)
+
+def _format_write_equation_from_points(x1, y1, x2, y2, line):
+    """Formats the problem and answer text for the line y = mx + b through two points, given mx + b written."""
+    problem = f"Write the equation of the line that passes through the points ({x1}, {y1}) and ({x2}, {y2})."
     
-    problem = f"Solve the system of equations:\n{eq1}\n{eq2}"
-    answer = f"({x}, {y})"
+    answer = f"y = {line}"
     
     return problem, answer
 
-def generate_write_equation_from_points():
+def generate_write_equation_from_points(rng=None):
     """Generates a problem for writing a linear equation from two points."""
-    # Generate two distinct points (x1, y1) and (x2, y2)
-    x1 = random.randint(-5, 5)
-    y1 = random.randint(-5, 5)
-    x2 = random.randint(-5, 5)
-    y2 = random.randint(-5, 5)
-    
-    # Ensure x-coordinates are different to avoid vertical lines for now
-    while x1 == x2:
-        x2 = random.randint(-5, 5)
+    return _build_write_equation_from_points(*_draw_write_equation_from_points(as_random(rng)))
 
-    problem = f"Write the equation of the line that passes through the points ({x1}, {y1}) and ({x2}, {y2})."
-    
+def _draw_write_equation_from_points(rng):
+    """Draws the arguments of _build_write_equation_from_points."""
+    # Pick two points (x1, y1) and (x2, y2)
+    # The x-coordinates are always different to avoid vertical lines for now
+    x1, y1, x2, y2 = parameter_tables.non_vertical_points().sample(rng)
+
+    return x1, y1, x2, y2
+
+def _build_write_equation_from_points(x1, y1, x2, y2):
+    """Builds the line-through-two-points problem for x1 != x2."""
     # Calculate slope and y-intercept
-    m = Fraction(y2 - y1, x2 - x1)
-    b = y1 - m * x1
+    dx = x2 - x1
+    dy = y2 - y1
+    m_num, m_den = rational.reduce(dy, dx)
+    # b = y1 - m * x1 = (y1 * dx - dy * x1) / dx
+    b_num, b_den = rational.reduce(y1 * dx - dy * x1, dx)
     
-    # Format the answer string y = mx + b
-    m_str = f"{m.numerator}/{m.denominator}" if m.denominator != 1 else str(m.numerator)
-    b_sign = "+" if b >= 0 else "-"
-    answer = f"y = {m_str}x {b_sign} {abs(b)}"
+    return _format_write_equation_from_points(x1, y1, x2, y2, _LINE_FRACTIONS(m_num, m_den, b_num, b_den))
+
+def _format_parallel_perpendicular_line(task, m_num, b, px, py, line, new_line):
+    """Formats the problem and answer text for a parallel or perpendicular line, given both mx + b written."""
+    if task == "perpendicular" and m_num == 0:
+        # Perpendicular line is vertical, cannot be in y=mx+b form
+        problem = f"Write the equation of the line perpendicular to y = {b} that passes through ({px}, {py})."
+        answer = f"x = {px}"
+        return problem, answer
+
+    problem = f"Write the equation of the line {task} to y = {line} that passes through ({px}, {py})."
+    answer = f"y = {new_line}"
     
     return problem, answer
 
-def generate_parallel_perpendicular_line():
+def generate_parallel_perpendicular_line(rng=None):
     """Generates a problem for finding a parallel or perpendicular line."""
+    return _build_parallel_perpendicular_line(*_draw_parallel_perpendicular_line(as_random(rng)))
+
+def _draw_parallel_perpendicular_line(rng):
+    """Draws the arguments of _build_parallel_perpendicular_line."""
     # Original line: y = mx + b
-    m = Fraction(random.randint(-5, 5), random.randint(1, 5))
-    b = random.randint(-10, 10)
+    m_num, m_den = rng.randint(-5, 5), rng.randint(1, 5)
+    b = rng.randint(-10, 10)
     
     # Point the new line passes through
-    px = random.randint(-6, 6)
-    py = random.randint(-6, 6)
+    px = rng.randint(-6, 6)
+    py = rng.randint(-6, 6)
     
     # Choose between parallel and perpendicular
-    task = random.choice(["parallel", "perpendicular"])
+    task = rng.choice(["parallel", "perpendicular"])
     
+    return task, m_num, m_den, b, px, py
+
+def _build_parallel_perpendicular_line(task, m_num, m_den, b, px, py):
+    """Builds the parallel or perpendicular line problem for y = (m_num/m_den)x + b."""
+    m_num, m_den = rational.reduce(m_num, m_den)
+
     # Determine the new slope
     if task == "parallel":
-        new_m = m
+        new_m_num, new_m_den = m_num, m_den
     else: # Perpendicular
-        if m == 0: # Handle horizontal original line
-            # Perpendicular line is vertical, cannot be in y=mx+b form
-            problem = f"Write the equation of the line perpendicular to y = {b} that passes through ({px}, {py})."
-            answer = f"x = {px}"
-            return problem, answer
-        new_m = -1 / m
+        if m_num == 0: # Handle horizontal original line
+            return _format_parallel_perpendicular_line(task, 0, b, px, py, None, None)
+        new_m_num, new_m_den = rational.reduce(-m_den, m_num) # -1 / m
         
     # Calculate the new y-intercept: b = y - mx
-    new_b = py - new_m * px
-    
-    # Format problem and answer strings
-    m_str = f"{m.numerator}/{m.denominator}" if m.denominator != 1 else str(m.numerator)
-    b_sign = "+" if b >= 0 else "-"
-    
-    problem = f"Write the equation of the line {task} to y = {m_str}x {b_sign} {abs(b)} that passes through ({px}, {py})."
-    
-    new_m_str = f"{new_m.numerator}/{new_m.denominator}" if new_m.denominator != 1 else str(new_m.numerator)
-    new_b_sign = "+" if new_b >= 0 else "-"
-    
-    answer = f"y = {new_m_str}x {new_b_sign} {abs(new_b)}"
+    new_b_num, new_b_den = rational.reduce(py * new_m_den - new_m_num * px, new_m_den)
     
+    return _format_parallel_perpendicular_line(task, m_num, b, px, py, _LINE_FRACTIONS(m_num, m_den, b, 1),
+                                               _LINE_FRACTIONS(new_m_num, new_m_den, new_b_num, new_b_den))
+
+def _format_factoring_binomials(task, g, a, b):
+    """Formats the problem and answer text for a GCF or difference of squares binomial."""
+    if task == "diff_squares":
+        problem = f"Factor the binomial: {a*a}x² - {b*b}"
+        answer = f"({a}x - {b})({a}x + {b})"
+    else: # GCF
+        problem = f"Factor the binomial: {g*a}x + {g*b}"
+        answer = f"{g}({a}x + {b})"
     return problem, answer
 
-def generate_factoring_binomials():
+def generate_factoring_binomials(rng=None):
     """Generates a problem for factoring a binomial, like GCF or Difference of Squares."""
-    task = random.choice(["gcf", "diff_squares"])
+    return _format_factoring_binomials(*_draw_factoring_binomials(as_random(rng)))
+
+def _draw_factoring_binomials(rng):
+    """Draws the arguments of _format_factoring_binomials."""
+    task = rng.choice(["gcf", "diff_squares"])
     
     if task == "diff_squares":
         # Format: a^2 * x^2 - b^2 = (ax - b)(ax + b)
-        a = random.randint(2, 7)
-        b = random.randint(2, 7)
-        
-        problem = f"Factor the binomial: {a*a}x² - {b*b}"
-        answer = f"({a}x - {b})({a}x + {b})"
+        a = rng.randint(2, 7)
+        b = rng.randint(2, 7)
+        return task, 1, a, b
         
     else: # GCF
         # Format: g*a*x + g*b = g(ax + b)
-        g = random.randint(2, 10) # Greatest Common Factor
-        a = random.randint(2, 8)
-        b = random.randint(2, 8)
+        g = rng.randint(2, 10) # Greatest Common Factor
         
-        # Ensure a and b don't share a common factor with each other
-        from math import gcd
-        while gcd(a, b) != 1:
-            a = random.randint(2, 8)
+        # a and b never share a common factor with each other
+        a, b = parameter_tables.coprime_pairs().sample(rng)
 
-        problem = f"Factor the binomial: {g*a}x + {g*b}"
-        answer = f"{g}({a}x + {b})"
-        
+        return task, g, a, b
+
+def _format_polynomial_operations(task, poly1, poly2, answer):
+    """Formats the problem and answer text from the written polynomials; binomials when multiplying."""
+    if task == "multiply":
+        problem = f"Multiply the binomials: ({poly1})({poly2})"
+    elif task == "add":
+        problem = f"Add the polynomials: ({poly1}) + ({poly2})"
+    else:
+        problem = f"Subtract the polynomials: ({poly1}) - ({poly2})"
     return problem, answer
 
-def generate_polynomial_operations():
+def generate_polynomial_operations(rng=None):
     """Generates a problem for adding, subtracting, or multiplying polynomials."""
-    task = random.choice(["add", "subtract", "multiply"])
+    return _build_polynomial_operations(*_draw_polynomial_operations(as_random(rng)))
+
+def _draw_polynomial_operations(rng):
+    """Draws the arguments of _build_polynomial_operations."""
+    task = rng.choice(["add", "subtract", "multiply"])
     
     # Generate coefficients for two simple polynomials: P1 = ax^2+bx+c, P2 = dx^2+ex+f
-    a, b, c = random.randint(1, 5), random.randint(-7, 7), random.randint(-7, 7)
-    d, e, f = random.randint(1, 5), random.randint(-7, 7), random.randint(-7, 7)
-
-    # Helper to format a polynomial string from coefficients
-    def format_poly(coeffs):
-        x_sq, x, const = coeffs
-        return f"{x_sq}x² + {x}x + {const}".replace('+ -', '- ')
+    a, b, c = rng.randint(1, 5), rng.randint(-7, 7), rng.randint(-7, 7)
+    d, e, f = rng.randint(1, 5), rng.randint(-7, 7), rng.randint(-7, 7)
 
-    poly1_str = f"({format_poly([a, b, c])})"
-    poly2_str = f"({format_poly([d, e, f])})"
+    if task != "multiply":
+        return task, a, b, c, d, e, f
+        
+    else: # Multiply two binomials: (ax+b)(cx+d)
+        a, b = rng.randint(1, 6), rng.randint(-7, 7)
+        c, d = rng.randint(1, 6), rng.randint(-7, 7)
+        
+        return task, a, b, c, d
 
+def _build_polynomial_operations(task, *coeffs):
+    """Builds the problem from (a, b, c, d, e, f) for add/subtract or (a, b, c, d) for multiply."""
     if task == "add":
-        problem = f"Add the polynomials: {poly1_str} + {poly2_str}"
+        a, b, c, d, e, f = coeffs
         ans_coeffs = [a + d, b + e, c + f]
-        answer = format_poly(ans_coeffs)
+        return _format_polynomial_operations(task, _QUADRATIC(a, b, c), _QUADRATIC(d, e, f), _QUADRATIC(*ans_coeffs))
 
     elif task == "subtract":
-        problem = f"Subtract the polynomials: {poly1_str} - {poly2_str}"
+        a, b, c, d, e, f = coeffs
         ans_coeffs = [a - d, b - e, c - f]
-        answer = format_poly(ans_coeffs)
-        
-    else: # Multiply two binomials: (ax+b)(cx+d)
-        a, b = random.randint(1, 6), random.randint(-7, 7)
-        c, d = random.randint(1, 6), random.randint(-7, 7)
-        
-        # Format binomial strings
-        bin1_str = f"({a}x + {b})".replace('+ -', '- ')
-        bin2_str = f"({c}x + {d})".replace('+ -', '- ')
-        
-        problem = f"Multiply the binomials: {bin1_str}{bin2_str}"
-        
+        return _format_polynomial_operations(task, _QUADRATIC(a, b, c), _QUADRATIC(d, e, f), _QUADRATIC(*ans_coeffs))
+
+    else:
+        a, b, c, d = coeffs
         # FOIL method: (ac)x^2 + (ad+bc)x + bd
         ans_coeffs = [a*c, a*d + b*c, b*d]
-        answer = format_poly(ans_coeffs)
+        return _format_polynomial_operations(task, _LINEAR(a, b), _LINEAR(c, d), _QUADRATIC(*ans_coeffs))
 
+def _format_exponent_rules(task, base, a, b):
+    """Formats the problem and answer text for one exponent rule."""
+    if task == "product":
+        problem = f"Simplify the expression: {base}^{a} * {base}^{b}"
+        answer = f"{base}^{a + b}"
+    elif task == "power":
+        problem = f"Simplify the expression: ({base}^{a})^{b}"
+        answer = f"{base}^{a * b}"
+    elif task == "negative":
+        problem = f"Rewrite the expression with a positive exponent: {base}^-{a}"
+        answer = f"1 / {base}^{a}"
+    else: # Quotient
+        problem = f"Simplify the expression: {base}^{a} / {base}^{b}"
+        answer = f"{base}^{a - b}"
     return problem, answer
 
-def generate_exponent_rules():
+def generate_exponent_rules(rng=None):
     """Generates a problem using exponent rules like product, power, or negative exponents."""
-    task = random.choice(["product", "power", "negative", "quotient"])
-    base = random.randint(2, 6)
+    return _format_exponent_rules(*_draw_exponent_rules(as_random(rng)))
+
+def _draw_exponent_rules(rng):
+    """Draws the arguments of _format_exponent_rules."""
+    task = rng.choice(["product", "power", "negative", "quotient"])
+    base = rng.randint(2, 6)
     
     if task == "product":
         # Rule: x^a * x^b = x^(a+b)
-        a = random.randint(2, 5)
-        b = random.randint(2, 5)
-        problem = f"Simplify the expression: {base}² * {base}³"
-        answer = f"{base}^{a + b}"
+        a = rng.randint(2, 5)
+        b = rng.randint(2, 5)
         
     elif task == "power":
         # Rule: (x^a)^b = x^(a*b)
-        a = random.randint(2, 4)
-        b = random.randint(2, 4)
-        problem = f"Simplify the expression: ({base}^{a})^{b}"
-        answer = f"{base}^{a * b}"
+        a = rng.randint(2, 4)
+        b = rng.randint(2, 4)
         
     elif task == "negative":
         # Rule: x^-a = 1 / x^a
-        a = random.randint(2, 5)
-        problem = f"Rewrite the expression with a positive exponent: {base}^-{a}"
-        answer = f"1 / {base}^{a}"
+        a = rng.randint(2, 5)
+        b = 0
         
     else: # Quotient
         # Rule: x^a / x^b = x^(a-b)
-        a = random.randint(5, 9)
-        b = random.randint(2, 4) # Ensure a > b for a positive result
-        problem = f"Simplify the expression: {base}^{a} / {base}^{b}"
-        answer = f"{base}^{a - b}"
+        a = rng.randint(5, 9)
+        b = rng.randint(2, 4) # Ensure a > b for a positive result
         
+    return task, base, a, b
+
+def _format_radical_operations(task, a, b, c, d, final_coeff, final_radicand):
+    """Formats the problem and answer text; for "simplify" a is the outside and b the inside."""
+    if task == "simplify":
+        problem_radicand = b * (a ** 2)
+        problem = f"Simplify the radical: √{problem_radicand}"
+    else: # Multiply
+        problem = f"Multiply and simplify: ({a}√{b}) * ({c}√{d})"
+    answer = f"{final_coeff}√{final_radicand}"
     return problem, answer
 
-def generate_radical_operations():
+def generate_radical_operations(rng=None):
     """Generates a problem for simplifying or multiplying square roots."""
-    task = random.choice(["simplify", "multiply"])
+    return _build_radical_operations(*_draw_radical_operations(as_random(rng)))
+
+def _draw_radical_operations(rng):
+    """Draws the arguments of _build_radical_operations."""
+    task = rng.choice(["simplify", "multiply"])
     
     if task == "simplify":
         # Work backwards: answer is outside * sqrt(inside)
         # Problem is sqrt(inside * outside^2)
-        outside = random.randint(2, 5)
-        inside = random.choice([2, 3, 5, 6, 7]) # Non-perfect squares
+        outside = rng.randint(2, 5)
+        inside = rng.choice([2, 3, 5, 6, 7]) # Non-perfect squares
         
-        problem_radicand = inside * (outside ** 2)
-        problem = f"Simplify the radical: √{problem_radicand}"
-        answer = f"{outside}√{inside}"
+        return task, outside, inside, 0, 0
         
     else: # Multiply
         # (a√b) * (c√d)
-        a = random.randint(2, 5)
-        b = random.randint(2, 3)
-        c = random.randint(2, 5)
-        d = random.choice([2, 3, 5])
-        
-        problem = f"Multiply and simplify: ({a}√{b}) * ({c}√{d})"
+        a = rng.randint(2, 5)
+        b = rng.randint(2, 3)
+        c = rng.randint(2, 5)
+        d = rng.choice([2, 3, 5])
         
+        return task, a, b, c, d
+
+def _build_radical_operations(task, a, b, c, d):
+    """Builds the problem; for "simplify" a is the outside and b the inside, c and d are unused."""
+    if task == "simplify":
+        return _format_radical_operations(task, a, b, 0, 0, a, b)
+
+    else:
         # Multiply outsides and insides
         new_coeff = a * c
         new_radicand = b * d
@@ -476,307 +628,366 @@ def generate_radical_operations():
                 final_radicand = new_radicand // (i*i)
                 break
         
-        answer = f"{final_coeff}√{final_radicand}"
-
-    return problem, answer
-
-# Add these imports to the TOP of your problem_generator.py file
-import matplotlib.pyplot as plt
-import numpy as np
+        return _format_radical_operations(task, a, b, c, d, final_coeff, final_radicand)
 
 # Add this new function to the end of the file
-def generate_graphing_linear_equation():
+def generate_graphing_linear_equation(rng=None):
     """Generates a problem for graphing a linear equation in y=mx+b form."""
+    return _build_graphing_linear_equation(*_draw_graphing_linear_equation(as_random(rng)))
+
+def _draw_graphing_linear_equation(rng):
+    """Draws the arguments of _build_graphing_linear_equation."""
     # Generate a simple slope and y-intercept
-    m = random.randint(-3, 3)
-    b = random.randint(-5, 5)
+    m = rng.randint(-3, 3)
+    b = rng.randint(-5, 5)
     
     # Avoid a slope of zero to keep it interesting
     if m == 0: m = 1
         
-    # Format the problem string
-    b_sign = "+" if b >= 0 else "-"
-    problem = f"Graph the linear equation: y = {m}x {b_sign} {abs(b)}"
-    
-    # --- Create the Graph ---
-    fig, ax = plt.subplots(figsize=(6, 6)) # You can adjust size if you like
-    
-    # Create a range of x-values for our line
-    x_vals = np.linspace(-10, 10, 400)
-    y_vals = m * x_vals + b
-    
-    # Plot the line
-    ax.plot(x_vals, y_vals)
-    
-    # --- Format the Coordinate Plane ---
-    ax.axhline(0, color='black', linewidth=0.7)
-    ax.axvline(0, color='black', linewidth=0.7)
+    return m, b
+
+def _build_graphing_linear_equation(m, b):
+    """Builds the graph of y = mx + b."""
+    problem = f"Graph the linear equation: y = {_LINEAR(m, b)}"
     
-    ax.set_xlim(-10, 10)
-    ax.set_ylim(-10, 10)
+    # --- Describe the Graph ---
+    # Axes, ticks, grid and labels come from the cached coordinate plane when it is rendered
+    graph = PlotSpec(xlabel="x-axis", ylabel="y-axis", grid_linewidth=0.5)
     
-    # --- NEW LINES TO SET TICKS ---
-    ax.set_xticks(np.arange(-10, 11, 1)) # Add this line
-    ax.set_yticks(np.arange(-10, 11, 1)) # Add this line
+    # Plot the line across the whole plane
+    graph.curve('linear', m, b)
     
-    ax.grid(True, which='both', linestyle='--', linewidth=0.5)
-    ax.set_title("Correct Graph")
-    ax.set_xlabel("x-axis")
-    ax.set_ylabel("y-axis")
+    return problem, graph
+
+def _format_factoring_harder_quadratic(trinomial, factor1, factor2):
+    """Formats the problem and answer text for Ax^2 + Bx + C = (ax + b)(cx + d), each written."""
+    problem = f"Factor the trinomial: {trinomial}"
+    answer = f"({factor1})({factor2})"
     
-    return problem, fig
+    return problem, answer
 
-def generate_factoring_harder_quadratic():
+def generate_factoring_harder_quadratic(rng=None):
     """Generates a problem for factoring quadratics like Ax^2 + Bx + C."""
+    return _build_factoring_harder_quadratic(*_draw_factoring_harder_quadratic(as_random(rng)))
+
+def _draw_factoring_harder_quadratic(rng):
+    """Draws the arguments of _build_factoring_harder_quadratic."""
     # Start with the factored form (ax+b)(cx+d)
-    a = random.randint(2, 4)
-    b = random.randint(-5, 5)
-    c = random.randint(2, 4)
-    d = random.randint(-5, 5)
+    a = rng.randint(2, 4)
+    b = rng.randint(-5, 5)
+    c = rng.randint(2, 4)
+    d = rng.randint(-5, 5)
 
     if b == 0 or d == 0: # Avoid simple GCF problems
         b = 1
         d = -2
     
+    return a, b, c, d
+
+def _build_factoring_harder_quadratic(a, b, c, d):
+    """Builds Ax^2 + Bx + C from its factors (ax + b)(cx + d)."""
     # Calculate the coefficients A, B, and C for Ax^2 + Bx + C
     A = a * c
     B = a * d + b * c
     C = b * d
     
-    # Format signs for the problem string
-    B_sign = "+" if B >= 0 else "-"
-    C_sign = "+" if C >= 0 else "-"
-    
-    problem = f"Factor the trinomial: {A}x² {B_sign} {abs(B)}x {C_sign} {abs(C)}"
-    
-    # Format answer string
-    b_ans_sign = "+" if b >= 0 else "-"
-    d_ans_sign = "+" if d >= 0 else "-"
-    answer = f"({a}x {b_ans_sign} {abs(b)})({c}x {d_ans_sign} {abs(d)})"
-    
-    return problem, answer
+    return _format_factoring_harder_quadratic(_QUADRATIC(A, B, C), _LINEAR(a, b), _LINEAR(c, d))
 
-def generate_graphing_linear_inequality():
+def generate_graphing_linear_inequality(rng=None):
     """Generates a problem for graphing a linear inequality."""
-    m = random.randint(-3, 3)
-    b = random.randint(-5, 5)
+    return _build_graphing_linear_inequality(*_draw_graphing_linear_inequality(as_random(rng)))
+
+def _draw_graphing_linear_inequality(rng):
+    """Draws the arguments of _build_graphing_linear_inequality."""
+    m = rng.randint(-3, 3)
+    b = rng.randint(-5, 5)
     if m == 0: m = 1
     
-    symbol = random.choice(['<', '>', '≤', '≥'])
+    symbol = rng.choice(['<', '>', '≤', '≥'])
     
-    problem = f"Graph the linear inequality: y {symbol} {m}x + {b}".replace('+ -', '- ')
+    return m, b, symbol
+
+def _build_graphing_linear_inequality(m, b, symbol):
+    """Builds the graph of y (symbol) mx + b."""
+    problem = f"Graph the linear inequality: y {symbol} {_LINEAR(m, b)}"
     
-    # --- Create the Graph ---
-    fig, ax = plt.subplots(figsize=(6, 6))
-    x_vals = np.linspace(-10, 10, 400)
-    y_vals = m * x_vals + b
+    # --- Describe the Graph ---
+    graph = PlotSpec()
     
     # Set line style based on the inequality symbol
     linestyle = '--' if symbol in ['<', '>'] else '-'
-    ax.plot(x_vals, y_vals, linestyle=linestyle)
+    line = graph.curve('linear', m, b, linestyle=linestyle)
     
     # Shade the correct region
     if symbol in ['>', '≥']:
-        ax.fill_between(x_vals, y_vals, 10, color='blue', alpha=0.3)
+        graph.region(line, 10, color='blue', alpha=0.3)
     else: # < or ≤
-        ax.fill_between(x_vals, -10, y_vals, color='blue', alpha=0.3)
-        
-    # Standard formatting
-    ax.set_xlim(-10, 10); ax.set_ylim(-10, 10)
-    ax.axhline(0, color='black', lw=0.7); ax.axvline(0, color='black', lw=0.7)
-    ax.set_xticks(np.arange(-10, 11, 1)); ax.set_yticks(np.arange(-10, 11, 1))
-    ax.grid(True, linestyle='--'); ax.set_title("Correct Graph")
+        graph.region(-10, line, color='blue', alpha=0.3)
     
-    return problem, fig
+    return problem, graph
 
-def generate_graphing_system_equations():
+def generate_graphing_system_equations(rng=None):
     """Generates a problem for graphing a system of two linear equations."""
+    return _build_graphing_system_equations(*_draw_graphing_system_equations(as_random(rng)))
+
+def _draw_graphing_system_equations(rng):
+    """Draws the arguments of _build_graphing_system_equations."""
     # From generate_system_of_equations
-    x, y = random.randint(-5, 5), random.randint(-5, 5)
-    a, b, c, d = 1, 1, 1, 1
-    while (a * d - b * c) == 0:
-        a, b, c, d = [random.randint(-3, 3) for _ in range(4)]
-        if a==0 or b==0 or c==0 or d==0: a=1 # Avoid horizontal/vertical for simplicity
+    x, y = rng.randint(-5, 5), rng.randint(-5, 5)
+    # No zero coefficients (horizontal/vertical lines) for simplicity, and a unique solution
+    a, b, c, d = parameter_tables.graphing_system_coefficients().sample(rng)
         
+    return x, y, a, b, c, d
+
+def _build_graphing_system_equations(x, y, a, b, c, d):
+    """Builds the graph of ax + by = e, cx + dy = f through (x, y)."""
     e = a * x + b * y
     f = c * x + d * y
     
-    eq1_str = f"y = ({-a/b:.2f})x + ({e/b:.2f})".replace('+ -', '- ')
-    eq2_str = f"y = ({-c/d:.2f})x + ({f/d:.2f})".replace('+ -', '- ')
+    eq1_str = f"y = {_LINE_DECIMALS(-a/b, e/b)}"
+    eq2_str = f"y = {_LINE_DECIMALS(-c/d, f/d)}"
     problem = f"Graph the solution to the system:\n{eq1_str}\n{eq2_str}"
     
-    # --- Create the Graph ---
-    fig, ax = plt.subplots(figsize=(6, 6))
-    x_vals = np.linspace(-10, 10, 400)
-    y1_vals = (-a/b) * x_vals + (e/b)
-    y2_vals = (-c/d) * x_vals + (f/d)
-    
-    ax.plot(x_vals, y1_vals, label=eq1_str)
-    ax.plot(x_vals, y2_vals, label=eq2_str)
-    ax.plot(x, y, 'ro', label=f'Solution: ({x},{y})') # Mark the solution
+    # --- Describe the Graph ---
+    graph = PlotSpec()
+    graph.curve('linear', -a/b, e/b, label=eq1_str)
+    graph.curve('linear', -c/d, f/d, label=eq2_str)
+    graph.point(x, y, 'ro', label=f'Solution: ({x},{y})') # Mark the solution
+    graph.legend = True
     
-    # Standard formatting
-    ax.set_xlim(-10, 10); ax.set_ylim(-10, 10)
-    ax.axhline(0, color='black', lw=0.7); ax.axvline(0, color='black', lw=0.7)
-    ax.set_xticks(np.arange(-10, 11, 1)); ax.set_yticks(np.arange(-10, 11, 1))
-    ax.grid(True, linestyle='--'); ax.set_title("Correct Graph"); ax.legend()
-    
-    return problem, fig
+    return problem, graph
 
-def generate_graphing_system_inequalities():
+def generate_graphing_system_inequalities(rng=None):
     """Generates a problem for graphing a system of two linear inequalities."""
-    m1, b1 = random.randint(-2, 2), random.randint(-4, 4)
-    m2, b2 = random.randint(-2, 2), random.randint(-4, 4)
-    if m1 == 0: m1 = 1
-    if m2 == 0: m2 = -1
-    while m1 == m2: m2 = random.randint(-2, 2)
+    return _build_graphing_system_inequalities(*_draw_graphing_system_inequalities(as_random(rng)))
+
+def _draw_graphing_system_inequalities(rng):
+    """Draws the arguments of _build_graphing_system_inequalities."""
+    # Two different nonzero slopes
+    m1, m2 = parameter_tables.different_slopes().sample(rng)
+    b1, b2 = rng.randint(-4, 4), rng.randint(-4, 4)
         
-    s1, s2 = random.choice(['>', '≥']), random.choice(['<', '≤'])
-    
-    problem = f"Graph the solution to the system:\n\n y {s1} {m1}x + {b1}\n y {s2} {m2}x + {b2}"
+    s1, s2 = rng.choice(['>', '≥']), rng.choice(['<', '≤'])
     
+    return m1, m2, b1, b2, s1, s2
 
-    # --- Create the Graph ---
-    fig, ax = plt.subplots(figsize=(6, 6))
-    x_vals = np.linspace(-10, 10, 400)
-    y1_vals = m1 * x_vals + b1
-    y2_vals = m2 * x_vals + b2
+def _build_graphing_system_inequalities(m1, m2, b1, b2, s1, s2):
+    """Builds the graph of y (s1) m1x + b1 and y (s2) m2x + b2."""
+    problem = f"Graph the solution to the system:\n\n y {s1} {_LINEAR(m1, b1)}\n y {s2} {_LINEAR(m2, b2)}"
     
-    ax.plot(x_vals, y1_vals, linestyle=('--' if s1 == '>' else '-'))
-    ax.plot(x_vals, y2_vals, linestyle=('--' if s2 == '<' else '-'))
+
+    # --- Describe the Graph ---
+    graph = PlotSpec()
+    line1 = graph.curve('linear', m1, b1, linestyle=('--' if s1 == '>' else '-'))
+    line2 = graph.curve('linear', m2, b2, linestyle=('--' if s2 == '<' else '-'))
     
     # Shade the overlapping region
-    ax.fill_between(x_vals, y1_vals, y2_vals, where=y2_vals > y1_vals, color='blue', alpha=0.3)
-    
-    # Standard formatting
-    ax.set_xlim(-10, 10); ax.set_ylim(-10, 10)
-    ax.axhline(0, color='black', lw=0.7); ax.axvline(0, color='black', lw=0.7)
-    ax.set_xticks(np.arange(-10, 11, 1)); ax.set_yticks(np.arange(-10, 11, 1))
-    ax.grid(True, linestyle='--'); ax.set_title("Correct Graph")
+    graph.region(line1, line2, where_above=True, color='blue', alpha=0.3)
     
-    return problem, fig
+    return problem, graph
+
+def _format_order_of_operations(template, a, b, c, d, e, f, g, h, answer):
+    """Formats the problem and answer text for one of the three PEMDAS templates."""
+    if template == 1:
+        problem = f"Evaluate: {a} - {b} · {c}² + {d} ÷ {e}"
+    elif template == 2:
+        problem = f"Evaluate: {a} - {b}² · ({c} ÷ {d}) - {e}³ + {f}"
+    else:
+        problem = f"Evaluate: {a} ÷ ({b}³ - {c}) · {d} - {e} · {f} - {g}² + {h}"
+    return problem, str(int(answer)) # Return the final integer answer as a string
 
-def generate_order_of_operations():
+def generate_order_of_operations(rng=None):
     """Generates a complex problem using the order of operations (PEMDAS)."""
+    return _build_order_of_operations(*_draw_order_of_operations(as_random(rng)))
+
+def _draw_order_of_operations(rng):
+    """Draws the arguments of _build_order_of_operations."""
     # Randomly choose one of three problem templates for variety
-    template = random.choice([1, 2, 3])
+    template = rng.choice([1, 2, 3])
     
     # Template 1: No parentheses, multiple operations
     if template == 1:
-        a, b, c = random.randint(10, 20), random.randint(2, 4), random.randint(2, 3)
-        res = random.randint(2, 5)
-        e = random.randint(2, 4)
+        a, b, c = rng.randint(10, 20), rng.randint(2, 4), rng.randint(2, 3)
+        res = rng.randint(2, 5)
+        e = rng.randint(2, 4)
+        return template, a, b, c, res, e
+
+    # Template 2: Parentheses with one operation
+    elif template == 2:
+        a, b = rng.randint(15, 30), rng.randint(2, 4)
+        res = rng.randint(2, 4)
+        d = rng.randint(2, 3)
+        e, f = rng.randint(2, 3), rng.randint(1, 10)
+        return template, a, b, res, d, e, f
+    
+    # Template 3: Parentheses with multiple operations
+    else:
+        c, d = rng.randint(2, 4), rng.randint(2, 5)
+        res = rng.randint(2, 4)
+        # Ensure the denominator (b^3 - c) is not zero
+        b = rng.randint(2, 3)
+        while (b**3 - c) == 0:
+            c = rng.randint(2, 4)
+        
+        e, f, g, h = rng.randint(3, 6), rng.randint(2, 4), rng.randint(2, 4), rng.randint(1, 15)
+        return template, c, d, res, b, e, f, g, h
+
+def _build_order_of_operations(template, *params):
+    """Builds one PEMDAS template; res is the quotient each template's division comes out to."""
+    # Template 1 draws (a, b, c, res, e)
+    if template == 1:
+        a, b, c, res, e = params
         d = res * e
+        f = g = h = 0
         
-        problem = f"Evaluate: {a} - {b} · {c}² + {d} ÷ {e}"
         # Calculation: a - (b * c^2) + (d / e)
         answer = a - (b * (c**2)) + (d / e)
 
-    # Template 2: Parentheses with one operation
+    # Template 2 draws (a, b, res, d, e, f)
     elif template == 2:
-        a, b = random.randint(15, 30), random.randint(2, 4)
-        res = random.randint(2, 4)
-        d = random.randint(2, 3)
+        a, b, res, d, e, f = params
         c = res * d
-        e, f = random.randint(2, 3), random.randint(1, 10)
+        g = h = 0
         
-        problem = f"Evaluate: {a} - {b}² · ({c} ÷ {d}) - {e}³ + {f}"
         # Calculation: a - (b^2 * (c/d)) - e^3 + f
         answer = a - ((b**2) * (c/d)) - (e**3) + f
     
-    # Template 3: Parentheses with multiple operations
+    # Template 3 draws (c, d, res, b, e, f, g, h)
     else:
-        c, d = random.randint(2, 4), random.randint(2, 5)
-        res = random.randint(2, 4)
-        # Ensure the denominator (b^3 - c) is not zero
-        b = random.randint(2, 3)
-        while (b**3 - c) == 0:
-            c = random.randint(2, 4)
-        
+        c, d, res, b, e, f, g, h = params
         denominator = (b**3 - c)
         a = res * denominator # Guarantees clean division
-        
-        e, f, g, h = random.randint(3, 6), random.randint(2, 4), random.randint(2, 4), random.randint(1, 15)
 
-        problem = f"Evaluate: {a} ÷ ({b}³ - {c}) · {d} - {e} · {f} - {g}² + {h}"
         # Calculation: (a / (b^3 - c) * d) - (e * f) - g^2 + h
         answer = (a / denominator * d) - (e * f) - (g**2) + h
         
-    return problem, str(int(answer)) # Return the final integer answer as a string
+    return _format_order_of_operations(template, a, b, c, d, e, f, g, h, answer)
 
-def generate_literal_equation():
-    """Generates a problem for solving a literal equation for a specific variable."""
-    # Store common formulas and their possible solutions
-    formulas = [
-        ("Perimeter of a rectangle: P = 2l + 2w", "l", "l = (P - 2w) / 2"),
-        ("Perimeter of a rectangle: P = 2l + 2w", "w", "w = (P - 2l) / 2"),
-        ("Slope-intercept form: y = mx + b", "x", "x = (y - b) / m"),
-        ("Area of a trapezoid: A = (1/2)h(b1 + b2)", "h", "h = 2A / (b1 + b2)"),
-        ("Volume of a cylinder: V = πr²h", "h", "h = V / (πr²)"),
-    ]
-    
-    # Randomly pick one of the formulas and its parts
-    formula_str, variable, solution = random.choice(formulas)
+# Store common formulas and their possible solutions
+LITERAL_FORMULAS = [
+    ("Perimeter of a rectangle: P = 2l + 2w", "l", "l = (P - 2w) / 2"),
+    ("Perimeter of a rectangle: P = 2l + 2w", "w", "w = (P - 2l) / 2"),
+    ("Slope-intercept form: y = mx + b", "x", "x = (y - b) / m"),
+    ("Area of a trapezoid: A = (1/2)h(b1 + b2)", "h", "h = 2A / (b1 + b2)"),
+    ("Volume of a cylinder: V = πr²h", "h", "h = V / (πr²)"),
+]
+
+def _format_literal_equation(index):
+    """Formats the problem and answer text for the formula at LITERAL_FORMULAS[index]."""
+    formula_str, variable, solution = LITERAL_FORMULAS[index]
     
     problem = f"Given the formula {formula_str}, solve for {variable}."
     answer = solution
     
     return problem, answer
 
-def generate_word_problem():
-    """Generates a word problem for a one-variable equation or inequality."""
-    task = random.choice(["equation", "inequality"])
+def generate_literal_equation(rng=None):
+    """Generates a problem for solving a literal equation for a specific variable."""
+    return _format_literal_equation(*_draw_literal_equation(as_random(rng)))
+
+def _draw_literal_equation(rng):
+    """Draws the arguments of _format_literal_equation."""
+    # Randomly pick one of the formulas and its parts
+    index = rng.randrange(len(LITERAL_FORMULAS))
     
+    return (index,)
+
+def _format_word_problem(task, start_int, total, budget, flat_fee, item_cost, max_items):
+    """Formats the problem and answer text for a consecutive-integer or budgeting problem."""
     if task == "equation":
-        # Scenario: Consecutive integers
-        start_int = random.randint(5, 50)
-        num1, num2, num3 = start_int, start_int + 1, start_int + 2
-        total = num1 + num2 + num3
-        
         problem = f"The sum of three consecutive integers is {total}. What is the smallest of the three integers?"
         answer = f"The smallest integer is {start_int}."
+    else:
+        problem = (f"You have a budget of at most ${budget} for a party. "
+                   f"A company charges a ${flat_fee} flat fee plus ${item_cost} per person. "
+                   f"What is the maximum number of people that can attend?")
+        answer = f"The maximum number of people is {max_items}."
+    return problem, answer
+
+def generate_word_problem(rng=None):
+    """Generates a word problem for a one-variable equation or inequality."""
+    return _build_word_problem(*_draw_word_problem(as_random(rng)))
+
+def _draw_word_problem(rng):
+    """Draws the arguments of _build_word_problem."""
+    task = rng.choice(["equation", "inequality"])
+    
+    if task == "equation":
+        # Scenario: Consecutive integers
+        start_int = rng.randint(5, 50)
+        return task, start_int
         
     else: # Inequality
         # Scenario: Budgeting
-        budget = random.randint(80, 200)
-        item_cost = random.randint(5, 15)
-        flat_fee = random.randint(10, 25)
+        budget = rng.randint(80, 200)
+        item_cost = rng.randint(5, 15)
+        flat_fee = rng.randint(10, 25)
+        return task, budget, item_cost, flat_fee
+
+def _build_word_problem(task, *params):
+    """Builds the problem from (start_int,) for "equation" or (budget, item_cost, flat_fee)."""
+    if task == "equation":
+        start_int, = params
+        num1, num2, num3 = start_int, start_int + 1, start_int + 2
+        total = num1 + num2 + num3
         
+        return _format_word_problem(task, start_int, total, 0, 0, 0, 0)
+        
+    else:
+        budget, item_cost, flat_fee = params
         # Calculate the max number of items
         max_items = (budget - flat_fee) // item_cost
         
-        problem = (f"You have a budget of at most ${budget} for a party. "
-                   f"A company charges a ${flat_fee} flat fee plus ${item_cost} per person. "
-                   f"What is the maximum number of people that can attend?")
-        answer = f"The maximum number of people is {max_items}."
-
-    return problem, answer
+        return _format_word_problem(task, 0, 0, budget, flat_fee, item_cost, max_items)
 
-def generate_domain_range_graph():
+def generate_domain_range_graph(rng=None):
     """Generates a graph of a function and determines its domain and range."""
-    func_type = random.choice(['linear', 'quadratic', 'absolute_value', 'square_root', 'piecewise_linear'])
+    return _build_domain_range_graph(*_draw_domain_range_graph(as_random(rng)))
+
+def _draw_domain_range_graph(rng):
+    """Draws the arguments of _build_domain_range_graph."""
+    func_type = rng.choice(['linear', 'quadratic', 'absolute_value', 'square_root', 'piecewise_linear'])
     
+    if func_type == 'linear':
+        m, b = rng.randint(-2, 2), rng.randint(-4, 4)
+        if m == 0: m = 1
+        return func_type, m, b
+
+    elif func_type == 'piecewise_linear':
+        # First piece
+        x1_break = rng.randint(-5, -1)
+        m1, b1 = rng.randint(-2, 2), rng.randint(-3, 3)
+        if m1 == 0: m1 = 1
+
+        # Second piece
+        x2_break = rng.randint(x1_break + 2, 6)
+        m2, b2 = rng.randint(-2, 2), rng.randint(-3, 3)
+        if m2 == 0: m2 = -1
+        return func_type, x1_break, x2_break, m1, b1, m2, b2
+
+    else: # Quadratic, absolute value and square root share the vertex form
+        h, k = rng.randint(-5, 5), rng.randint(-5, 5)
+        a = rng.choice([-2, -1, 1, 2])
+        return func_type, h, k, a
+
+def _build_domain_range_graph(func_type, *params):
+    """Builds the graph from (m, b), (h, k, a), or (x1_break, x2_break, m1, b1, m2, b2) for piecewise."""
     # --- Setup the Plot ---
-    fig, ax = plt.subplots(figsize=(6, 6))
-    x_vals = np.linspace(-10, 10, 400)
+    graph = PlotSpec(title="Determine the Domain and Range", tick_step=2)
     
     # --- Generate Function Based on Type ---
     
     if func_type == 'linear':
-        m, b = random.randint(-2, 2), random.randint(-4, 4)
-        if m == 0: m = 1
-        y_vals = m * x_vals + b
-        ax.plot(x_vals, y_vals)
+        m, b = params
+        graph.curve('linear', m, b)
         domain_inequality = "All real numbers"
         domain_interval = "(-∞, ∞)"
         range_inequality = "All real numbers"
         range_interval = "(-∞, ∞)"
 
     elif func_type == 'quadratic':
-        h, k = random.randint(-5, 5), random.randint(-5, 5)
-        a = random.choice([-2, -1, 1, 2])
-        y_vals = a * ((x_vals - h)**2) + k
-        ax.plot(x_vals, y_vals)
+        h, k, a = params
+        graph.curve('quadratic', h, k, a)
         domain_inequality = "All real numbers"
         domain_interval = "(-∞, ∞)"
         if a > 0:
@@ -787,10 +998,8 @@ def generate_domain_range_graph():
             range_interval = f"(-∞, {k}]"
             
     elif func_type == 'absolute_value':
-        h, k = random.randint(-5, 5), random.randint(-5, 5)
-        a = random.choice([-2, -1, 1, 2])
-        y_vals = a * np.abs(x_vals - h) + k
-        ax.plot(x_vals, y_vals)
+        h, k, a = params
+        graph.curve('absolute_value', h, k, a)
         domain_inequality = "All real numbers"
         domain_interval = "(-∞, ∞)"
         if a > 0:
@@ -801,13 +1010,10 @@ def generate_domain_range_graph():
             range_interval = f"(-∞, {k}]"
 
     elif func_type == 'square_root':
-        h, k = random.randint(-5, 5), random.randint(-5, 5)
-        a = random.choice([-2, -1, 1, 2])
+        h, k, a = params
         # Only plot where x-h >= 0
-        valid_x = x_vals[x_vals >= h]
-        y_vals = a * np.sqrt(valid_x - h) + k
-        ax.plot(valid_x, y_vals)
-        ax.plot(h, k, 'o', markerfacecolor='blue', markeredgecolor='blue') # Solid dot at start
+        graph.curve('square_root', h, k, a, x_from=h)
+        graph.point(h, k, 'o', markerfacecolor='blue', markeredgecolor='blue') # Solid dot at start
         domain_inequality = f"x ≥ {h}"
         domain_interval = f"[{h}, ∞)"
         if a > 0:
@@ -818,23 +1024,15 @@ def generate_domain_range_graph():
             range_interval = f"(-∞, {k}]"
             
     elif func_type == 'piecewise_linear':
+        x1_break, x2_break, m1, b1, m2, b2 = params
+
         # First piece
-        x1_break = random.randint(-5, -1)
-        m1, b1 = random.randint(-2, 2), random.randint(-3, 3)
-        if m1 == 0: m1 = 1
-        x1_vals = np.linspace(-10, x1_break, 100)
-        y1_vals = m1 * x1_vals + b1
-        ax.plot(x1_vals, y1_vals, 'b-')
-        ax.plot(x1_break, m1*x1_break+b1, 'o', markerfacecolor='white', markeredgecolor='blue', markersize=8)
+        graph.curve('linear', m1, b1, x_range=(-10, x1_break, 100), fmt='b-')
+        graph.point(x1_break, m1*x1_break+b1, 'o', markerfacecolor='white', markeredgecolor='blue', markersize=8)
 
         # Second piece
-        x2_break = random.randint(x1_break + 2, 6)
-        m2, b2 = random.randint(-2, 2), random.randint(-3, 3)
-        if m2 == 0: m2 = -1
-        x2_vals = np.linspace(x2_break, 10, 100)
-        y2_vals = m2 * x2_vals + b2
-        ax.plot(x2_vals, y2_vals, 'b-')
-        ax.plot(x2_break, m2*x2_break+b2, 'o', markerfacecolor='blue', markeredgecolor='blue', markersize=8)
+        graph.curve('linear', m2, b2, x_range=(x2_break, 10, 100), fmt='b-')
+        graph.point(x2_break, m2*x2_break+b2, 'o', markerfacecolor='blue', markeredgecolor='blue', markersize=8)
         
         # Domain and Range for piecewise
         domain_inequality = f"x < {x1_break} or x ≥ {x2_break}"
@@ -851,15 +1049,8 @@ def generate_domain_range_graph():
             
         range_inequality = f"{r1_ineq} or {r2_ineq}"
         range_interval = f"{r1_int} U {r2_int}"
-
-    # --- Standard Formatting ---
-    ax.set_xlim(-10, 10); ax.set_ylim(-10, 10)
-    ax.axhline(0, color='black', lw=0.7); ax.axvline(0, color='black', lw=0.7)
-    ax.set_xticks(np.arange(-10, 11, 2)); ax.set_yticks(np.arange(-10, 11, 2))
-    ax.grid(True, linestyle='--')
-    ax.set_title("Determine the Domain and Range")
     
-    problem = fig
+    problem = graph
     answer = (f"Domain (Inequality): {domain_inequality}\n"
               f"Domain (Interval): {domain_interval}\n\n"
               f"Range (Inequality): {range_inequality}\n"
@@ -895,3 +1086,20 @@ TOPICS = {
     "Graphing Systems of Inequalities": generate_graphing_system_inequalities,
     "Visual Domain and Range": generate_domain_range_graph,
 }
+
+# Topics that return graphs, as PlotSpecs. Only rendering those loads NumPy and matplotlib.
+GRAPH_TOPICS = [
+    "Graphing Linear Equations",
+    "Graphing Linear Inequalities",
+    "Graphing Systems of Equations",
+    "Graphing Systems of Inequalities",
+    "Visual Domain and Range",
+]
+
+def needs_plotting(topic):
+    """Returns True if showing the topic's problems needs the plotting stack."""
+    return topic in GRAPH_TOPICS
+
+def generate_seeded(topic, seed, index):
+    """Generates problem number index of the worksheet for (topic, seed), reproducibly."""
+    return TOPICS[topic](problem_rng(seed, index))
@@ -0,0 +1,133 @@
+# File: problems.py
+#
+# Compact problem records. A problem is fully described by its topic and its
+# index in that topic's parameter space (see parameter_spaces.py), so that
+# is all a Problem stores: two small ints in __slots__. The problem and answer
+# text, and any graph's plot spec, are built from them only when asked for.
+# Each graph is rendered on its own (PNG bytes, or SVG text), the first time
+# that part is shown, so a hidden answer graph is never drawn. ProblemStore keeps many
+# problems in two flat arrays at 5 bytes each; records are created when an
+# item is read.
+
+from array import array
+from functools import lru_cache
+
+import parameter_spaces
+import plot_spec
+import problem_generator as pg
+from seeding import as_random
+
+TOPIC_NAMES = list(pg.TOPICS)
+TOPIC_IDS = {topic: topic_id for topic_id, topic in enumerate(TOPIC_NAMES)}
+
+# The generator's _draw_* function for each topic, in TOPIC_NAMES order
+_DRAWERS = [getattr(pg, "_draw_" + pg.TOPICS[topic].__name__[len("generate_"):]) for topic in TOPIC_NAMES]
+
+RENDER_CACHE_SIZE = 64 # Built and rendered problems kept, so showing the same one again is free
+GRAPH_PLACEHOLDER = "[graph]"
+
+class Problem:
+    """One problem as (topic id, index into its parameter space); text and graphs are built on demand."""
+
+    __slots__ = ('topic_id', 'index')
+
+    def __init__(self, topic_id, index):
+        self.topic_id = topic_id
+        self.index = index
+
+    @classmethod
+    def generate(cls, topic, rng=None):
+        """Draws a problem exactly like TOPICS[topic](rng) would, without building it."""
+        topic_id = TOPIC_IDS[topic]
+        params = _DRAWERS[topic_id](as_random(rng))
+        return cls(topic_id, parameter_spaces.space(topic).encode(params))
+
+    @classmethod
+    def at(cls, topic, index):
+        """The problem at an index of a topic's space (e.g. from no_repeat.ClassSession.draw)."""
+        return cls(TOPIC_IDS[topic], index)
+
+    @property
+    def topic(self):
+        return TOPIC_NAMES[self.topic_id]
+
+    @property
+    def params(self):
+        """The generator arguments this problem is built from."""
+        return parameter_spaces.space(self.topic).decode(self.index)
+
+    @property
+    def problem_is_graph(self):
+        return self.topic == "Visual Domain and Range"
+
+    @property
+    def answer_is_graph(self):
+        return self.topic in pg.GRAPH_TOPICS and not self.problem_is_graph
+
+    def build(self):
+        """Returns the (problem, answer) pair the generator would have, graphs as PlotSpecs."""
+        return _build(self.topic_id, self.index)
+
+    def part(self, which, backend="png"):
+        """Returns the problem (0) or answer (1) as text, or a graph rendered by backend on first use."""
+        item = _build(self.topic_id, self.index)[which]
+        return item if isinstance(item, str) else _render(self.topic_id, self.index, which, backend)
+
+    def render(self, backend="png"):
+        """Returns (problem, answer) with every graph rendered: PNG bytes, or SVG text for backend="svg"."""
+        return self.part(0, backend), self.part(1, backend)
+
+    def text(self):
+        """Returns (problem, answer) as text, with GRAPH_PLACEHOLDER for a graph (which is not rendered)."""
+        return tuple(part if isinstance(part, str) else GRAPH_PLACEHOLDER for part in self.build())
+
+    def __eq__(self, other):
+        if not isinstance(other, Problem):
+            return NotImplemented
+        return self.topic_id == other.topic_id and self.index == other.index
+
+    def __hash__(self):
+        return hash((self.topic_id, self.index))
+
+    def __repr__(self):
+        return f"Problem({self.topic!r}, {self.index})"
+
+@lru_cache(maxsize=RENDER_CACHE_SIZE)
+def _build(topic_id, index):
+    return parameter_spaces.space(TOPIC_NAMES[topic_id]).problem(index)
+
+@lru_cache(maxsize=RENDER_CACHE_SIZE)
+def _render(topic_id, index, which, backend):
+    return plot_spec.render(_build(topic_id, index)[which], backend)
+
+class ProblemStore:
+    """An append-only list of problems packed into arrays: one byte of topic id and four of index each."""
+
+    __slots__ = ('topic_ids', 'indices')
+
+    def __init__(self, problems=()):
+        self.topic_ids = array('B')
+        self.indices = array('I')
+        self.extend(problems)
+
+    def append(self, problem):
+        self.topic_ids.append(problem.topic_id)
+        self.indices.append(problem.index)
+
+    def extend(self, problems):
+        for problem in problems:
+            self.append(problem)
+
+    def __len__(self):
+        return len(self.indices)
+
+    def __getitem__(self, position):
+        return Problem(self.topic_ids[position], self.indices[position])
+
+    def __iter__(self):
+        return map(Problem, self.topic_ids, self.indices)
+
+    def nbytes(self):
+        """Bytes used by the packed arrays."""
+        return (len(self.topic_ids) * self.topic_ids.itemsize +
+                len(self.indices) * self.indices.itemsize)
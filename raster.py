@@ -0,0 +1,133 @@
+# File: raster.py
+#
+# The output stage for graphs shipped as images: palette PNG or lossless
+# WebP, at the DPI that makes a graph a requested number of pixels wide
+# (WIDTH unless asked otherwise) or at a given DPI. A graph is a few flat
+# colors and the antialiased edges between them, so Pillow's fast octree
+# reduces it to a COLORS palette that leaves the grid as it was and, of a
+# million other pixels, moves less than one by more than 24 of 255 levels
+# in a channel; the palette image compresses far better than full-color
+# pixels. Against the full-color PNG at the plane's DPI that graphs were
+# sent as before, the palette PNG at WIDTH is about a sixth of the bytes
+# and the WebP a tenth (see benchmarks/raster_output.py).
+#
+# Pixels come from coordinate_plane's blit, into the Agg buffer each thread
+# keeps, and are encoded into a BytesIO each thread keeps, so a render
+# allocates no image-sized buffer besides the palette image and the bytes
+# returned; render_into() writes into the caller's buffer instead, for
+# callers that send the bytes on without keeping them. Every image written
+# is counted in a report of bytes per image, by format and width.
+#
+#   png = render(spec, Options("png", width=720))
+#   size = render_into(spec, buffer, Options("webp")) # buffer.getbuffer()[:size]
+#   report.rows()
+
+import io
+import threading
+
+import figure_manager
+
+COLORS = 256 # Palette size; 0 writes full color
+WIDTH = 800 # Default pixels across: a little more than the app's centered column shows
+FORMATS = {"png": "image/png", "webp": "image/webp"}
+
+class Options:
+    """How a graph is written: format, size (a width in pixels, or a DPI, which overrides it) and palette."""
+
+    __slots__ = ('format', 'width', 'dpi', 'colors')
+
+    def __init__(self, format="png", width=WIDTH, dpi=None, colors=COLORS):
+        if format not in FORMATS:
+            raise ValueError(f"Unknown format: {format!r} (expected one of {tuple(FORMATS)})")
+        self.format = format
+        self.width = None if dpi else width
+        self.dpi = dpi
+        self.colors = colors
+
+    @property
+    def media_type(self):
+        return FORMATS[self.format]
+
+DEFAULTS = {name: Options(name) for name in FORMATS} # What plot_spec.render gives for "png" and "webp"
+
+# --- Size Report ---
+
+class SizeReport:
+    """Bytes per image written, counted by (format, width in pixels)."""
+
+    def __init__(self):
+        self.sizes = {} # (format, width) -> [images, bytes, smallest, largest]
+        self.lock = threading.Lock()
+
+    def record(self, image_format, width, size):
+        with self.lock:
+            counts = self.sizes.get((image_format, width))
+            if counts is None:
+                self.sizes[(image_format, width)] = [1, size, size, size]
+            else:
+                counts[0] += 1
+                counts[1] += size
+                counts[2] = min(counts[2], size)
+                counts[3] = max(counts[3], size)
+
+    def rows(self):
+        """One dict per format and width: images, mean, smallest and largest KB."""
+        with self.lock:
+            return [{"format": image_format, "width": width, "images": images, "mean KB": round(total / images / 1024, 1),
+                     "min KB": round(smallest / 1024, 1), "max KB": round(largest / 1024, 1)}
+                    for (image_format, width), (images, total, smallest, largest) in sorted(self.sizes.items())]
+
+    def clear(self):
+        with self.lock:
+            self.sizes.clear()
+
+report = SizeReport()
+
+# --- Rendering ---
+
+_local = threading.local() # Each thread's output buffer
+
+def _rasterize(fig, options, out):
+    """Blits a plane figure's pixels (see coordinate_plane._blit) and writes them to out; returns the size."""
+    from coordinate_plane import _blit
+    return _encode(_blit(fig), options, out)
+
+def _encode(pixels, options, out):
+    """Writes pixels to out as options say; returns the number of bytes written."""
+    from PIL import Image
+
+    image = Image.fromarray(pixels, 'RGBA')
+    if options.colors: # Graphs are opaque; an RGBA palette would add a transparency chunk
+        image = image.convert('RGB').quantize(options.colors, method=Image.Quantize.FASTOCTREE)
+    if options.format == "webp":
+        image.save(out, format="webp", lossless=True)
+    else:
+        image.save(out, format="png")
+    size = out.tell()
+    report.record(options.format, image.width, size)
+    return size
+
+def render_into(spec, out, options=DEFAULTS["png"]):
+    """Writes a spec's image at the start of a BytesIO, over what it held; returns its size in bytes.
+
+    The image is out.getbuffer()[:size]. The buffer is not truncated, so it
+    keeps its memory for the next image; release views of it before then.
+    """
+    from coordinate_plane import dpi_for_width
+
+    out.seek(0)
+    dpi = options.dpi or (dpi_for_width(options.width, **spec.plane) if options.width else None)
+    fig = spec.to_figure(dpi)
+    try:
+        return _rasterize(fig, options, out)
+    finally:
+        figure_manager.release(fig)
+
+def render(spec, options=DEFAULTS["png"]):
+    """Returns a spec's image as bytes, encoded in this thread's buffer."""
+    out = getattr(_local, 'out', None)
+    if out is None:
+        out = _local.out = io.BytesIO()
+    size = render_into(spec, out, options)
+    with out.getbuffer() as view, view[:size] as image:
+        return bytes(image)
@@ -0,0 +1,39 @@
+# File: rational.py
+#
+# Rational numbers as plain (numerator, denominator) int pairs, for the
+# generators' slopes, intercepts and boundaries. fractions.Fraction does
+# the same arithmetic, but builds an object and normalizes it through
+# several checks on every operation, which dominates a generator that does
+# two or three of them. Here a result is written out with integer math and
+# reduced once with math.gcd. reduce_array is the same for NumPy columns,
+# for batch_generator.py. The formatters write fractions the way
+# str(Fraction) does, so answers read the same as before.
+
+from math import gcd
+
+def reduce(num, den):
+    """Returns num/den in lowest terms with a positive denominator."""
+    if den == 0:
+        raise ZeroDivisionError(f"{num}/0")
+    g = gcd(num, den)
+    if den < 0:
+        g = -g
+    return num // g, den // g
+
+def reduce_array(num, den):
+    """Reduces num/den element-wise to lowest terms with a positive denominator; NumPy int arrays."""
+    import numpy as np
+    sign = np.where(den < 0, -1, 1)
+    g = np.gcd(num, den)
+    g[g == 0] = 1
+    return sign * num // g, sign * den // g
+
+# --- Formatting ---
+
+def format_fraction(num, den):
+    """Formats a reduced fraction the same way str(Fraction) does: "-3/4", or "5" for a whole number."""
+    return f"{num}/{den}" if den != 1 else str(num)
+
+def signed(num, den):
+    """Formats a reduced fraction as a term after another one: "+ 3/4" or "- 3/4"."""
+    return f"+ {format_fraction(num, den)}" if num >= 0 else f"- {format_fraction(-num, den)}"
@@ -0,0 +1,62 @@
+# File: seeding.py
+#
+# Random number streams for the generators.
+# Every generator in TOPICS takes an optional rng. Passing the same seeded
+# stream reproduces the same problem; without one they fall back to the
+# global random module like before.
+#
+# Child streams are derived from a master seed and a path of keys (session
+# id, worker number, problem index, ...) by hashing, so any two different
+# paths give independent streams, and problem i of a worksheet only depends
+# on (seed, i). That is what lets worker k of N generate problems
+# k, k+N, k+2N, ... on its own with no coordination.
+
+import hashlib
+import random
+
+def derive_seed(seed, *keys):
+    """Derives an independent 64-bit child seed from a master seed and a path of keys."""
+    digest = hashlib.blake2b(repr((seed,) + keys).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+def make_rng(seed=None, *keys):
+    """Returns a random.Random for the stream at (seed, *keys); unseeded if seed is None."""
+    if seed is None:
+        return random.Random()
+    return random.Random(derive_seed(seed, *keys))
+
+def session_rng(seed, session_id):
+    """Returns the stream for one user/class session."""
+    return make_rng(seed, "session", session_id)
+
+def problem_rng(seed, index):
+    """Returns the stream for problem number index of a worksheet."""
+    return make_rng(seed, "problem", index)
+
+def worker_indices(worker, num_workers, n):
+    """Returns the problem indices worker (0-based) of num_workers is responsible for."""
+    return range(worker, n, num_workers)
+
+class _GeneratorRandom(random.Random):
+    """random.Random driven by a numpy.random.Generator's bit stream."""
+
+    def __init__(self, generator):
+        self._generator = generator
+        super().__init__()
+
+    def random(self):
+        return float(self._generator.random())
+
+    def getrandbits(self, k):
+        value = int.from_bytes(self._generator.bytes((k + 7) // 8), "little")
+        return value >> (-k % 8)
+
+def as_random(rng):
+    """Returns an object with the random.Random API for rng (None means the global stream)."""
+    if rng is None:
+        return random
+    if rng is random or isinstance(rng, random.Random):
+        return rng
+    if hasattr(rng, "bit_generator"): # numpy.random.Generator
+        return _GeneratorRandom(rng)
+    raise TypeError(f"Expected a random.Random or numpy.random.Generator, got {type(rng).__name__}")
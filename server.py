@@ -0,0 +1,289 @@
+# File: server.py
+#
+# HTTP/JSON problem service, so other tools (an LMS, slide decks, student
+# tablets) can get problems without a Streamlit session per user. Built on
+# asyncio streams from the standard library, with HTTP/1.1 keep-alive.
+#
+#   GET /topics                                     every topic: id, name, graph, problem count
+#   GET /problem?topic=..&seed=..&n=..              n problems (topic by name or id)
+#   GET /image/<topic id>/<index>/<part>.<svg|png|webp>  a graph; part is "problem" or "answer"
+#   GET /metrics                                    instrumentation snapshot, when it is enabled
+#
+# With a seed, /problem returns problems 0..n-1 of that worksheet, the same
+# ones generate_seeded(topic, seed, i) gives, so the response only depends on
+# the URL. Those responses and all images carry an ETag, and a request whose
+# If-None-Match matches is answered with 304 and no body. Image ETags come
+# from the URL and a hash of the code that draws problems, so a matching
+# image is not even rendered, and the tags change when that code does.
+# Without a seed, problems are random and not cached.
+#
+# SVG graphs are drawn inline: they take well under a millisecond. PNG and
+# WebP graphs (palette images, see raster.py) go to a process pool, so the
+# event loop never waits on matplotlib.
+# Rendered images are kept in a small LRU cache, and concurrent requests for
+# the same image share one render.
+#
+# Run:  python server.py [--host 127.0.0.1] [--port 8000] [--workers N]
+
+import argparse
+import asyncio
+import hashlib
+import json
+import multiprocessing
+import os
+import random
+import signal
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+
+import instrumentation
+import parameter_spaces
+import plot_spec
+from problems import TOPIC_IDS, TOPIC_NAMES, Problem
+from problem_generator import GRAPH_TOPICS
+from seeding import problem_rng
+
+MAX_PROBLEMS = 100 # Per /problem request
+IMAGE_CACHE_SIZE = 512
+PARTS = ("problem", "answer")
+CONTENT_TYPES = {"svg": "image/svg+xml", "png": "image/png", "webp": "image/webp"}
+REASONS = {200: "OK", 304: "Not Modified", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           500: "Internal Server Error"}
+
+# Modules whose code decides what a problem or graph looks like
+CONTENT_MODULES = ("problem_generator.py", "parameter_spaces.py", "parameter_tables.py", "plot_spec.py",
+                   "svg_render.py", "coordinate_plane.py", "raster.py")
+
+class HTTPError(Exception):
+    """An error response with a status code and a message for the JSON body."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+# --- Rendering ---
+
+def _warm_worker():
+    """Imports matplotlib and draws the coordinate planes once in each pool process."""
+    for topic in GRAPH_TOPICS:
+        _render(TOPIC_IDS[topic], 0, 1 if Problem.at(topic, 0).answer_is_graph else 0, "png")
+
+def _render(topic_id, index, which, backend):
+    """Renders one graph part to bytes; runs in the pool for PNG."""
+    image = Problem(topic_id, index).part(which, backend)
+    return image.encode() if isinstance(image, str) else image
+
+def content_version():
+    """Returns a short hash of the code that draws problems, for the ETags."""
+    digest = hashlib.blake2b(digest_size=6)
+    here = os.path.dirname(os.path.abspath(__file__))
+    for name in CONTENT_MODULES:
+        with open(os.path.join(here, name), "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+# --- The Service ---
+
+class ProblemService:
+    """Answers the requests; one instance per server, used from the event loop only."""
+
+    def __init__(self, workers=None):
+        self.version = content_version()
+        workers = workers or max(os.cpu_count() // 2, 1)
+        self.pool = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"),
+                                        initializer=_warm_worker)
+        for _ in range(workers):
+            self.pool.submit(int) # Start (and warm) every worker now rather than on the first PNG
+        self.images = OrderedDict() # (topic_id, index, which, format) -> bytes, least recently used first
+        self.pending = {} # Same key -> future of a render in progress
+        self.rng = random.Random()
+        self.topics_body = json.dumps([
+            {"id": topic_id, "name": topic, "graph": topic in GRAPH_TOPICS,
+             "problems": parameter_spaces.space(topic).size}
+            for topic_id, topic in enumerate(TOPIC_NAMES)]).encode()
+
+    def close(self):
+        self.pool.shutdown(cancel_futures=True)
+
+    async def handle(self, method, target, headers):
+        """Returns (status, headers, body) for one request."""
+        if method != "GET":
+            raise HTTPError(405, "Only GET is supported")
+        url = urlsplit(target)
+        query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        if url.path == "/topics":
+            return self._cacheable(self.topics_body, "application/json", headers)
+        if url.path == "/problem":
+            return self._problems(query, headers)
+        if url.path.startswith("/image/"):
+            return await self._image(url.path, headers)
+        if url.path == "/metrics" and instrumentation.enabled():
+            return 200, {"Content-Type": "text/plain; version=0.0.4"}, instrumentation.snapshot_text().encode()
+        raise HTTPError(404, f"No such endpoint: {url.path}")
+
+    def _cacheable(self, body, content_type, headers, etag=None):
+        """A 200 with an ETag, or a 304 when the client already has this body."""
+        etag = etag or f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+        response_headers = {"ETag": etag, "Cache-Control": "no-cache"} # Revalidate, then reuse
+        if headers.get("if-none-match") == etag:
+            return 304, response_headers, b""
+        response_headers["Content-Type"] = content_type
+        return 200, response_headers, body
+
+    def _problems(self, query, headers):
+        topic = query.get("topic", "")
+        if topic.isdigit() and int(topic) < len(TOPIC_NAMES):
+            topic = TOPIC_NAMES[int(topic)]
+        if topic not in TOPIC_IDS:
+            raise HTTPError(404, f"Unknown topic: {topic!r}")
+        try:
+            n = int(query.get("n", 1))
+            seed = int(query["seed"]) if "seed" in query else None
+        except ValueError:
+            raise HTTPError(400, "n and seed must be integers")
+        if not 1 <= n <= MAX_PROBLEMS:
+            raise HTTPError(400, f"n must be between 1 and {MAX_PROBLEMS}")
+
+        records = []
+        for i in range(n):
+            rng = problem_rng(seed, i) if seed is not None else self.rng
+            records.append(instrumentation.call(topic, Problem.generate, topic, rng))
+        body = json.dumps([self._problem_json(record) for record in records]).encode()
+        if seed is None:
+            return 200, {"Content-Type": "application/json", "Cache-Control": "no-store"}, body
+        return self._cacheable(body, "application/json", headers)
+
+    def _problem_json(self, record):
+        problem, answer = record.build()
+        item = {"id": f"{record.topic_id}-{record.index}", "topic": record.topic, "index": record.index}
+        for part, value in zip(PARTS, (problem, answer)):
+            if isinstance(value, str):
+                item[part] = value
+            else:
+                url = f"/image/{record.topic_id}/{record.index}/{part}"
+                item[part] = None
+                item[f"{part}_image"] = {backend: f"{url}.{backend}" for backend in plot_spec.BACKENDS}
+        return item
+
+    async def _image(self, path, headers):
+        try:
+            topic_id, index, name = path[len("/image/"):].split("/")
+            part, image_format = name.split(".")
+            topic_id, index, which = int(topic_id), int(index), PARTS.index(part)
+        except ValueError:
+            raise HTTPError(404, f"Not an image: {path}")
+        if not 0 <= topic_id < len(TOPIC_NAMES): # A negative id would alias a topic under another URL
+            raise HTTPError(404, f"Not an image: {path}")
+        topic = TOPIC_NAMES[topic_id]
+        if image_format not in CONTENT_TYPES or not 0 <= index < parameter_spaces.space(topic).size:
+            raise HTTPError(404, f"Not an image: {path}")
+        record = Problem(topic_id, index)
+        if not (record.problem_is_graph if which == 0 else record.answer_is_graph):
+            raise HTTPError(404, f"This problem's {part} is text, not a graph")
+
+        etag = f'"{self.version}-{topic_id}-{index}-{part}-{image_format}"'
+        if headers.get("if-none-match") == etag:
+            return 304, {"ETag": etag, "Cache-Control": "no-cache"}, b""
+        return self._cacheable(await self._rendered((topic_id, index, which, image_format)),
+                               CONTENT_TYPES[image_format], headers, etag)
+
+    async def _rendered(self, key):
+        """Returns an image from the cache, or renders it (sharing renders already in progress)."""
+        if key in self.images:
+            self.images.move_to_end(key)
+            return self.images[key]
+        if key not in self.pending:
+            if key[3] == "svg":
+                future = asyncio.get_running_loop().create_future()
+                future.set_result(_render(*key))
+            else:
+                future = asyncio.get_running_loop().run_in_executor(self.pool, _render, *key)
+            self.pending[key] = future
+        future = self.pending[key]
+        try:
+            image = await asyncio.shield(future)
+        finally:
+            if self.pending.get(key) is future and future.done():
+                del self.pending[key]
+        self.images[key] = image
+        while len(self.images) > IMAGE_CACHE_SIZE:
+            self.images.popitem(last=False)
+        return image
+
+# --- HTTP ---
+
+async def _read_request(reader):
+    """Reads one request head; returns (method, target, version, headers), or None at end of stream."""
+    request_line = await reader.readline()
+    if not request_line.strip():
+        return None
+    method, target, version = request_line.decode("latin-1").split()
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    if int(headers.get("content-length", 0)): # GET bodies are allowed but meaningless
+        await reader.readexactly(int(headers["content-length"]))
+    return method, target, version, headers
+
+async def _connection(service, reader, writer):
+    """Serves one client connection, request after request while it is kept alive."""
+    try:
+        while True:
+            request = await _read_request(reader)
+            if request is None:
+                break
+            method, target, version, headers = request
+            try:
+                status, response_headers, body = await service.handle(method, target, headers)
+            except HTTPError as error:
+                status, response_headers = error.status, {"Content-Type": "application/json"}
+                body = json.dumps({"error": str(error)}).encode()
+            except Exception as error: # A bug in one request must not take the connection down silently
+                status, response_headers = 500, {"Content-Type": "application/json"}
+                body = json.dumps({"error": f"{type(error).__name__}: {error}"}).encode()
+            keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+            head = [f"HTTP/1.1 {status} {REASONS[status]}", f"Content-Length: {len(body)}",
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+            head += [f"{name}: {value}" for name, value in response_headers.items()]
+            writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body)
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+        pass # Client went away or sent something that isn't HTTP
+    finally:
+        writer.close()
+
+async def serve(host="127.0.0.1", port=8000, workers=None, ready=None):
+    """Runs the service until cancelled or sent SIGTERM; ready (an asyncio.Event) is set once it is listening."""
+    # Stop like on Ctrl-C, so the render pool is shut down instead of orphaned
+    asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+    service = ProblemService(workers)
+    server = await asyncio.start_server(lambda reader, writer: _connection(service, reader, writer), host, port)
+    print(f"Serving problems on http://{host}:{port}", flush=True)
+    if ready is not None:
+        ready.set()
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve problems over HTTP/JSON.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, help="PNG render processes (default: half the CPUs)")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.workers))
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+# File: svg_render.py
+#
+# Draws a PlotSpec as an SVG string in pure Python, without NumPy or
+# matplotlib. Every graph in this project is a few lines, shaded regions and
+# dots on the fixed [-10, 10] plane, which SVG describes directly: a line is
+# its two endpoints, a half-plane is one polygon. The static plane (grid,
+# axes, ticks, labels, title) depends only on the spec's plane style and is
+# built once per style. The look follows coordinate_plane's matplotlib
+# output: same default colors, line widths, dash patterns and markers.
+#
+# Select it per call with plot_spec.render(spec, backend="svg").
+
+import math
+from functools import lru_cache
+from types import SimpleNamespace
+from xml.sax.saxutils import escape
+
+from plot_spec import Curve, _evaluate
+
+SIZE = 480 # Width and height in pixels
+LEFT, TOP, SIDE = 55, 35, 400 # The plot square
+LIMITS = (-10, 10)
+PT = 1.2 # Pixels per typographic point, so sizes match matplotlib's at this scale
+
+COLOR_CYCLE = ("#1f77b4", "#ff7f0e", "#2ca02c", "#d62728", "#9467bd") # matplotlib's first defaults
+FMT_COLORS = {'b': "blue", 'g': "green", 'r': "red", 'c': "cyan", 'm': "magenta",
+              'y': "yellow", 'k': "black", 'w': "white"}
+LINE_WIDTH = 1.5 # Points
+MARKER_SIZE = 6 # Points
+DASHES = (3.7, 1.6) # '--' dash and gap, in line widths
+
+_SCALAR = SimpleNamespace(abs=abs, sqrt=math.sqrt) # Lets plot_spec._evaluate work on single floats
+
+# --- Coordinates ---
+
+def _sx(x):
+    return LEFT + (x - LIMITS[0]) * SIDE / (LIMITS[1] - LIMITS[0])
+
+def _sy(y):
+    return TOP + (LIMITS[1] - y) * SIDE / (LIMITS[1] - LIMITS[0])
+
+def _n(value):
+    """Formats a pixel coordinate with one decimal and no trailing zero."""
+    text = f"{value:.1f}"
+    return text[:-2] if text.endswith(".0") else text
+
+def _dasharray(linewidth):
+    return f"{_n(DASHES[0] * linewidth * PT)},{_n(DASHES[1] * linewidth * PT)}"
+
+def _label(value):
+    """Formats a tick label like matplotlib, with a real minus sign."""
+    return f"−{-value}" if value < 0 else str(value)
+
+# --- The Plane ---
+
+@lru_cache(maxsize=16)
+def _plane(title, tick_step, xlabel, ylabel, grid_linewidth):
+    """Returns (opening markup, closing markup) of the static plane for one style."""
+    right, bottom = LEFT + SIDE, TOP + SIDE
+    ticks = range(LIMITS[0], LIMITS[1] + 1, tick_step)
+    grid_width = 0.8 if grid_linewidth is None else grid_linewidth
+
+    grid = "".join(f"M{_n(_sx(t))} {TOP}V{bottom}M{LEFT} {_n(_sy(t))}H{right}" for t in ticks)
+    tick_marks = "".join(f"M{_n(_sx(t))} {bottom}v{_n(3.5 * PT)}M{LEFT} {_n(_sy(t))}h-{_n(3.5 * PT)}" for t in ticks)
+    x_labels = "".join(f'<text x="{_n(_sx(t))}" y="{bottom + 18}">{_label(t)}</text>' for t in ticks)
+    y_labels = "".join(f'<text x="{LEFT - 7}" y="{_n(_sy(t) + 4)}">{_label(t)}</text>' for t in ticks)
+
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{SIZE}" height="{SIZE}" viewBox="0 0 {SIZE} {SIZE}" '
+        f'font-family="DejaVu Sans, Verdana, sans-serif" font-size="12">',
+        f'<defs><clipPath id="plot"><rect x="{LEFT}" y="{TOP}" width="{SIDE}" height="{SIDE}"/></clipPath></defs>',
+        f'<rect width="{SIZE}" height="{SIZE}" fill="white"/>',
+        f'<path d="{grid}" stroke="#b0b0b0" stroke-width="{_n(grid_width * PT)}" '
+        f'stroke-dasharray="{_dasharray(grid_width)}" fill="none"/>',
+        f'<path d="M{LEFT} {_n(_sy(0))}H{right}M{_n(_sx(0))} {TOP}V{bottom}" stroke="black" '
+        f'stroke-width="{_n(0.7 * PT)}"/>',
+        f'<rect x="{LEFT}" y="{TOP}" width="{SIDE}" height="{SIDE}" fill="none" stroke="black" '
+        f'stroke-width="{_n(0.8 * PT)}"/>',
+        f'<path d="{tick_marks}" stroke="black" stroke-width="{_n(0.8 * PT)}"/>',
+        f'<g text-anchor="middle">{x_labels}</g><g text-anchor="end">{y_labels}</g>',
+    ]
+    if title:
+        parts.append(f'<text x="{LEFT + SIDE // 2}" y="{TOP - 10}" text-anchor="middle" '
+                     f'font-size="14">{escape(title)}</text>')
+    if xlabel:
+        parts.append(f'<text x="{LEFT + SIDE // 2}" y="{bottom + 36}" text-anchor="middle">{escape(xlabel)}</text>')
+    if ylabel:
+        parts.append(f'<text transform="translate(14 {TOP + SIDE // 2}) rotate(-90)" '
+                     f'text-anchor="middle">{escape(ylabel)}</text>')
+    parts.append('<g clip-path="url(#plot)">')
+    return "".join(parts), "</svg>"
+
+# --- Curves and Regions ---
+
+def _y(bound, x):
+    """Returns the y of a Curve or a constant bound at x."""
+    if isinstance(bound, Curve):
+        return _evaluate(_SCALAR, bound.kind, bound.params, x)
+    return bound
+
+def _xs(curve):
+    """The x values to draw a curve at: its two ends for a line, otherwise its samples."""
+    start, stop, samples = curve.x_range
+    if curve.x_from is not None:
+        start = max(start, curve.x_from)
+    if curve.kind == 'linear':
+        return [start, stop]
+    step = (curve.x_range[1] - curve.x_range[0]) / (samples - 1)
+    xs = [curve.x_range[0] + i * step for i in range(samples)]
+    return [start] + [x for x in xs if x > start]
+
+def _visible_runs(points):
+    """Splits a polyline into the runs that can be seen, keeping one point past each edge."""
+    low, high = LIMITS[0] - 1, LIMITS[1] + 1
+    inside = [low <= y <= high for x, y in points]
+    runs, run = [], []
+    for i, point in enumerate(points):
+        if inside[i] or (i > 0 and inside[i - 1]) or (i + 1 < len(points) and inside[i + 1]):
+            run.append(point)
+        elif run:
+            runs.append(run)
+            run = []
+    if run:
+        runs.append(run)
+    return runs
+
+def _polyline(points):
+    coords, last = [], None
+    for x, y in points:
+        coord = f"{_n(_sx(x))},{_n(_sy(y))}"
+        if coord != last: # Dense samples often round to the same pixel
+            coords.append(coord)
+            last = coord
+    return " ".join(coords)
+
+def _crossing(lower, upper, x0, x1):
+    """Returns where two lines cross strictly between x0 and x1, or None."""
+    d0, d1 = _y(upper, x0) - _y(lower, x0), _y(upper, x1) - _y(lower, x1)
+    if d0 * d1 >= 0:
+        return None
+    return x0 + (x1 - x0) * d0 / (d0 - d1)
+
+def _region(region):
+    """Returns the polygon(s) filling a region, as SVG markup."""
+    lower, upper = region.lower, region.upper
+    curves = [bound for bound in (lower, upper) if isinstance(bound, Curve)]
+    xs = sorted({x for curve in curves for x in _xs(curve)})
+    if region.where_above and all(curve.kind == 'linear' for curve in curves):
+        # Straight bounds swap sides at most once: split exactly there
+        crossing = _crossing(lower, upper, xs[0], xs[-1])
+        if crossing is not None:
+            xs = sorted(xs + [crossing])
+
+    runs, run = [], []
+    for x0, x1 in zip(xs, xs[1:]):
+        mid = (x0 + x1) / 2
+        if not region.where_above or _y(upper, mid) > _y(lower, mid):
+            run = run or [x0]
+            run.append(x1)
+        elif run:
+            runs.append(run)
+            run = []
+    if run:
+        runs.append(run)
+
+    color = region.style.get('color', COLOR_CYCLE[0])
+    alpha = region.style.get('alpha', 1)
+    polygons = []
+    for run in runs:
+        outline = [(x, _y(upper, x)) for x in run] + [(x, _y(lower, x)) for x in reversed(run)]
+        polygons.append(f'<polygon points="{_polyline(outline)}" fill="{color}" fill-opacity="{alpha}"/>')
+    return "".join(polygons)
+
+# --- Lines and Markers ---
+
+def _parse_fmt(fmt):
+    """Splits a matplotlib format string like 'ro' or 'b-' into (color, marker, linestyle)."""
+    color = marker = linestyle = None
+    fmt = fmt or ""
+    if fmt[:1] in FMT_COLORS:
+        color, fmt = FMT_COLORS[fmt[0]], fmt[1:]
+    if fmt[:1] == 'o':
+        marker, fmt = 'o', fmt[1:]
+    if fmt:
+        linestyle = fmt
+    return color, marker, linestyle
+
+def _stroke(color, style):
+    linestyle = style.get('linestyle', '-')
+    dash = f' stroke-dasharray="{_dasharray(LINE_WIDTH)}"' if linestyle == '--' else ""
+    return f'fill="none" stroke="{color}" stroke-width="{_n(LINE_WIDTH * PT)}"{dash}'
+
+def _marker(x, y, face, edge, size):
+    return (f'<circle cx="{_n(_sx(x))}" cy="{_n(_sy(y))}" r="{_n(size * PT / 2)}" fill="{face}" '
+            f'stroke="{edge}" stroke-width="{_n(PT)}"/>')
+
+def _legend(entries):
+    """Draws matplotlib-style legend entries (kind, color, label) in the upper left corner."""
+    row, swatch = 19, 24
+    width = 18 + swatch + max(len(label) for kind, color, label in entries) * 7
+    parts = [f'<rect x="{LEFT + 8}" y="{TOP + 8}" width="{width}" height="{len(entries) * row + 8}" rx="3" '
+             f'fill="white" fill-opacity="0.8" stroke="#cccccc"/>']
+    for i, (kind, color, label) in enumerate(entries):
+        y = TOP + 8 + 4 + row * i + row / 2
+        x = LEFT + 14
+        if kind == 'line':
+            parts.append(f'<path d="M{x} {_n(y)}h{swatch}" stroke="{color}" stroke-width="{_n(LINE_WIDTH * PT)}"/>')
+        else:
+            parts.append(f'<circle cx="{x + swatch // 2}" cy="{_n(y)}" r="{_n(MARKER_SIZE * PT / 2)}" '
+                         f'fill="{color}" stroke="{color}"/>')
+        parts.append(f'<text x="{x + swatch + 6}" y="{_n(y + 4)}">{escape(label)}</text>')
+    return "".join(parts)
+
+# --- Rendering ---
+
+def render_svg(spec):
+    """Returns the SVG markup of a PlotSpec."""
+    plane = spec.plane
+    opening, closing = _plane(plane["title"], plane["tick_step"], plane["xlabel"], plane["ylabel"],
+                              plane["grid_linewidth"])
+    parts = [opening]
+    parts.extend(_region(region) for region in spec.regions)
+
+    cycle = iter(COLOR_CYCLE * 2)
+    entries = []
+    for curve in spec.curves:
+        fmt_color, marker, linestyle = _parse_fmt(curve.fmt)
+        color = fmt_color or curve.style.get('color') or next(cycle)
+        style = dict(curve.style, linestyle=linestyle or curve.style.get('linestyle', '-'))
+        points = [(x, _y(curve, x)) for x in _xs(curve)]
+        # A line is just its two ends, left to the clip path; long curves drop what can't be seen
+        for run in [points] if curve.kind == 'linear' else _visible_runs(points):
+            parts.append(f'<polyline points="{_polyline(run)}" {_stroke(color, style)}/>')
+        if 'label' in curve.style:
+            entries.append(('line', color, curve.style['label']))
+
+    for point in spec.points:
+        fmt_color, marker, linestyle = _parse_fmt(point.fmt)
+        color = fmt_color or point.style.get('color') or next(cycle)
+        face = point.style.get('markerfacecolor', color)
+        edge = point.style.get('markeredgecolor', color)
+        parts.append(_marker(point.x, point.y, face, edge, point.style.get('markersize', MARKER_SIZE)))
+        if 'label' in point.style:
+            entries.append(('marker', face, point.style['label']))
+
+    parts.append("</g>") # End of the clipped plot area
+    if spec.legend and entries:
+        parts.append(_legend(entries))
+    parts.append(closing)
+    return "".join(parts)
@@ -0,0 +1,156 @@
+# File: terms.py
+#
+# Sums of terms, like 3x² - x + 5 or -2x + y, written out from their
+# coefficients the way a textbook writes them: a term with a zero
+# coefficient is left out, a coefficient of 1 or -1 is not written in front
+# of a variable, the first term carries its own sign ("-x") and the others
+# are joined by " + " or " - "; nothing left is "0". A Terms formatter is
+# made once per shape of expression (its variables, the style and how the
+# coefficients are written), and writes an expression in one pass over the
+# terms, in plain text, LaTeX or MathML.
+#
+# Generators draw their coefficients from small ranges, so the same few
+# expressions are written over and over: every expression written is kept,
+# and writing it again is a dict lookup. rows() writes whole columns of
+# coefficients, each distinct expression once, for batch_generator.py; it
+# writes in the formatter's style like a call does.
+#
+#   quadratic = Terms("x^2", "x", "")
+#   quadratic(1, 0, -5)             -> "x² - 5"
+#   Terms("x", "y")(-1, 4)          -> "-x + 4y"
+#   Terms("x", "", style="latex", number="fraction")(3, 4, -5, 2)  -> "\frac{3}{4}x - \frac{5}{2}"
+#   Terms("x", "", number=".2f")(-0.666, 3)  -> "-0.67x + 3.00"
+
+import math
+
+CACHE_SIZE = 1 << 14 # Expressions kept per formatter; the cache starts over when it is full
+TABLE_SIZE = 1 << 20 # Coefficient combinations rows() lays out a table for; wider ranges go through the cache
+STYLES = ("plain", "latex", "mathml")
+
+_SUPERSCRIPTS = str.maketrans("0123456789-", "⁰¹²³⁴⁵⁶⁷⁸⁹⁻")
+
+# Per style: the first term's minus, the joins between terms, and what
+# goes between a coefficient and its variable
+_SIGNS = {
+    "plain": ("-", " + ", " - ", ""),
+    "latex": ("-", " + ", " - ", ""),
+    "mathml": ("<mo>−</mo>", "<mo>+</mo>", "<mo>−</mo>", "<mo>\u2062</mo>"), # Invisible times
+}
+
+def _variable(spec, style):
+    """Writes a variable spec ("x", "x^2", or "" for the constant term) in a style."""
+    name, _, power = spec.partition("^")
+    if style == "plain":
+        return name + power.translate(_SUPERSCRIPTS)
+    if style == "latex":
+        return f"{name}^{{{power}}}" if power else name
+    if not name:
+        return ""
+    return f"<msup><mi>{name}</mi><mn>{power}</mn></msup>" if power else f"<mi>{name}</mi>"
+
+def _number(numerator, denominator, style):
+    """Writes a magnitude, numerator/denominator when denominator is given, in a style."""
+    if denominator is None:
+        return f"<mn>{numerator}</mn>" if style == "mathml" else numerator
+    if style == "plain":
+        return f"{numerator}/{denominator}"
+    if style == "latex":
+        return f"\\frac{{{numerator}}}{{{denominator}}}"
+    return f"<mfrac><mn>{numerator}</mn><mn>{denominator}</mn></mfrac>"
+
+class Terms:
+    """A formatter for sums of terms in given variables; call it with one coefficient per term."""
+
+    __slots__ = ('variables', 'style', 'number', 'cache', '_texts')
+
+    def __init__(self, *variables, style="plain", number=None):
+        """variables: "x", "x^2", ... with "" for the constant term.
+
+        number: None writes coefficients with str(), a format spec (".2f")
+        writes them with format(), and "fraction" takes every coefficient
+        as two arguments, a reduced numerator and a positive denominator.
+        """
+        if style not in STYLES:
+            raise ValueError(f"Unknown style {style!r}; expected one of {', '.join(STYLES)}")
+        self.variables = variables
+        self.style = style
+        self.number = number
+        self.cache = {}
+        self._texts = [_variable(variable, style) for variable in variables]
+
+    def __call__(self, *coefficients):
+        """Writes the expression; coefficients in the order of the variables."""
+        text = self.cache.get(coefficients)
+        if text is None:
+            if len(self.cache) >= CACHE_SIZE:
+                self.cache.clear()
+            text = self.cache[coefficients] = self._write(coefficients)
+        return text
+
+    def rows(self, *columns):
+        """Writes one expression per row of coefficient columns (lists or NumPy arrays); returns a list.
+
+        Integer columns are numbered row by row into a table of every
+        coefficient combination in their ranges, each combination present is
+        written once, and the rows are taken from the table with NumPy.
+        """
+        import numpy as np
+        columns = [np.asarray(column) for column in columns]
+        if not all(column.dtype.kind in "iu" for column in columns):
+            rows = list(zip(*(column.tolist() for column in columns)))
+            texts = {row: self(*row) for row in set(rows)}
+            return list(map(texts.__getitem__, rows))
+
+        lows = [int(column.min(initial=0)) for column in columns]
+        spans = [int(column.max(initial=0)) - low + 1 for column, low in zip(columns, lows)]
+        if math.prod(spans) > TABLE_SIZE:
+            return self.rows(*(column.astype(object) for column in columns))
+        keys = np.zeros(len(columns[0]), dtype=np.int64)
+        for column, low, span in zip(columns, lows, spans):
+            keys *= span
+            keys += column - low
+        table = np.empty(math.prod(spans), dtype=object)
+        present = np.zeros(len(table), dtype=bool)
+        present[keys] = True
+        for key in np.flatnonzero(present).tolist():
+            coefficients, rest = [], key
+            for low, span in zip(reversed(lows), reversed(spans)):
+                rest, digit = divmod(rest, span)
+                coefficients.append(low + digit)
+            table[key] = self(*reversed(coefficients))
+        return table[keys].tolist()
+
+    def _magnitudes(self, coefficients):
+        """Yields (negative, numerator text, denominator text or None) per term."""
+        if self.number == "fraction":
+            for numerator, denominator in zip(coefficients[::2], coefficients[1::2]):
+                yield numerator < 0, str(abs(numerator)), None if denominator == 1 else str(denominator)
+        elif self.number is None:
+            for coefficient in coefficients:
+                yield coefficient < 0, str(abs(coefficient)), None
+        else:
+            for coefficient in coefficients:
+                yield coefficient < 0, format(abs(coefficient), self.number), None
+
+    def _write(self, coefficients):
+        """Writes an expression in one pass over its terms."""
+        expected = len(self.variables) * (2 if self.number == "fraction" else 1)
+        if len(coefficients) != expected:
+            raise TypeError(f"Expected {expected} coefficients for {self.variables}, got {len(coefficients)}")
+        first_minus, plus, minus, times = _SIGNS[self.style]
+        parts = []
+        for (negative, numerator, denominator), variable in zip(self._magnitudes(coefficients), self._texts):
+            if float(numerator) == 0: # "0", or a decimal that rounds to zero
+                continue
+            if parts:
+                parts.append(minus if negative else plus)
+            elif negative:
+                parts.append(first_minus)
+            if not variable:
+                parts.append(_number(numerator, denominator, self.style))
+            elif denominator is not None or float(numerator) != 1:
+                parts.append(_number(numerator, denominator, self.style) + times + variable)
+            else:
+                parts.append(variable)
+        text = "".join(parts) or _number("0", None, self.style)
+        return f"<mrow>{text}</mrow>" if self.style == "mathml" else text
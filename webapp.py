@@ -2,52 +2,232 @@
 
 import streamlit as st
 from problem_generator import TOPICS # Import our topics dictionary
+from problems import Problem
+import plot_spec
+import raster
+from seeding import make_rng
+from no_repeat import ClassSession, TopicExhausted
+import instrumentation
+from prefetch import Prefetcher
+from do_now import CATEGORIES, DEFAULT_MIX, Composer
 
 # --- App Title and Description ---
 st.title("Algebra I 'Do Now' Generator")
 st.write("Select a topic from the dropdown menu and click 'Generate Problem' to get a new question.")
 
+# --- Random Stream ---
+# Each browser session gets its own stream instead of sharing the global one.
+# Opening the app with ?seed=123 makes the sequence of problems reproducible.
+# A seed that isn't a whole number is ignored, with a warning.
+if 'rng' not in st.session_state:
+    seed = st.query_params.get("seed") or None
+    st.session_state.bad_seed = None
+    if seed is not None:
+        try:
+            seed = int(seed)
+        except ValueError:
+            st.session_state.bad_seed, seed = seed, None
+    st.session_state.seed = seed
+    st.session_state.rng = make_rng(seed)
+    # "No repeats" draws for this session; ?seed= makes them reproducible too
+    st.session_state.class_session = ClassSession(seed)
+if st.session_state.bad_seed is not None:
+    st.warning(f"Ignoring ?seed={st.session_state.bad_seed}: a seed must be a whole number. "
+               "Problems are random and won't repeat on reload.")
+
+# --- Graph Rendering ---
+# Graphs are drawn as SVG, which needs neither NumPy nor matplotlib.
+# Opening the app with ?graphs=png draws them with matplotlib instead, as
+# palette PNGs about raster.WIDTH pixels wide, which st.image sends as they
+# are (it would turn WebP into a full-color PNG, so the app doesn't use it).
+graph_backend = "png" if st.query_params.get("graphs") == "png" else "svg"
+
+# --- Diagnostics ---
+# Hidden panel for operators: open the app with ?diagnostics=1.
+# This switches instrumentation on for the whole server process.
+diagnostics = st.query_params.get("diagnostics") == "1"
+if diagnostics:
+    instrumentation.enable()
+
 # --- UI Elements ---
 # Create the dropdown menu for topic selection
 selected_topic = st.selectbox("Select a Topic:", options=list(TOPICS.keys()))
 
-# Create two columns for the buttons to appear side-by-side
-col1, col2 = st.columns(2)
+# Never show the same problem twice until the topic runs out
+no_repeats = st.checkbox("No repeats")
+
+# --- Prefetching ---
+# Random problems come ready-made from per-topic buffers that worker
+# processes keep filled, graphs already rendered, so a click costs the
+# same on every topic. Seeded and "No repeats" problems are drawn here.
+@st.cache_resource(show_spinner=False)
+def prefetcher(backend):
+    """One prefetcher per graph backend, shared by every session of this server process."""
+    return Prefetcher(backend=backend)
+
+use_prefetch = not no_repeats and st.session_state.seed is None
+
+# --- Rendered Graphs ---
+@st.cache_data(max_entries=256, show_spinner=False)
+def graph_image(topic_id, index, which, backend, _rendered=None):
+    """Renders one graph part of a problem; cached by problem id, so reruns and other sessions reuse it.
+
+    _rendered is a render made elsewhere (the Do Now composer's pool) to
+    cache as it is; Streamlit leaves arguments starting with _ out of the key.
+    """
+    if _rendered is not None:
+        return _rendered
+    return plot_spec.render(Problem(topic_id, index).build()[which], backend)
+
+def show_part(record, which):
+    """Returns a part of the record for display: text as is, a graph from the render cache."""
+    is_graph = record.problem_is_graph if which == 0 else record.answer_is_graph
+    if not is_graph:
+        return record.part(which)
+    if use_prefetch:
+        image = prefetcher(graph_backend).image(record, which)
+        if image is not None:
+            return image
+    return graph_image(record.topic_id, record.index, which, graph_backend)
 
 # --- Button Logic ---
-# Generate Problem Button
-if col1.button("Generate Problem"):
-    # Get the corresponding generator function
-    generator_func = TOPICS[selected_topic]
-    # Generate and store the new problem/answer in the session state
-    st.session_state.problem, st.session_state.answer = generator_func()
-
-# Show Answer Button
-if col2.button("Show Answer"):
-    # This button doesn't need to do anything itself;
-    # it just causes the app to rerun and display the answer below.
-    pass
-
-# --- Display Area ---
-# Check if a problem has been generated and stored in the session state
-if 'problem' in st.session_state:
-    st.header("Problem:")
-    
-    problem = st.session_state.problem
-    
-    # Check if the problem is a graph or text
-    if isinstance(problem, str):
-        st.text(problem) # Use st.text to respect newlines
+def new_problem(topic):
+    """Draws the next problem record for topic and renders the problem, so reruns can show it for free."""
+    if no_repeats:
+        class_session = st.session_state.class_session
+        try:
+            index = class_session.draw(topic)
+        except TopicExhausted as exhausted:
+            # Every problem has been used; start a new pass in a new order
+            st.info(f"{exhausted}. Starting over.")
+            class_session.reset(topic)
+            index = class_session.draw(topic)
+        record = Problem.at(topic, index)
+    elif use_prefetch:
+        record = prefetcher(graph_backend).pop(topic)
     else:
-        st.pyplot(problem)
-
-    st.header("Answer:")
-    
-    answer = st.session_state.answer
-    
-    with st.expander("Click to see the answer"):
-        # Check if the answer is a graph or text
-        if isinstance(answer, str):
-            st.text(answer) # Use st.text to respect newlines
+        record = Problem.generate(topic, st.session_state.rng)
+    show_part(record, 0) # The answer is only rendered if it is asked for
+    return record
+
+# --- Problem Area ---
+# A fragment: its buttons rerun only this part of the page, not the whole
+# script, and every graph shown here comes from the render cache.
+@st.fragment
+def problem_area():
+    # Create two columns for the buttons to appear side-by-side
+    col1, col2 = st.columns(2)
+
+    # Generate Problem Button
+    if col1.button("Generate Problem"):
+        # Only the compact record (topic id and index) is kept in the session
+        # state; its text and graphs are rebuilt from it when needed.
+        st.session_state.problem = instrumentation.call(selected_topic, new_problem, selected_topic)
+        st.session_state.answer_requested = False
+
+    if no_repeats:
+        st.caption(f"Problems left in this topic: {st.session_state.class_session.remaining(selected_topic):,}")
+
+    # Show Answer Button
+    if col2.button("Show Answer"):
+        # Text answers are always in the expander below; a graph answer
+        # is only drawn once it has been asked for.
+        st.session_state.answer_requested = True
+
+    # --- Display Area ---
+    # Check if a problem has been generated and stored in the session state
+    if 'problem' in st.session_state:
+        record = st.session_state.problem
+        
+        st.header("Problem:")
+        
+        if record.problem_is_graph:
+            st.image(show_part(record, 0)) # Graphs come back as SVG text or PNG bytes
         else:
-            st.pyplot(answer) # Display the graph if it's the answer
+            st.text(show_part(record, 0)) # Use st.text to respect newlines
+
+        st.header("Answer:")
+        
+        with st.expander("Click to see the answer"):
+            if not record.answer_is_graph:
+                st.text(show_part(record, 1)) # Use st.text to respect newlines
+            elif st.session_state.get('answer_requested'):
+                st.image(show_part(record, 1)) # Display the graph if it's the answer
+            else:
+                st.caption("Click 'Show Answer' to draw the graph.")
+
+problem_area()
+
+# --- Do Now Set ---
+# A whole set of mixed topics at once. Cheap problems are made in this
+# script; graphs that take long to render go to the composer's worker
+# processes, all at the same time. Like the problem area, the session only
+# keeps the compact records: the set's graphs go into the render cache,
+# and are shown from there.
+@st.cache_resource(show_spinner=False)
+def composer(backend):
+    """One set composer per graph backend, shared by every session of this server process."""
+    return Composer(backend=backend)
+
+@st.fragment
+def do_now_area():
+    st.header("Do Now Set")
+    default_counts = dict(DEFAULT_MIX)
+    columns = st.columns(3)
+    counts = {category: columns[i % 3].number_input(category, min_value=0, max_value=10,
+                                                    value=default_counts.get(category, 0), key=f"do_now_{category}")
+              for i, category in enumerate(CATEGORIES)}
+
+    if st.button("Compose Do Now"):
+        mix = [(category, count) for category, count in counts.items() if count]
+        do_now = composer(graph_backend).compose(mix, st.session_state.rng)
+        for record, parts in zip(do_now.records, do_now.parts):
+            for which, is_graph in enumerate((record.problem_is_graph, record.answer_is_graph)):
+                if is_graph:
+                    graph_image(record.topic_id, record.index, which, graph_backend, _rendered=parts[which])
+        pooled = do_now.made.count("pool")
+        st.session_state.do_now = do_now.records
+        st.session_state.do_now_caption = (f"Ready in {do_now.seconds * 1000:.0f} ms: {len(do_now) - pooled} made "
+                                           f"here, {pooled} rendered in parallel")
+
+    if 'do_now' in st.session_state:
+        records = st.session_state.do_now
+        for number, record in enumerate(records, 1):
+            st.subheader(f"{number}. {record.topic}")
+            if record.problem_is_graph:
+                st.image(graph_image(record.topic_id, record.index, 0, graph_backend))
+            else:
+                st.text(record.part(0))
+        with st.expander("Answers"):
+            for number, record in enumerate(records, 1):
+                if record.answer_is_graph:
+                    st.write(f"{number}.")
+                    st.image(graph_image(record.topic_id, record.index, 1, graph_backend))
+                else:
+                    st.text(f"{number}. {record.part(1)}")
+        st.caption(st.session_state.do_now_caption)
+
+do_now_area()
+
+# --- Diagnostics Panel ---
+# Outside the problem fragment: it refreshes on full reruns (e.g. changing topic)
+if diagnostics:
+    with st.expander("Diagnostics", expanded=True):
+        st.write("Per-topic counts and mean time per phase (ms), for this server process.")
+        st.table(instrumentation.summary())
+        st.write("Do Now composer: estimated cost per topic, and where its problems are made.")
+        st.table(composer(graph_backend).costs.rows())
+        if graph_backend == "png":
+            st.write("Graph images rendered in this server process (not its worker pools): bytes per image, by format and width.")
+            st.table(raster.report.rows())
+        if use_prefetch:
+            st.write("Prefetch buffers: ready problems, target size and recent demand per topic.")
+            st.table(prefetcher(graph_backend).stats())
+        if st.button("Profile the next 20 problems"):
+            instrumentation.profile_next(20)
+        if instrumentation.profiling():
+            st.caption(f"Profiling: {instrumentation.profiling()} problems to go")
+        if instrumentation.profile_report():
+            st.code(instrumentation.profile_report())
+        st.download_button("Download Prometheus snapshot", instrumentation.snapshot_text(),
+                           file_name="problem_generator.prom", mime="text/plain")
@@ -0,0 +1,182 @@
+# File: worksheet.py
+#
+# Small multiples: many graph problems on one printed page. Every panel of
+# a page is the same coordinate plane (the [-10, 10] square, ticks every
+# TICK_STEP, dashed grid, axis lines), laid out as a subplot grid whose
+# axes share one tick locator and formatter. That static part depends only
+# on the grid, so like coordinate_plane it is drawn once per layout and
+# cached as a raster. A page copies the raster and draws just the marks of
+# its problems over it, in one pass: each panel's lines are a single
+# LineCollection, its shaded regions a single PolyCollection and its dots a
+# single CircleCollection, so a page of twelve graphs is a few dozen
+# artists and never a figure per graph. Legends are left out; the panel
+# numbers match the problems printed with them.
+#
+#   pages = render_worksheet(records)      # PNG bytes, PER_PAGE graphs a page
+
+import io
+import math
+import threading
+
+import matplotlib
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg, RendererAgg
+from matplotlib.collections import CircleCollection, LineCollection, PolyCollection
+from matplotlib.figure import Figure
+from matplotlib.text import Text
+from matplotlib.ticker import FixedLocator, FuncFormatter
+from matplotlib.transforms import Affine2D, Bbox
+from PIL import Image
+
+from plot_spec import Curve
+from svg_render import COLOR_CYCLE, LINE_WIDTH, MARKER_SIZE, _parse_fmt
+
+PAGE_SIZE = (8.5, 11) # Inches, portrait letter
+DPI = 150
+COLUMNS = 3
+PER_PAGE = 12
+LIMITS = (-10, 10)
+TICK_STEP = 2
+MARGINS = {"left": 0.06, "right": 0.97, "top": 0.96, "bottom": 0.03, "wspace": 0.25, "hspace": 0.3}
+
+# Cache of page backgrounds: (rows, columns, panels) -> (figure, rgba array, panel boxes in pixels)
+_LAYOUTS = {}
+_lock = threading.Lock()
+
+# --- Layout ---
+
+def _render_layout(rows, columns, panels):
+    """Draws the empty planes of one page layout once and captures them as a raster."""
+    fig = Figure(figsize=PAGE_SIZE, dpi=DPI)
+    canvas = FigureCanvasAgg(fig)
+    fig.subplots_adjust(**MARGINS)
+    axes = fig.subplots(rows, columns, sharex="all", sharey="all", squeeze=False).ravel()
+
+    ticks = FixedLocator(range(LIMITS[0], LIMITS[1] + 1, TICK_STEP))
+    labels = FuncFormatter(lambda value, position: f"{value:g}".replace("-", "\N{MINUS SIGN}"))
+    axes[0].set_xlim(*LIMITS)
+    axes[0].set_ylim(*LIMITS)
+    axes[0].xaxis.set_major_locator(ticks) # Shared by every panel, like the limits
+    axes[0].yaxis.set_major_locator(ticks)
+    axes[0].xaxis.set_major_formatter(labels)
+    axes[0].yaxis.set_major_formatter(labels)
+    for ax in axes[:panels]:
+        ax.set_aspect("equal")
+        ax.axhline(0, color='black', linewidth=0.7)
+        ax.axvline(0, color='black', linewidth=0.7)
+        ax.grid(True, linestyle='--', linewidth=0.5)
+        ax.tick_params(labelsize=6, labelbottom=True, labelleft=True)
+    for ax in axes[panels:]:
+        ax.set_visible(False)
+
+    canvas.draw()
+    background = np.asarray(canvas.buffer_rgba()).copy()
+    boxes = [ax.get_window_extent(canvas.get_renderer()) for ax in axes[:panels]]
+    return fig, background, boxes
+
+def _layout(panels, columns):
+    """Returns the cached (figure, background, panel boxes) for a page of panels graphs."""
+    rows = math.ceil(panels / columns)
+    key = (rows, columns, panels)
+    with _lock:
+        if key not in _LAYOUTS:
+            _LAYOUTS[key] = _render_layout(*key)
+        return _LAYOUTS[key]
+
+# --- Marks ---
+
+def _bound(np, bound, x_vals):
+    return bound.y_values(np, x_vals) if isinstance(bound, Curve) else np.full_like(x_vals, bound)
+
+def _region_polygons(region):
+    """The polygons fill_between would draw for a region: one per run of x where it is filled."""
+    curve = region.lower if isinstance(region.lower, Curve) else region.upper
+    x_vals = curve.x_values(np)
+    lower, upper = _bound(np, region.lower, x_vals), _bound(np, region.upper, x_vals)
+    if not region.where_above:
+        runs = [slice(0, len(x_vals))]
+    else:
+        edges = np.flatnonzero(np.diff(np.concatenate(([0], (upper > lower).astype(np.int8), [0]))))
+        runs = [slice(start, stop) for start, stop in zip(edges[::2], edges[1::2])]
+    return [np.concatenate((np.column_stack((x_vals[run], upper[run])),
+                            np.column_stack((x_vals[run], lower[run]))[::-1])) for run in runs]
+
+def _panel_artists(fig, spec, box, clip):
+    """The collections that draw one spec into a panel box (in pixels)."""
+    # Data coordinates of the [-10, 10] square -> the panel's pixels
+    scale = box.width / (LIMITS[1] - LIMITS[0])
+    transform = Affine2D().translate(-LIMITS[0], -LIMITS[0]).scale(scale, box.height / (LIMITS[1] - LIMITS[0]))
+    transform.translate(box.x0, box.y0)
+    artists = []
+
+    if spec.regions:
+        polygons, colors = [], []
+        for region in spec.regions:
+            color = matplotlib.colors.to_rgba(region.style.get('color', COLOR_CYCLE[0]),
+                                              region.style.get('alpha', 1))
+            for polygon in _region_polygons(region):
+                polygons.append(polygon)
+                colors.append(color)
+        artists.append(PolyCollection(polygons, facecolors=colors, edgecolors='none', transform=transform))
+
+    cycle = iter(COLOR_CYCLE * 2)
+    segments, colors, linestyles = [], [], []
+    for curve in spec.curves:
+        fmt_color, marker, linestyle = _parse_fmt(curve.fmt)
+        x_vals = curve.x_values(np)
+        segments.append(np.column_stack((x_vals, curve.y_values(np, x_vals))))
+        colors.append(fmt_color or curve.style.get('color') or next(cycle))
+        linestyles.append('dashed' if (linestyle or curve.style.get('linestyle')) == '--' else 'solid')
+    if segments:
+        artists.append(LineCollection(segments, colors=colors, linestyles=linestyles, linewidths=LINE_WIDTH,
+                                      transform=transform))
+
+    if spec.points:
+        faces, edges, sizes = [], [], []
+        for point in spec.points:
+            fmt_color, marker, linestyle = _parse_fmt(point.fmt)
+            color = fmt_color or point.style.get('color') or next(cycle)
+            faces.append(point.style.get('markerfacecolor', color))
+            edges.append(point.style.get('markeredgecolor', color))
+            sizes.append(point.style.get('markersize', MARKER_SIZE) ** 2)
+        artists.append(CircleCollection(sizes, offsets=[(point.x, point.y) for point in spec.points],
+                                        offset_transform=transform, facecolors=faces, edgecolors=edges,
+                                        linewidths=1))
+
+    for artist in artists:
+        artist.set_figure(fig) # For the DPI; nothing is added to the figure
+        artist.set_clip_box(clip)
+    return artists
+
+# --- Pages ---
+
+def render_page(specs, first_number=1, columns=COLUMNS):
+    """Renders plot specs as one page of numbered panels; returns PNG bytes."""
+    fig, background, boxes = _layout(len(specs), columns)
+    height, width = background.shape[:2]
+    renderer = RendererAgg(width, height, DPI)
+    pixels = np.asarray(renderer.buffer_rgba())
+    pixels[:] = background
+
+    for number, (spec, box) in enumerate(zip(specs, boxes), first_number):
+        clip = Bbox.from_extents(box.x0, box.y0, box.x1, box.y1)
+        for artist in _panel_artists(fig, spec, box, clip):
+            artist.draw(renderer)
+        label = Text(box.x0, box.y1 + 4, f"{number}.", fontsize=9, fontweight="bold", va="bottom")
+        label.set_figure(fig)
+        label.draw(renderer)
+
+    buffer = io.BytesIO()
+    Image.fromarray(pixels, 'RGBA').convert('RGB').save(buffer, format='png', dpi=(DPI, DPI))
+    return buffer.getvalue()
+
+def graph_spec(record):
+    """The graph of a problem record that goes on a worksheet: the problem's, else the answer's."""
+    problem, answer = record.build()
+    return problem if record.problem_is_graph else answer
+
+def render_worksheet(records, per_page=PER_PAGE, columns=COLUMNS):
+    """Renders the graphs of graph problem records, per_page to a page, numbered in order; returns PNG pages."""
+    specs = [graph_spec(record) for record in records]
+    return [render_page(specs[start:start + per_page], start + 1, columns)
+            for start in range(0, len(specs), per_page)]